@@ -0,0 +1,166 @@
+"""Credential-stuffing benchmark for `POST /api/auth/sign-in`.
+
+Drives the app in process (raw ASGI, with its lifespan, so the configured
+database and Redis are used) with sign-ins for usernames that do not exist,
+once with the negative lookup cache disabled and once enabled, and reports
+how many SQL statements reached the database and the request latency.
+
+Each username is tried `--attempts-per-user` times (keep it under the
+lockout threshold, 5 by default, or locked accounts are answered without any
+lookup) and every request comes from its own client IP, as from a botnet, so
+per-IP lockout and rate limits do not hide the lookups being measured.
+
+    python -m benchmarks.credential_stuffing --users 500 --attempts-per-user 4
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from collections import Counter
+from typing import Any
+
+from sqlalchemy import event
+
+from src import app
+from src.auth.util.negative_cache import negative_lookup_cache
+from src.core.db import engine
+
+SIGN_IN_PATH = "/api/auth/sign-in"
+
+
+async def post(path: str, body: dict[str, str], client_ip: str) -> int:
+    """Send one JSON POST straight to the ASGI app; returns the status code."""
+    payload = json.dumps(body).encode()
+    scope: dict[str, Any] = {  # pyright: ignore[reportExplicitAny]
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+        ],
+        "client": (client_ip, 40_000),
+        "server": ("benchmark", 80),
+    }
+    body_sent = False
+    finished = asyncio.Event()
+    status = 0
+
+    async def receive() -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        _ = await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:  # pyright: ignore[reportExplicitAny]
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = int(message["status"])  # pyright: ignore[reportAny]
+        elif message["type"] == "http.response.body" and not message.get(
+            "more_body", False
+        ):
+            finished.set()
+
+    await app(scope, receive, send)  # pyright: ignore[reportArgumentType]
+    return status
+
+
+def client_ip(n: int) -> str:
+    return f"10.{(n >> 16) & 255}.{(n >> 8) & 255}.{n & 255}"
+
+
+async def run_phase(
+    label: str, users: int, attempts_per_user: int, concurrency: int, first_ip: int
+) -> None:
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    # Repeats of a name are spread out, as in a stuffing list replayed over time.
+    requests = [
+        f"{prefix}-{user}" for _ in range(attempts_per_user) for user in range(users)
+    ]
+    slots = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    queries = 0
+
+    def count_query(*_: Any) -> None:  # pyright: ignore[reportExplicitAny, reportAny]
+        nonlocal queries
+        queries += 1
+
+    async def one(n: int, username: str) -> None:
+        async with slots:
+            started = time.perf_counter()
+            status = await post(
+                SIGN_IN_PATH,
+                {"username": username, "password": "not-the-password"},
+                client_ip(first_ip + n),
+            )
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+    started = time.perf_counter()
+    try:
+        _ = await asyncio.gather(*(one(n, name) for n, name in enumerate(requests)))
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_query)
+    elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"\n== {label} ==")
+    print(f"requests          {len(requests)} ({users} users x {attempts_per_user})")
+    print(f"status codes      {dict(sorted(statuses.items()))}")
+    print(f"db statements     {queries} ({queries / len(requests):.2f} per request)")
+    print(f"throughput        {len(requests) / elapsed:.0f} req/s")
+    print(
+        "latency ms        "
+        f"p50 {quantiles[49] * 1000:.2f}  p95 {quantiles[94] * 1000:.2f}  "
+        f"p99 {quantiles[98] * 1000:.2f}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.credential_stuffing",
+        description="Sign-in with unknown usernames, with and without the negative cache.",
+    )
+    _ = parser.add_argument("--users", type=int, default=500, help="distinct unknown usernames")
+    _ = parser.add_argument("--attempts-per-user", type=int, default=4)
+    _ = parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    total: int = args.users * args.attempts_per_user  # pyright: ignore[reportAny]
+
+    async with app.router.lifespan_context(app):
+        ttl = negative_lookup_cache.ttl
+        negative_lookup_cache.ttl = 0
+        try:
+            await run_phase(
+                "negative cache off",
+                args.users,  # pyright: ignore[reportAny]
+                args.attempts_per_user,  # pyright: ignore[reportAny]
+                args.concurrency,  # pyright: ignore[reportAny]
+                first_ip=0,
+            )
+        finally:
+            negative_lookup_cache.ttl = ttl
+        await run_phase(
+            f"negative cache on (ttl {ttl}s)",
+            args.users,  # pyright: ignore[reportAny]
+            args.attempts_per_user,  # pyright: ignore[reportAny]
+            args.concurrency,  # pyright: ignore[reportAny]
+            first_ip=total,
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
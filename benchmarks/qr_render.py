@@ -0,0 +1,102 @@
+"""2FA enrollment QR codes: response size, render latency and event loop stall.
+
+For each `qr_format` it renders `--enrollments` provisioning URIs, with up
+to `--concurrency` at a time, and reports the size of the `qr_code` field
+sent to the client, the p50/p95 render latency and the longest time the
+event loop was blocked meanwhile (measured by a 1 ms ticker). `inline png`
+is what `enable_2fa` used to do: render the PNG in the request handler, on
+the event loop.
+
+    python -m benchmarks.qr_render --enrollments 200 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+import pyotp
+
+from src.services.qr_service import QR_FORMAT, QRCodeService, _render_png  # pyright: ignore[reportPrivateUsage]
+
+
+async def max_loop_lag(stop: asyncio.Event, interval: float = 0.001) -> float:
+    """Longest delay past `interval` between ticks until `stop` is set."""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def run_phase(
+    label: str,
+    render: Callable[[str], Awaitable[str | None]],
+    uris: list[str],
+    concurrency: int,
+) -> None:
+    slots = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    sizes: list[int] = []
+
+    async def one(uri: str) -> None:
+        async with slots:
+            started = time.perf_counter()
+            qr_code = await render(uri)
+            latencies.append(time.perf_counter() - started)
+            # Clients of the `uri` format draw from provisioning_uri instead.
+            sizes.append(len(qr_code or uri))
+
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(max_loop_lag(stop))
+    started = time.perf_counter()
+    _ = await asyncio.gather(*(one(uri) for uri in uris))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    lag = await ticker
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:<12} {statistics.mean(sizes):>8.0f} B  "
+        f"p50 {quantiles[49] * 1000:7.2f} ms  p95 {quantiles[94] * 1000:7.2f} ms  "
+        f"{len(uris) / elapsed:7.0f}/s  max loop stall {lag * 1000:7.2f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.qr_render",
+        description="QR code size, latency and event loop stall per qr_format.",
+    )
+    _ = parser.add_argument("--enrollments", type=int, default=200)
+    _ = parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    concurrency: int = args.concurrency  # pyright: ignore[reportAny]
+
+    uris = [
+        pyotp.TOTP(pyotp.random_base32()).provisioning_uri(
+            name=f"user{n}@example.com", issuer_name="Auth API"
+        )
+        for n in range(args.enrollments)  # pyright: ignore[reportAny]
+    ]
+    _render_png(uris[0])  # import qrcode and PIL outside the measurements
+
+    async def inline_png(uri: str) -> str:
+        return _render_png(uri)
+
+    service = QRCodeService()
+
+    def with_service(qr_format: QR_FORMAT) -> Callable[[str], Awaitable[str | None]]:
+        return lambda uri: service.render(uri=uri, qr_format=qr_format)
+
+    print(f"{'format':<12} {'qr_code':>10}  latency{'':<27}throughput")
+    await run_phase("inline png", inline_png, uris, concurrency)
+    for qr_format in ("png", "svg", "uri"):
+        await run_phase(qr_format, with_service(qr_format), uris, concurrency)
+    service.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
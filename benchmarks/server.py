@@ -0,0 +1,184 @@
+"""Memory and throughput of the production server versus `main.py`.
+
+Starts each server as a subprocess on a free port, with the configured
+database and Redis (the app's lifespan runs as usual):
+
+- `single`: one uvicorn process, as `main.py` runs it (without `reload`).
+- `prefork`: the gunicorn master from `src.server`, preloading the app and
+  forking `--workers` uvicorn workers.
+
+Each one is loaded with keep-alive `GET /` requests from `--clients` client
+processes for `--duration` seconds. Then the unique (USS) and proportional
+(PSS) memory of every worker is read from `/proc/<pid>/smaps_rollup`: pages
+a forked worker still shares copy-on-write with the master count towards
+its PSS but not its USS. Linux only.
+
+    python -m benchmarks.server --workers 4 --duration 10
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+REQUEST = b"GET / HTTP/1.1\r\nHost: benchmark\r\n\r\n"
+
+
+def serve(mode: str, port: int, workers: int) -> None:
+    """Run one server in this process (the subprocess side)."""
+    from src.config import config
+
+    if mode == "single":
+        import uvicorn
+
+        uvicorn.run(config.env.app, host="127.0.0.1", port=port, log_level="warning")
+        return
+
+    from src.server import ProductionServer
+
+    ProductionServer(
+        options={
+            "bind": f"127.0.0.1:{port}",
+            "workers": workers,
+            "worker_class": "uvicorn_worker.UvicornWorker",
+            "preload_app": True,
+            "graceful_timeout": config.env.graceful_timeout,
+            "loglevel": "warning",
+        }
+    ).run()  # pyright: ignore[reportUnknownMemberType]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])  # pyright: ignore[reportAny]
+
+
+def wait_until_up(port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+                sock.sendall(REQUEST)
+                if sock.recv(12).startswith(b"HTTP/1.1 200"):
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"Server on port {port} did not start")
+
+
+async def _connection(port: int, deadline: float) -> int:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    done = 0
+    try:
+        while time.monotonic() < deadline:
+            writer.write(REQUEST)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            _ = await reader.readexactly(length)
+            done += 1
+    finally:
+        writer.close()
+    return done
+
+
+def load(port: int, connections: int, duration: float) -> int:
+    """One client process: `connections` keep-alive connections in a loop."""
+
+    async def run() -> int:
+        deadline = time.monotonic() + duration
+        counts = await asyncio.gather(
+            *(_connection(port, deadline) for _ in range(connections))
+        )
+        return sum(counts)
+
+    return asyncio.run(run())
+
+
+def children(pid: int) -> list[int]:
+    path = Path(f"/proc/{pid}/task/{pid}/children")
+    return [int(child) for child in path.read_text().split()]
+
+
+def memory_kib(pid: int) -> dict[str, int]:
+    fields: dict[str, int] = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        fields[name] = int(value.split()[0])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def run_phase(mode: str, args: argparse.Namespace) -> None:
+    port = free_port()
+    workers: int = args.workers if mode == "prefork" else 1  # pyright: ignore[reportAny]
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.server", "--serve", mode,
+         "--port", str(port), "--workers", str(workers)],
+    )
+    try:
+        wait_until_up(port)
+        clients: int = args.clients  # pyright: ignore[reportAny]
+        duration: float = args.duration  # pyright: ignore[reportAny]
+        with ProcessPoolExecutor(max_workers=clients) as pool:
+            counts = pool.map(
+                load,
+                [port] * clients,
+                [args.connections] * clients,  # pyright: ignore[reportAny]
+                [duration] * clients,
+            )
+            requests = sum(counts)
+
+        pids = [server.pid] if mode == "single" else children(server.pid)
+        usage = [memory_kib(pid) for pid in pids]
+        print(f"\n== {mode} ({len(pids)} worker{'s' if len(pids) > 1 else ''}) ==")
+        print(f"throughput        {requests / duration:.0f} req/s")
+        for pid, mem in zip(pids, usage):
+            print(
+                f"worker {pid:<10} uss {mem['uss'] / 1024:7.1f} MiB  "
+                f"pss {mem['pss'] / 1024:7.1f} MiB  rss {mem['rss'] / 1024:7.1f} MiB"
+            )
+        if mode == "prefork":
+            master = memory_kib(server.pid)
+            total = master["pss"] + sum(mem["pss"] for mem in usage)
+            print(f"master            uss {master['uss'] / 1024:7.1f} MiB")
+            print(f"total pss         {total / 1024:.1f} MiB")
+    finally:
+        server.terminate()
+        _ = server.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.server",
+        description="Per-worker memory and aggregate RPS: main.py vs the pre-fork server.",
+    )
+    _ = parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    _ = parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    _ = parser.add_argument("--clients", type=int, default=2, help="load generator processes")
+    _ = parser.add_argument("--connections", type=int, default=32, help="per client process")
+    _ = parser.add_argument("--serve", choices=["single", "prefork"], help=argparse.SUPPRESS)
+    _ = parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:  # pyright: ignore[reportAny]
+        serve(args.serve, args.port, args.workers)  # pyright: ignore[reportAny]
+        return
+    for mode in ("single", "prefork"):
+        run_phase(mode, args)
+
+
+if __name__ == "__main__":
+    main()
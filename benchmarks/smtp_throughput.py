@@ -0,0 +1,150 @@
+"""Email delivery throughput against a local SMTP sink (aiosmtpd).
+
+Sends `--messages` rendered emails from `--concurrency` concurrent senders
+(as many tasks as a threads-pool worker runs at once), over:
+
+- `connect per message`: a fresh SMTP session for every email, as before
+  the connection pool.
+- `pooled`: `SMTPTransport` with batching off (`batch_size: 1`).
+- `pooled + batched`: `SMTPTransport` with `--batch-size`/`--batch-wait-ms`.
+
+The sink accepts everything and can add `--server-latency-ms` per message
+to behave like a remote relay. Throughput is reported with the time it
+would take to clear a 100k-message backlog at that rate.
+
+    python -m benchmarks.smtp_throughput --messages 5000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import socket
+import time
+from collections.abc import Awaitable, Callable
+from email.message import EmailMessage
+from typing import Any
+
+from aiosmtpd.controller import Controller
+from aiosmtplib import SMTP
+
+from src.core.env import SmtpServerConfig
+from src.services.email_service import email_service
+from src.services.email_transport import SMTPTransport
+
+BACKLOG = 100_000
+
+
+class CountingSink:
+    """aiosmtpd handler accepting every message after `latency` seconds."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency: float = latency
+        self.received: int = 0
+
+    async def handle_DATA(self, server: Any, session: Any, envelope: Any) -> str:  # pyright: ignore[reportExplicitAny, reportAny]
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.received += 1
+        return "250 Message accepted for delivery"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])  # pyright: ignore[reportAny]
+
+
+def build_message(n: int) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = "Password Reset Request"
+    message["From"] = "no-reply@example.com"
+    message["To"] = f"user{n}@example.com"
+    message.set_content(
+        email_service.render_template(
+            "email/password_reset_email.html",
+            {"reset_link": f"https://example.com/reset?token={n:032d}"},
+        ),
+        subtype="html",
+    )
+    return message
+
+
+async def run_phase(
+    label: str,
+    send: Callable[[EmailMessage], Awaitable[None]],
+    messages: list[EmailMessage],
+    concurrency: int,
+    sink: CountingSink,
+) -> None:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(message: EmailMessage) -> None:
+        async with slots:
+            await send(message)
+
+    received = sink.received
+    started = time.perf_counter()
+    _ = await asyncio.gather(*(one(message) for message in messages))
+    elapsed = time.perf_counter() - started
+    assert sink.received - received == len(messages), "the sink missed messages"
+
+    rate = len(messages) / elapsed
+    print(
+        f"{label:<22} {rate:>8.0f} msg/s   100k backlog in "
+        f"{BACKLOG / rate / 60:6.1f} min"
+    )
+
+
+def settings(port: int, **overrides: Any) -> SmtpServerConfig:  # pyright: ignore[reportExplicitAny, reportAny]
+    return SmtpServerConfig(server="127.0.0.1", port=port, **overrides)  # pyright: ignore[reportAny]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.smtp_throughput",
+        description="Messages per second to a local aiosmtpd sink.",
+    )
+    _ = parser.add_argument("--messages", type=int, default=5_000)
+    _ = parser.add_argument("--concurrency", type=int, default=32)
+    _ = parser.add_argument("--pool-size", type=int, default=4)
+    _ = parser.add_argument("--batch-size", type=int, default=50)
+    _ = parser.add_argument("--batch-wait-ms", type=int, default=20)
+    _ = parser.add_argument("--server-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    concurrency: int = args.concurrency  # pyright: ignore[reportAny]
+
+    sink = CountingSink(latency=args.server_latency_ms / 1000)  # pyright: ignore[reportAny]
+    port = free_port()
+    controller = Controller(sink, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        messages = [build_message(n) for n in range(args.messages)]  # pyright: ignore[reportAny]
+
+        async def connect_per_message(message: EmailMessage) -> None:
+            smtp = SMTP(hostname="127.0.0.1", port=port)
+            _ = await smtp.connect()
+            _ = await smtp.send_message(message)
+            _ = await smtp.quit()
+
+        await run_phase(
+            "connect per message", connect_per_message, messages, concurrency, sink
+        )
+
+        for label, batch_size in (("pooled", 1), ("pooled + batched", args.batch_size)):  # pyright: ignore[reportAny]
+            transport = SMTPTransport(
+                settings(
+                    port,
+                    pool_size=args.pool_size,  # pyright: ignore[reportAny]
+                    batch_size=batch_size,
+                    batch_wait_ms=args.batch_wait_ms,  # pyright: ignore[reportAny]
+                )
+            )
+            try:
+                await run_phase(label, transport.send_message, messages, concurrency, sink)
+            finally:
+                await transport.close()
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+"""Email worker throughput per Celery pool against a local SMTP stand-in.
+
+Runs the real `send_password_reset_email` task function the way each
+worker pool executes it, without a broker: `solo` runs one task at a time,
+`threads` runs `--concurrency` tasks at once from a thread pool (what
+`celery worker -P threads -c N` does). All tasks share the worker event
+loop, SMTP pool and batch sender, and deliver to an aiosmtpd sink that can
+add `--server-latency-ms` per message like a remote relay.
+
+With `--flood N`, N welcome emails are queued just before
+`--resets` password resets, and the p50/p95 time from queueing to delivery
+of the resets is compared between one shared queue and the two priority
+lanes, each with its own pool. With `--rate-limit`, the threads pool is
+also run through `SMTPThrottle` to check the achieved rate against the cap.
+
+    python -m benchmarks.worker_pool --messages 2000 --concurrency 32
+    python -m benchmarks.worker_pool --flood 2000 --resets 100 --rate-limit 200
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from aiosmtpd.controller import Controller
+
+from benchmarks.smtp_throughput import BACKLOG, CountingSink, free_port, settings
+from src.services.email_service import email_service
+from src.services.email_transport import SMTPTransport
+from src.tasks.email_task import send_password_reset_email, send_welcome_email
+from src.tasks.loop import worker_loop
+
+
+def send_reset(n: int) -> None:
+    _ = send_password_reset_email(
+        to_email={"name": f"user{n}", "email": f"user{n}@example.com"},
+        reset_link=f"https://example.com/reset?token={n:032d}",
+    )
+
+
+def send_welcome(n: int) -> None:
+    _ = send_welcome_email(
+        to_email={"name": f"new{n}", "email": f"new{n}@example.com"}
+    )
+
+
+def timed_reset(n: int, queued_at: float) -> float:
+    send_reset(n)
+    return time.perf_counter() - queued_at
+
+
+def run_lanes(
+    label: str,
+    low: ThreadPoolExecutor,
+    high: ThreadPoolExecutor,
+    flood: int,
+    resets: int,
+) -> None:
+    """Queue the welcome flood on `low`, then the resets on `high`."""
+    welcomes = [low.submit(send_welcome, n) for n in range(flood)]
+    latencies: list[Future[float]] = [
+        high.submit(timed_reset, n, time.perf_counter()) for n in range(resets)
+    ]
+    waits = [latency.result() for latency in latencies]
+    for welcome in welcomes:
+        welcome.result()
+    quantiles = statistics.quantiles(waits, n=100)
+    print(
+        f"{label:<16} reset queued-to-sent  p50 {quantiles[49] * 1000:8.1f} ms  "
+        f"p95 {quantiles[94] * 1000:8.1f} ms"
+    )
+
+
+def run_pool(label: str, workers: int, messages: int, sink: CountingSink) -> None:
+    received = sink.received
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        _ = list(pool.map(send_reset, range(messages)))
+    elapsed = time.perf_counter() - started
+    assert sink.received - received == messages, "the sink missed messages"
+
+    rate = messages / elapsed
+    print(
+        f"{label:<16} {rate:>8.0f} msg/s   100k backlog in "
+        f"{BACKLOG / rate / 60:6.1f} min"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.worker_pool",
+        description="Email task throughput per pool, lane isolation and throttling.",
+    )
+    _ = parser.add_argument("--messages", type=int, default=2_000)
+    _ = parser.add_argument("--concurrency", type=int, default=32, help="threads pool size")
+    _ = parser.add_argument("--pool-size", type=int, default=4, help="SMTP sessions")
+    _ = parser.add_argument("--server-latency-ms", type=float, default=5.0)
+    _ = parser.add_argument("--flood", type=int, default=0, help="welcome emails ahead of the resets")
+    _ = parser.add_argument("--resets", type=int, default=100)
+    _ = parser.add_argument("--low-concurrency", type=int, default=8, help="low lane threads")
+    _ = parser.add_argument("--rate-limit", type=float, default=0, help="messages/s cap")
+    args = parser.parse_args()
+    messages: int = args.messages  # pyright: ignore[reportAny]
+    concurrency: int = args.concurrency  # pyright: ignore[reportAny]
+
+    sink = CountingSink(latency=args.server_latency_ms / 1000)  # pyright: ignore[reportAny]
+    port = free_port()
+    controller = Controller(sink, hostname="127.0.0.1", port=port)
+    controller.start()
+    email_service.transport = SMTPTransport(
+        settings(port, pool_size=args.pool_size)  # pyright: ignore[reportAny]
+    )
+    try:
+        run_pool("solo", 1, messages, sink)
+        run_pool(f"threads -c {concurrency}", concurrency, messages, sink)
+
+        if args.flood:  # pyright: ignore[reportAny]
+            print()
+            with ThreadPoolExecutor(max_workers=concurrency) as shared:
+                run_lanes("one queue", shared, shared, args.flood, args.resets)  # pyright: ignore[reportAny]
+            with (
+                ThreadPoolExecutor(max_workers=args.low_concurrency) as low,  # pyright: ignore[reportAny]
+                ThreadPoolExecutor(max_workers=concurrency) as high,
+            ):
+                run_lanes("two lanes", low, high, args.flood, args.resets)  # pyright: ignore[reportAny]
+
+        if args.rate_limit:  # pyright: ignore[reportAny]
+            worker_loop.run(email_service.close(), timeout=10)
+            email_service.transport = SMTPTransport(
+                settings(
+                    port,
+                    pool_size=args.pool_size,  # pyright: ignore[reportAny]
+                    rate_limit_per_second=args.rate_limit,  # pyright: ignore[reportAny]
+                )
+            )
+            print(f"\nthrottled to {args.rate_limit:.0f} msg/s")  # pyright: ignore[reportAny]
+            run_pool(f"threads -c {concurrency}", concurrency, messages, sink)
+    finally:
+        worker_loop.run(email_service.close(), timeout=10)
+        worker_loop.stop()
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
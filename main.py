@@ -9,4 +9,6 @@ if __name__ == "__main__":
         port=config.env.port,
         reload=config.env.reload,
         log_level=config.env.log_level,
+        proxy_headers=True,
+        forwarded_allow_ips=config.env.forwarded_allow_ips,
     )
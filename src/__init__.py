@@ -6,8 +6,10 @@ from fastapi import FastAPI
 from fastapi.exceptions import HTTPException, RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
+from prometheus_client import make_asgi_app
 
 from src.api import register_api_routes
+from src.auth.util.existence import user_existence_filter
 from src.config import config
 from src.core.db import init_db
 from src.core.exception import AppException
@@ -17,17 +19,29 @@ from src.middlewares.exception import (app_exception_handler,
                                        http_exception_handler,
                                        validation_exception_handler)
 from src.middlewares.request import jwt_decoder, logging_middleware
-from src.utils.logging import main_logger
+from src.services.login_events import login_events
+from src.services.qr_service import qr_code_service
+from src.tasks.executor import task_executor
+from src.utils.logging import app_logger, main_logger
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
+    _ = app_logger()
     main_logger.info("🚀 Starting database migration...")
     try:
         await init_db()
         main_logger.info("✅ Database migration completed!")
         await init_redis()
-        main_logger.info("✅ Redis cache initialized successfully.")
+        if config.redis.url:
+            main_logger.info("✅ Redis cache initialized successfully.")
+        task_executor.start()
+        login_events.start()
+        users = await user_existence_filter.rebuild()
+        if users is None:
+            main_logger.info("✅ User existence filter already built in Redis.")
+        else:
+            main_logger.info(f"✅ User existence filter built ({users} users).")
     except ConnectionError as e:
         main_logger.error(f"❌ Redis connection failed: {e}")
         raise e
@@ -35,6 +49,9 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
         main_logger.error(f"❌ Migration failed: {e}")
         raise e
     yield
+    await login_events.stop()
+    await task_executor.stop()
+    qr_code_service.shutdown()
 
 
 app = FastAPI(
@@ -109,6 +126,7 @@ _ = app.middleware(middleware_type="http")(logging_middleware)
 
 
 register_api_routes(app)
+app.mount("/metrics", make_asgi_app())
 
 
 @app.get("/")
@@ -5,8 +5,12 @@ from sqlmodel import SQLModel
 
 from alembic import context
 from src.config import config as app_config
+from src.entities.dead_letter_entity import \
+    DeadLetterTaskModel  # pyright: ignore[reportUnusedImport]
+from src.entities.outbox_entity import \
+    OutboxMessageModel  # pyright: ignore[reportUnusedImport]
 from src.entities.user_entity import (  # pyright: ignore[reportUnusedImport]
-    ProfileModel, UserModel)
+    LoginEventModel, ProfileModel, RecoveryCodeModel, UserModel)
 from src.schemas import *
 
 # this is the Alembic Config object, which provides
@@ -66,6 +70,16 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # Reuse a caller-provided connection (e.g. one holding the migration lock
+    # in src.utils.alembic_utils.upgrade_database_if_needed).
+    connection = config.attributes.get("connection", None)
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -1,30 +1,78 @@
+import asyncio
 from typing import cast
 
-import qrcode
 from jose import ExpiredSignatureError, JWTError
 from pydantic import EmailStr
 
 from src.auth.repositories.base import BaseAuthRepository
 from src.auth.schemas.auth import (ActivateUserAccountResponse,
-                                   PasswordResetRequest, UserCreate,
+                                   PasswordResetRequest,
+                                   RecoveryCodesRemaining,
+                                   RecoveryCodesResponse, UserCreate,
                                    UserResponse)
 from src.auth.schemas.token import (AccessToken, ActivateAccountToken,
                                     JWTPayload, RefreshToken, Temp2TAToken,
                                     TokenModel)
-from src.auth.util.mfa import generate_totp_secret, get_totp_uri, verify_totp
+from src.auth.util.existence import user_existence_filter
+from src.auth.util.lockout import login_lockout, mfa_lockout
+from src.auth.util.mfa import (generate_totp_secret, get_totp_uri,
+                               totp_verifier)
 from src.auth.util.password import password_validator
+from src.auth.util.recovery import recovery_code_manager
+from src.auth.util.scopes import effective_scopes
 from src.auth.util.token import jwt_auth_token
-from src.core.exception import AppException, UnauthorizedException
+from src.core.exception import (AppException, ConflictException,
+                                InvalidCredentialsException, NotFoundException,
+                                TooManyRequestsException,
+                                UnauthorizedException)
+from src.entities.outbox_entity import OutboxMessageModel
 from src.entities.user_entity import UserModel
+from src.services.login_events import login_events
+from src.services.qr_service import QR_FORMAT, qr_code_service
 
 
 class AuthController:
     def __init__(self, repository: BaseAuthRepository) -> None:
         self.repository: BaseAuthRepository = repository
 
-    async def sign_up(self, user_create: UserCreate) -> ActivateUserAccountResponse:
-        user: UserModel = await self.repository.create_user(user_create)
-        return self.__prepare_activate_token_data(user)
+    async def sign_up(
+        self, user_create: UserCreate, activation_url: str
+    ) -> ActivateUserAccountResponse:
+        """Create the user and, in the same transaction, queue the activation email."""
+        responses: list[ActivateUserAccountResponse] = []
+
+        def activation_email(user: UserModel) -> list[OutboxMessageModel]:
+            response = self.__prepare_activate_token_data(user)
+            responses.append(response)
+            return [
+                OutboxMessageModel(
+                    task_name="send_activate_email",
+                    payload={
+                        "activate_user_response": response.model_dump(mode="json"),
+                        "activation_link": f"{activation_url}?token={response.token.token}",
+                    },
+                )
+            ]
+
+        user = await self.repository.create_user(user_create, outbox=activation_email)
+        await user_existence_filter.add(username=user.username, email=user.email)
+        return responses[0]
+
+    async def ensure_new_user(self, username: str | None, email: str | None) -> None:
+        """Reject a sign-up for a taken username/email before any hashing.
+
+        The existence filter rules out almost every new user without a query;
+        only possible duplicates are confirmed against the unique indexes.
+        """
+        if not await user_existence_filter.might_exist(username=username, email=email):
+            return
+        if await self.repository.user_exists(username=username, email=email):
+            raise ConflictException(message="User already exist")
+
+    async def is_username_available(self, username: str) -> bool:
+        if not await user_existence_filter.might_exist(username=username):
+            return True
+        return not await self.repository.user_exists(username=username)
 
     async def send_activation_email(
         self, email: EmailStr
@@ -38,7 +86,17 @@ class AuthController:
         try:
             payload: dict[str, str | bool] = jwt_auth_token.decode_token(token=token)
             username: str = cast(str, payload.get("username"))
-            user = await self.repository.activate_user_account(username=username)
+            user = await self.repository.activate_user_account(
+                username=username,
+                outbox=lambda user: [
+                    OutboxMessageModel(
+                        task_name="send_welcome_email",
+                        payload={
+                            "to_email": {"name": user.username, "email": user.email}
+                        },
+                    )
+                ],
+            )
             return user
         except ExpiredSignatureError:
             raise UnauthorizedException(
@@ -77,6 +135,7 @@ class AuthController:
                 {"token": temp_2fa_token, "duration": temp_2fa_timestamp}
             )
         else:
+            data["scp"] = effective_scopes(user.role, user.scopes)
             access_token, access_timestamp = jwt_auth_token.access_token(data)
             refresh_token, refresh_timestamp = jwt_auth_token.refresh_token(data)
             token = TokenModel(
@@ -90,13 +149,37 @@ class AuthController:
 
         return UserResponse(requires_2fa=user.is_2fa_enabled, token=token)
 
-    async def log_in(self, username: str, password: str):
-        user: UserModel = await self.repository.authenticate_user(
-            username=username, password=password
-        )
+    async def log_in(self, username: str, password: str, client_ip: str | None = None):
+        # Locked accounts are turned away before Argon2 runs.
+        retry_after = await login_lockout.check(username=username, ip=client_ip)
+        if retry_after:
+            raise TooManyRequestsException(
+                retry_after=retry_after,
+                message="Too many failed login attempts. Try again later.",
+            )
+        try:
+            user: UserModel = await self.repository.authenticate_user(
+                username=username, password=password
+            )
+        except (InvalidCredentialsException, NotFoundException):
+            await login_lockout.record_failure(username=username, ip=client_ip)
+            raise
+        await login_lockout.reset(username=username)
+        if not user.is_2fa_enabled:
+            _ = login_events.record(cast(int, user.id), "password", client_ip)
         return self.__prepare_token_data(user)
 
-    async def log_in_2fa(self, token: str, totp_token: str):
+    async def __check_mfa_lockout(self, user_id: int, client_ip: str | None) -> None:
+        retry_after = await mfa_lockout.check(str(user_id), ip=client_ip)
+        if retry_after:
+            raise TooManyRequestsException(
+                retry_after=retry_after,
+                message="Too many failed 2FA attempts. Try again later.",
+            )
+
+    async def log_in_2fa(
+        self, token: str, totp_token: str, client_ip: str | None = None
+    ):
         try:
             payload: dict[str, str | bool] = jwt_auth_token.decode_token(token=token)
             if not payload.get("mfa_pending", False):
@@ -107,11 +190,17 @@ class AuthController:
             if not user.is_2fa_enabled:
                 raise UnauthorizedException(message="2FA is not enabled for this user")
 
-            if not verify_totp(
-                token=totp_token, totp_secret=cast(str, user.totp_secret)
+            await self.__check_mfa_lockout(cast(int, user.id), client_ip)
+            if not await totp_verifier.verify(
+                token=totp_token,
+                totp_secret=cast(str, user.totp_secret),
+                user_id=cast(int, user.id),
             ):
+                await mfa_lockout.record_failure(str(user.id), ip=client_ip)
                 raise UnauthorizedException(message="Invalid TOTP token")
+            await mfa_lockout.reset(str(user.id))
 
+            _ = login_events.record(cast(int, user.id), "totp", client_ip)
             return self.__prepare_token_data(user, totp_provided=True)
         except ExpiredSignatureError:
             raise UnauthorizedException(
@@ -120,22 +209,76 @@ class AuthController:
         except JWTError:
             raise UnauthorizedException(message="Invalid token")
 
-    async def get_access_token(self, token_string: str) -> AccessToken | None:
+    async def log_in_recovery_code(
+        self, token: str, recovery_code: str, client_ip: str | None = None
+    ):
+        try:
+            payload: dict[str, str | bool] = jwt_auth_token.decode_token(token=token)
+            if not payload.get("mfa_pending", False):
+                raise UnauthorizedException(message="2FA is not pending for this token")
+            username: str = cast(str, payload.get("username"))
+            user = await self.repository.get_user_by_username(username=username)
+            user_id = cast(int, user.id)
+            await self.__check_mfa_lockout(user_id, client_ip)
+
+            code = await self.repository.get_recovery_code(
+                user_id=user_id,
+                code_index=recovery_code_manager.index(
+                    user_id=user_id, code=recovery_code
+                ),
+            )
+            if (
+                code is None
+                # Argon2: keep it off the event loop.
+                or not await asyncio.to_thread(
+                    recovery_code_manager.verify,
+                    code=recovery_code,
+                    hashed_code=code.hashed_code,
+                )
+                or not await self.repository.consume_recovery_code(
+                    code_id=cast(int, code.id)
+                )
+            ):
+                await mfa_lockout.record_failure(str(user_id), ip=client_ip)
+                raise UnauthorizedException(message="Invalid recovery code")
+            await mfa_lockout.reset(str(user_id))
+
+            _ = login_events.record(user_id, "recovery_code", client_ip)
+            return self.__prepare_token_data(user, totp_provided=True)
+        except ExpiredSignatureError:
+            raise UnauthorizedException(
+                message="Token has expired",
+            )
+        except JWTError:
+            raise UnauthorizedException(message="Invalid token")
+
+    async def get_access_token(self, token_string: str) -> AccessToken:
         try:
             payload: dict[str, str | bool] = jwt_auth_token.decode_token(
                 token=token_string
             )
-            if payload:
-                access_token, access_timestamp = jwt_auth_token.access_token(
-                    data={
-                        "username": cast(str, payload.get("username", "")),
-                        "email": cast(str, payload.get("email", "")),
-                        "user_id": int(payload.get("user_id", 0)),
-                    },
-                )
-                return AccessToken.model_validate(
-                    {"token": access_token, "duration": access_timestamp}
+            if not payload:
+                raise UnauthorizedException(message="Invalid token")
+            if payload.get("typ") != "refresh":
+                raise UnauthorizedException(message="A refresh token is required")
+            # Scopes are re-read here so changed grants reach new access tokens.
+            try:
+                user = await self.repository.get_user_by_username(
+                    username=cast(str, payload.get("username", ""))
                 )
+            except AppException:
+                raise UnauthorizedException(message="Invalid token")
+            access_token, access_timestamp = jwt_auth_token.access_token(
+                data={
+                    "username": user.username,
+                    "email": user.email,
+                    "user_id": cast(int, user.id),
+                    "scp": effective_scopes(user.role, user.scopes),
+                },
+            )
+            return AccessToken.model_validate(
+                {"token": access_token, "duration": access_timestamp}
+            )
         except ExpiredSignatureError:
             raise UnauthorizedException(
                 message="Token has expired",
@@ -170,7 +313,7 @@ class AuthController:
         user = await self.repository.get_user_by_email(email=email)
         return self.__prepare_activate_token_data(user)
 
-    async def enable_2fa(self, username: str):
+    async def enable_2fa(self, username: str, qr_format: QR_FORMAT = "png"):
         user = await self.repository.get_user_by_username(username=username)
         if user.is_2fa_enabled:
             raise AppException(message="2FA is already enabled for this user.")
@@ -182,19 +325,11 @@ class AuthController:
         uri = get_totp_uri(
             user_email=user.email, totp_secret=cast(str, user.totp_secret)
         )
-        qr = qrcode.make(uri)
-
-        import base64
-        import io
-
-        buffer = io.BytesIO()
-        qr.save(buffer, kind="png")
-        qr_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
-
-        return {
-            "secret": totp_secret,
-            "qr_code": f"data:image/png;base64,{qr_base64}",
-        }
+        result = {"secret": totp_secret, "provisioning_uri": uri}
+        qr_code = await qr_code_service.render(uri=uri, qr_format=qr_format)
+        if qr_code is not None:
+            result["qr_code"] = qr_code
+        return result
 
     async def disable_2fa(self, username: str):
         user = await self.repository.get_user_by_username(username=username)
@@ -203,3 +338,33 @@ class AuthController:
 
         user = await self.repository.disable_2fa(username=user.username)
         return {"message": "2FA disabled"}
+
+    async def regenerate_recovery_codes(self, username: str) -> RecoveryCodesResponse:
+        user = await self.repository.get_user_by_username(username=username)
+        if not user.is_2fa_enabled:
+            raise AppException(message="2FA is not enabled for this user.")
+
+        user_id = cast(int, user.id)
+        codes = recovery_code_manager.generate()
+        # One Argon2 hash per code: keep the batch off the event loop.
+        hashed_codes = await asyncio.to_thread(
+            lambda: [recovery_code_manager.hash(code) for code in codes]
+        )
+        await self.repository.replace_recovery_codes(
+            user_id=user_id,
+            codes=[
+                (recovery_code_manager.index(user_id=user_id, code=code), hashed)
+                for code, hashed in zip(codes, hashed_codes)
+            ],
+        )
+        return RecoveryCodesResponse(
+            recovery_codes=codes,
+            message="Store these codes safely. Each can be used once and they will not be shown again.",
+        )
+
+    async def remaining_recovery_codes(self, username: str) -> RecoveryCodesRemaining:
+        user = await self.repository.get_user_by_username(username=username)
+        remaining = await self.repository.count_recovery_codes(
+            user_id=cast(int, user.id)
+        )
+        return RecoveryCodesRemaining(remaining=remaining)
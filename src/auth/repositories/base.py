@@ -1,14 +1,28 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 
 from pydantic import EmailStr
 
 from src.auth.schemas.auth import UserCreate
-from src.entities.user_entity import UserModel
+from src.entities.outbox_entity import OutboxMessageModel
+from src.entities.user_entity import RecoveryCodeModel, UserModel
+
+# Builds the outbox messages for a user change; called after the change is
+# flushed (so the user has an id) and committed in the same transaction.
+type OutboxFactory = Callable[[UserModel], list[OutboxMessageModel]]
 
 
 class BaseAuthRepository(ABC):
     @abstractmethod
-    async def create_user(self, user_create: UserCreate) -> UserModel:
+    async def create_user(
+        self, user_create: UserCreate, outbox: OutboxFactory | None = None
+    ) -> UserModel:
+        pass
+
+    @abstractmethod
+    async def user_exists(
+        self, username: str | None = None, email: EmailStr | None = None
+    ) -> bool:
         pass
 
     @abstractmethod
@@ -24,7 +38,9 @@ class BaseAuthRepository(ABC):
         pass
 
     @abstractmethod
-    async def activate_user_account(self, username: str) -> UserModel:
+    async def activate_user_account(
+        self, username: str, outbox: OutboxFactory | None = None
+    ) -> UserModel:
         pass
 
     @abstractmethod
@@ -40,3 +56,24 @@ class BaseAuthRepository(ABC):
     @abstractmethod
     async def disable_2fa(self, username: str) -> UserModel:
         pass
+
+    @abstractmethod
+    async def replace_recovery_codes(
+        self, user_id: int, codes: list[tuple[str, str]]
+    ) -> None:
+        """Replace a user's codes with `(code_index, hashed_code)` pairs."""
+        pass
+
+    @abstractmethod
+    async def get_recovery_code(
+        self, user_id: int, code_index: str
+    ) -> RecoveryCodeModel | None:
+        pass
+
+    @abstractmethod
+    async def consume_recovery_code(self, code_id: int) -> bool:
+        pass
+
+    @abstractmethod
+    async def count_recovery_codes(self, user_id: int) -> int:
+        pass
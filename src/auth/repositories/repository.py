@@ -1,16 +1,19 @@
-from typing import override
+from datetime import datetime, timezone
+from typing import cast, override
 
 from pydantic import EmailStr
-from sqlalchemy import ScalarResult
+from sqlalchemy import CursorResult, ScalarResult, delete, func, or_, update
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from sqlmodel import select
+from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.auth.repositories.base import BaseAuthRepository
+from src.auth.repositories.base import BaseAuthRepository, OutboxFactory
 from src.auth.schemas.auth import UserCreate
+from src.auth.util.negative_cache import negative_lookup_cache
 from src.auth.util.password import password_validator
-from src.core.exception import AppException, ConflictException, NotFoundException
-from src.entities.user_entity import UserModel
+from src.core.exception import (AppException, ConflictException,
+                                InvalidCredentialsException, NotFoundException)
+from src.entities.user_entity import RecoveryCodeModel, UserModel
 
 
 class AuthRepository(BaseAuthRepository):
@@ -18,7 +21,9 @@ class AuthRepository(BaseAuthRepository):
         self.db: AsyncSession = db
 
     @override
-    async def create_user(self, user_create: UserCreate) -> UserModel:
+    async def create_user(
+        self, user_create: UserCreate, outbox: OutboxFactory | None = None
+    ) -> UserModel:
         try:
             user_dict = user_create.model_dump(exclude={"password_one", "password_two"})
             user_dict["hashed_password"] = password_validator.get_password_hash(
@@ -27,7 +32,13 @@ class AuthRepository(BaseAuthRepository):
 
             user = UserModel(**user_dict)  # pyright: ignore[reportAny]
             self.db.add(instance=user)
+            if outbox is not None:
+                await self.db.flush()
+                self.db.add_all(outbox(user))
             await self.db.commit()
+            await negative_lookup_cache.invalidate(
+                username=user.username, email=user.email
+            )
             await self.db.refresh(instance=user)
             return user
         except IntegrityError:
@@ -38,7 +49,25 @@ class AuthRepository(BaseAuthRepository):
             raise e
 
     @override
-    async def activate_user_account(self, username: str) -> UserModel:
+    async def user_exists(
+        self, username: str | None = None, email: EmailStr | None = None
+    ) -> bool:
+        conditions = []
+        if username:
+            conditions.append(UserModel.username == username)
+        if email:
+            conditions.append(UserModel.email == email)
+        if not conditions:
+            return False
+        result: ScalarResult[int | None] = await self.db.exec(
+            select(UserModel.id).where(or_(*conditions)).limit(1)  # pyright: ignore[reportUnknownArgumentType]
+        )
+        return result.first() is not None
+
+    @override
+    async def activate_user_account(
+        self, username: str, outbox: OutboxFactory | None = None
+    ) -> UserModel:
         try:
             result: ScalarResult[UserModel] = await self.db.exec(
                 select(UserModel).where(UserModel.username == username)
@@ -48,6 +77,8 @@ class AuthRepository(BaseAuthRepository):
                 raise AppException(message="User account is already active.")
             user.is_active = True
             self.db.add(instance=user)
+            if outbox is not None:
+                self.db.add_all(outbox(user))
             await self.db.commit()
             await self.db.refresh(instance=user)
             return user
@@ -65,13 +96,15 @@ class AuthRepository(BaseAuthRepository):
             if not password_validator.verify_password(
                 plain_password=password, hashed_password=user.hashed_password
             ):
-                raise AppException(message="Incorrect username or password")
+                raise InvalidCredentialsException()
             return user
         except Exception as e:
             raise e
 
     @override
     async def get_user_by_username(self, username: str) -> UserModel:
+        if await negative_lookup_cache.is_missing("username", username):
+            raise NotFoundException(message="Incorrect username or password")
         try:
             result: ScalarResult[UserModel] = await self.db.exec(
                 select(UserModel).where(UserModel.username == username)
@@ -82,6 +115,7 @@ class AuthRepository(BaseAuthRepository):
             return user
 
         except NoResultFound:
+            await negative_lookup_cache.record_missing("username", username)
             raise NotFoundException(
                 message="Incorrect username or password",
             )
@@ -90,6 +124,8 @@ class AuthRepository(BaseAuthRepository):
 
     @override
     async def get_user_by_email(self, email: EmailStr) -> UserModel:
+        if await negative_lookup_cache.is_missing("email", email):
+            raise NotFoundException(message="Incorrect username or password")
         try:
             result: ScalarResult[UserModel] = await self.db.exec(
                 select(UserModel).where(UserModel.email == email)
@@ -97,6 +133,7 @@ class AuthRepository(BaseAuthRepository):
             return result.one()
 
         except NoResultFound:
+            await negative_lookup_cache.record_missing("email", email)
             raise NotFoundException(
                 message="Incorrect username or password",
             )
@@ -141,8 +178,78 @@ class AuthRepository(BaseAuthRepository):
             user.is_2fa_enabled = False
             user.totp_secret = None
             self.db.add(instance=user)
+            _ = await self.db.execute(  # pyright: ignore[reportDeprecated]
+                delete(RecoveryCodeModel).where(
+                    col(RecoveryCodeModel.user_id) == user.id
+                )
+            )
             await self.db.commit()
             await self.db.refresh(instance=user)
             return user
         except Exception as e:
             raise e
+
+    @override
+    async def replace_recovery_codes(
+        self, user_id: int, codes: list[tuple[str, str]]
+    ) -> None:
+        try:
+            _ = await self.db.execute(  # pyright: ignore[reportDeprecated]
+                delete(RecoveryCodeModel).where(
+                    col(RecoveryCodeModel.user_id) == user_id
+                )
+            )
+            self.db.add_all(
+                [
+                    RecoveryCodeModel(
+                        user_id=user_id, code_index=code_index, hashed_code=hashed
+                    )
+                    for code_index, hashed in codes
+                ]
+            )
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            raise e
+
+    @override
+    async def get_recovery_code(
+        self, user_id: int, code_index: str
+    ) -> RecoveryCodeModel | None:
+        result: ScalarResult[RecoveryCodeModel] = await self.db.exec(
+            select(RecoveryCodeModel).where(
+                RecoveryCodeModel.code_index == code_index,
+                RecoveryCodeModel.user_id == user_id,
+                col(RecoveryCodeModel.used_at).is_(None),
+            )
+        )
+        return result.one_or_none()
+
+    @override
+    async def consume_recovery_code(self, code_id: int) -> bool:
+        """Mark a code used; False if a concurrent attempt consumed it first."""
+        result = cast(
+            CursorResult[tuple[()]],
+            await self.db.execute(  # pyright: ignore[reportDeprecated]
+                update(RecoveryCodeModel)
+                .where(
+                    col(RecoveryCodeModel.id) == code_id,
+                    col(RecoveryCodeModel.used_at).is_(None),
+                )
+                .values(used_at=datetime.now(timezone.utc))
+            ),
+        )
+        await self.db.commit()
+        return result.rowcount == 1
+
+    @override
+    async def count_recovery_codes(self, user_id: int) -> int:
+        result: ScalarResult[int] = await self.db.exec(
+            select(func.count())
+            .select_from(RecoveryCodeModel)
+            .where(
+                RecoveryCodeModel.user_id == user_id,
+                col(RecoveryCodeModel.used_at).is_(None),
+            )
+        )
+        return result.one()
@@ -1,30 +1,73 @@
+from datetime import datetime
 from typing import cast
 
-from fastapi import Depends, Request, status
+from fastapi import Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from src.auth.controller import AuthController
 from src.auth.schemas.auth import (ActivateUserAccountResponse,
                                    ActivationEmail, AuthLogin,
-                                   PasswordResetRequest, UserCreate,
-                                   UserResponse, Verify2FARequest)
+                                   PasswordResetRequest, RecoveryCodeLogin,
+                                   RecoveryCodesRemaining,
+                                   RecoveryCodesResponse, UserCreate,
+                                   UsernameAvailability, UserResponse,
+                                   Verify2FARequest)
 from src.auth.schemas.token import AccessToken, JWTPayload
+from src.auth.util.scopes import require_scopes
 from src.config import config
 from src.core.dependencies import get_auth_controller
+from src.core.idempotency import idempotency_store, idempotent, request_key
+from src.core.rate_limit import RateLimit
 from src.core.router.base import CustomRouter
-from src.middlewares.request import get_current_user
-from src.tasks.email_task import (  # pyright: ignore[reportUnknownVariableType]
-    log_task_success, send_activate_email, send_password_reset_email,
-    send_welcome_email)
-from src.tasks.utils import \
-    fire_and_forget  # pyright: ignore[reportUnknownVariableType]
+from src.services.login_events import login_events
+from src.services.qr_service import QR_FORMAT
+from src.tasks.coalesce import email_coalescer
+from src.tasks.utils import (  # pyright: ignore[reportUnknownVariableType]
+    email_task, fire_and_forget)
 from src.utils import is_valid_url
 
 auth_router = CustomRouter(prefix="/auth", tags=["Authentication"])
 
 
+async def reject_existing_user(
+    request: Request,
+    auth_controller: AuthController = Depends(
+        dependency=get_auth_controller
+    ),  # pyright: ignore[reportCallInDefaultInitializer]
+) -> None:
+    """Turn duplicate sign-ups away before body validation (zxcvbn) and Argon2.
+
+    Replays of an Idempotency-Key that already has a stored (or in-flight)
+    response skip the check so they still receive that response. A new key
+    is checked like any other request, so fresh keys cannot bypass it.
+    """
+    key = request_key(request)
+    if key is not None and await idempotency_store.has_record(key):
+        return
+    try:
+        body = await request.json()  # pyright: ignore[reportAny]
+    except Exception:
+        return
+    if not isinstance(body, dict):
+        return
+    fields = cast(dict[str, object], body)
+    username, email = fields.get("username"), fields.get("email")
+    await auth_controller.ensure_new_user(
+        username=username if isinstance(username, str) else None,
+        email=email if isinstance(email, str) else None,
+    )
+
+
 @auth_router.post(
-    path="/sign-up", response_model=dict[str, str], status_code=status.HTTP_201_CREATED
+    path="/sign-up",
+    response_model=dict[str, str],
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[
+        Depends(dependency=RateLimit(limit=5, window=60, identity_field="email")),
+        Depends(dependency=reject_existing_user),
+    ],
 )
+@idempotent
 async def sign_up(
     request: Request,
     user_create: UserCreate,
@@ -32,40 +75,64 @@ async def sign_up(
         dependency=get_auth_controller
     ),  # pyright: ignore[reportCallInDefaultInitializer]
 ) -> dict[str, str]:
-    activate_user_response: ActivateUserAccountResponse = await auth_controller.sign_up(
-        user_create=user_create
-    )
     FRONTEND_URL = cast(str, config.env.frontend_url)
     link = request.url_for("activate_account")
-    activation_link: str = (
-        f"{FRONTEND_URL+link.path if is_valid_url(url=FRONTEND_URL) else link}?token={activate_user_response.token.token}"
-    )
-    fire_and_forget(
-        send_activate_email.s(  # pyright: ignore[reportAny, reportFunctionMemberAccess]
-            activate_user_response=activate_user_response.model_dump(),
-            activation_link=activation_link,
-        ),
-        log_task_success.s(),  # pyright: ignore[reportAny, reportFunctionMemberAccess, ]
+    # The activation email is written to the outbox with the new user.
+    _ = await auth_controller.sign_up(
+        user_create=user_create,
+        activation_url=f"{FRONTEND_URL+link.path if is_valid_url(url=FRONTEND_URL) else link}",
     )
     return {
         "message": "User created successfully. Please check your email to activate your account."
     }
 
 
-@auth_router.post(path="/sign-in", response_model=UserResponse)
+@auth_router.get(
+    path="/username-availability",
+    response_model=UsernameAvailability,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(dependency=RateLimit(limit=30, window=60))],
+)
+async def username_availability(
+    username: str,
+    auth_controller: AuthController = Depends(
+        dependency=get_auth_controller
+    ),  # pyright: ignore[reportCallInDefaultInitializer]
+) -> UsernameAvailability:
+    return UsernameAvailability(
+        username=username,
+        available=await auth_controller.is_username_available(username=username),
+    )
+
+
+@auth_router.post(
+    path="/sign-in",
+    response_model=UserResponse,
+    dependencies=[
+        Depends(dependency=RateLimit(limit=10, window=60, identity_field="username"))
+    ],
+)
 async def sign_in(
+    request: Request,
     login_user: AuthLogin,
     auth_controller: AuthController = Depends(
         dependency=get_auth_controller
     ),  # pyright: ignore[reportCallInDefaultInitializer]
 ):
     return await auth_controller.log_in(
-        username=login_user.username, password=login_user.password.get_secret_value()
+        username=login_user.username,
+        password=login_user.password.get_secret_value(),
+        client_ip=request.client.host if request.client else None,
     )
 
 
-@auth_router.post(path="/sign-in-mfa", response_model=UserResponse)
+@auth_router.post(
+    path="/sign-in-mfa",
+    response_model=UserResponse,
+    dependencies=[Depends(dependency=RateLimit(limit=10, window=60))],
+)
 async def sign_in_mfa(
+    request: Request,
     verify_2FA: Verify2FARequest,
     token: str,
     auth_controller: AuthController = Depends(
@@ -73,7 +140,29 @@ async def sign_in_mfa(
     ),  # pyright: ignore[reportCallInDefaultInitializer]
 ):
     return await auth_controller.log_in_2fa(
-        token=token, totp_token=verify_2FA.totp_token
+        token=token,
+        totp_token=verify_2FA.totp_token,
+        client_ip=request.client.host if request.client else None,
+    )
+
+
+@auth_router.post(
+    path="/sign-in-recovery",
+    response_model=UserResponse,
+    dependencies=[Depends(dependency=RateLimit(limit=5, window=300))],
+)
+async def sign_in_recovery(
+    request: Request,
+    recovery_login: RecoveryCodeLogin,
+    token: str,
+    auth_controller: AuthController = Depends(
+        dependency=get_auth_controller
+    ),  # pyright: ignore[reportCallInDefaultInitializer]
+):
+    return await auth_controller.log_in_recovery_code(
+        token=token,
+        recovery_code=recovery_login.recovery_code,
+        client_ip=request.client.host if request.client else None,
     )
 
 
@@ -99,13 +188,8 @@ async def activate_account(
         dependency=get_auth_controller
     ),  # pyright: ignore[reportCallInDefaultInitializer]
 ):
-    user = await auth_controller.activate_account(token=token)
-    fire_and_forget(
-        send_welcome_email.s(  # pyright: ignore[reportAny, reportFunctionMemberAccess]
-            to_email={"name": user.username, "email": user.email},
-        ),
-        log_task_success.s(),  # pyright: ignore[reportAny, reportFunctionMemberAccess, ]
-    )
+    # The welcome email is written to the outbox with the activation.
+    _ = await auth_controller.activate_account(token=token)
     return {"message": "Account activated successfully. You can now log in."}
 
 
@@ -115,6 +199,7 @@ async def activate_account(
     status_code=status.HTTP_200_OK,
     name="send_activation_email",
 )
+@idempotent
 async def send_activation_email(
     request: Request,
     user_email: ActivationEmail,
@@ -131,12 +216,18 @@ async def send_activation_email(
         f"{FRONTEND_URL+link.path if is_valid_url(url=FRONTEND_URL) else link}?token={activate_user_response.token.token}"
     )
 
+    # Repeated clicks within the coalescing window only deliver the newest link.
+    coalesce_token = await email_coalescer.claim(
+        "send_activate_email", activate_user_response.email
+    )
     fire_and_forget(
-        send_activate_email.s(  # pyright: ignore[reportAny, reportFunctionMemberAccess]
+        email_task(
+            "send_activate_email",
             activate_user_response=activate_user_response.model_dump(),
             activation_link=activation_link,
+            coalesce_token=coalesce_token,
         ),
-        log_task_success.s(),  # pyright: ignore[reportAny, reportFunctionMemberAccess, ]
+        email_task("log_task_success"),
     )
     return {"message": "Activation email sent successfully. Please check your email."}
 
@@ -146,7 +237,11 @@ async def send_activation_email(
     response_model=dict[str, str],
     status_code=status.HTTP_200_OK,
     name="request_password_reset",
+    dependencies=[
+        Depends(dependency=RateLimit(limit=5, window=900, identity_field="email"))
+    ],
 )
+@idempotent
 async def request_password_reset(
     request: Request,
     user_email: ActivationEmail,
@@ -162,15 +257,20 @@ async def request_password_reset(
     reset_link: str = (
         f"{FRONTEND_URL+link.path if is_valid_url(url=FRONTEND_URL) else link}?token={activate_user_response.token.token}"
     )
+    coalesce_token = await email_coalescer.claim(
+        "send_password_reset_email", activate_user_response.email
+    )
     fire_and_forget(
-        send_password_reset_email.s(  # pyright: ignore[reportAny, reportFunctionMemberAccess]
+        email_task(
+            "send_password_reset_email",
             to_email={
                 "name": activate_user_response.username,
                 "email": activate_user_response.email,
             },
             reset_link=reset_link,
+            coalesce_token=coalesce_token,
         ),
-        log_task_success.s(),  # pyright: ignore[reportAny, reportFunctionMemberAccess, ]
+        email_task("log_task_success"),
     )
     return {"message": "A password reset link has been sent to your email."}
 
@@ -180,6 +280,7 @@ async def request_password_reset(
     response_model=dict[str, str],
     status_code=status.HTTP_200_OK,
     name="reset_password",
+    dependencies=[Depends(dependency=RateLimit(limit=10, window=900))],
 )
 async def reset_password(
     rest_password: PasswordResetRequest,
@@ -197,16 +298,24 @@ async def reset_password(
     response_model=dict[str, str],
     status_code=status.HTTP_200_OK,
     name="enable_2fa",
-    dependencies=[Depends(dependency=get_current_user)],
+    dependencies=[Depends(dependency=require_scopes("mfa:manage"))],
 )
 async def enable_2fa(
     request: Request,
+    response: Response,
+    qr_format: QR_FORMAT = "png",
     auth_controller: AuthController = Depends(
         dependency=get_auth_controller
     ),  # pyright: ignore[reportCallInDefaultInitializer]
 ):
+    """`qr_format=svg` returns a scalable SVG QR code, `qr_format=uri` only
+    the provisioning URI for apps that render the code themselves."""
     payload = cast(JWTPayload, request.state.user)
-    result = await auth_controller.enable_2fa(username=payload["username"])
+    result = await auth_controller.enable_2fa(
+        username=payload["username"], qr_format=qr_format
+    )
+    # The response carries the TOTP secret.
+    response.headers["Cache-Control"] = "no-store"
     return {**result, "message": "2FA enabled. Scan with your app."}
 
 
@@ -215,7 +324,7 @@ async def enable_2fa(
     response_model=dict[str, str],
     status_code=status.HTTP_200_OK,
     name="disable_2fa",
-    dependencies=[Depends(dependency=get_current_user)],
+    dependencies=[Depends(dependency=require_scopes("mfa:manage"))],
 )
 async def disable_2fa(
     request: Request,
@@ -225,3 +334,63 @@ async def disable_2fa(
 ):
     payload = cast(JWTPayload, request.state.user)
     return await auth_controller.disable_2fa(username=payload["username"])
+
+
+@auth_router.post(
+    path="/recovery-codes",
+    response_model=RecoveryCodesResponse,
+    status_code=status.HTTP_200_OK,
+    name="regenerate_recovery_codes",
+    dependencies=[Depends(dependency=require_scopes("mfa:manage"))],
+)
+async def regenerate_recovery_codes(
+    request: Request,
+    response: Response,
+    auth_controller: AuthController = Depends(
+        dependency=get_auth_controller
+    ),  # pyright: ignore[reportCallInDefaultInitializer]
+):
+    payload = cast(JWTPayload, request.state.user)
+    response.headers["Cache-Control"] = "no-store"
+    return await auth_controller.regenerate_recovery_codes(
+        username=payload["username"]
+    )
+
+
+@auth_router.get(
+    path="/recovery-codes/remaining",
+    response_model=RecoveryCodesRemaining,
+    status_code=status.HTTP_200_OK,
+    name="remaining_recovery_codes",
+    dependencies=[Depends(dependency=require_scopes("mfa:manage"))],
+)
+async def remaining_recovery_codes(
+    request: Request,
+    auth_controller: AuthController = Depends(
+        dependency=get_auth_controller
+    ),  # pyright: ignore[reportCallInDefaultInitializer]
+):
+    payload = cast(JWTPayload, request.state.user)
+    return await auth_controller.remaining_recovery_codes(
+        username=payload["username"]
+    )
+
+
+@auth_router.get(
+    path="/login-events",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    name="export_login_events",
+    dependencies=[Depends(dependency=require_scopes("login_events:read"))],
+)
+async def export_login_events(
+    request: Request,
+    since: datetime | None = None,
+) -> StreamingResponse:
+    """Stream the caller's login audit trail as NDJSON."""
+    payload = cast(JWTPayload, request.state.user)
+    return StreamingResponse(
+        login_events.export_ndjson(user_id=payload["user_id"], since=since),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-store"},
+    )
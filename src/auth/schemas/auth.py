@@ -101,3 +101,21 @@ class PasswordResetRequest(ConfirmPasswordsMixin):
 
 class Verify2FARequest(BaseModel):
     totp_token: str
+
+
+class RecoveryCodeLogin(BaseModel):
+    recovery_code: str
+
+
+class RecoveryCodesResponse(BaseModel):
+    recovery_codes: list[str]
+    message: str
+
+
+class RecoveryCodesRemaining(BaseModel):
+    remaining: int
+
+
+class UsernameAvailability(BaseModel):
+    username: str
+    available: bool
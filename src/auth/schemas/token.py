@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import NotRequired, TypedDict
+from typing import Literal, NotRequired, TypedDict
 
 from pydantic import ConfigDict
 from sqlmodel import Column  # pyright: ignore[reportUnknownVariableType]
@@ -81,12 +81,17 @@ class TokenData(SQLModel):
     )  # pyright: ignore[reportIncompatibleVariableOverride]
 
 
+type TOKEN_TYPE = Literal["access", "refresh", "activate", "2fa"]
+
+
 class JWTPayload(TypedDict):
     username: str
     email: str
     user_id: int
     mfa_pending: NotRequired[bool]
+    scp: NotRequired[int]
 
 
 class JWTPayloadWithExp(JWTPayload):
     exp: datetime
+    typ: TOKEN_TYPE
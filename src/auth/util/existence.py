@@ -0,0 +1,190 @@
+import hashlib
+import math
+from typing import cast
+
+from redis.exceptions import RedisError
+from sqlmodel import col, select
+
+from src.config import config
+from src.core.redis import get_redis
+from src.entities.user_entity import UserModel
+from src.utils.logging import main_logger
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter: no false negatives, `error_rate` false positives
+    once `capacity` keys are in.
+
+    Bit positions come from one BLAKE2b digest split into two hashes
+    (Kirsch-Mitzenmacher double hashing), so `k` probes cost one hash.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.size: int = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count: int = max(1, round(self.size / capacity * math.log(2)))
+        self.bits: bytearray = bytearray((self.size + 7) // 8)
+
+    def positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str) -> None:
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(key)
+        )
+
+
+class UserExistenceFilter:
+    """Answers "might this username/email already be taken?" without the DB.
+
+    A negative answer is definitive, so sign-up can skip the uniqueness
+    query and a duplicate is caught before password strength checks and
+    Argon2; a positive one must be confirmed with an indexed lookup. The
+    bits live in a Redis bitmap when Redis is available, so every API
+    process sees users created by the others; otherwise in a local
+    `BloomFilter`. Until the filter has been built from the `user` table it
+    answers "maybe" for everything.
+    """
+
+    def __init__(
+        self, capacity: int, error_rate: float, key: str = "auth_api:user_filter"
+    ) -> None:
+        self.local: BloomFilter = BloomFilter(capacity, error_rate)
+        # Bit positions depend on the filter size and hash count, so the
+        # shared bitmap is keyed by them: changing `user_filter` settings
+        # starts (and builds) a fresh bitmap instead of probing one built
+        # with other positions, which would give false negatives.
+        self.key: str = f"{key}:{self.local.size}x{self.local.hash_count}"
+        self.ready_key: str = f"{self.key}:ready"
+        self._local_ready: bool = False
+        self._redis_ready: bool = False
+
+    @staticmethod
+    def _keys(username: str | None = None, email: str | None = None) -> list[str]:
+        keys: list[str] = []
+        if username:
+            keys.append(f"u:{username.strip().lower()}")
+        if email:
+            keys.append(f"e:{email.strip().lower()}")
+        return keys
+
+    async def _redis_add(self, keys: list[str]) -> bool:
+        redis = get_redis()
+        if redis is None:
+            return False
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    for position in self.local.positions(key):
+                        _ = pipe.setbit(self.key, position, 1)
+                _ = await pipe.execute()
+            return True
+        except RedisError as e:
+            main_logger.warning(f"User filter falling back to local state: {e}")
+            return False
+
+    async def add(self, username: str | None = None, email: str | None = None) -> None:
+        keys = self._keys(username, email)
+        for key in keys:
+            self.local.add(key)
+        _ = await self._redis_add(keys)
+
+    async def might_exist(
+        self, username: str | None = None, email: str | None = None
+    ) -> bool:
+        """False only if neither value can belong to an existing user."""
+        keys = self._keys(username, email)
+        if not keys:
+            return False
+        redis = get_redis()
+        if redis is not None:
+            try:
+                if not self._redis_ready:
+                    self._redis_ready = bool(await redis.exists(self.ready_key))
+                if not self._redis_ready:
+                    return True
+                async with redis.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        for position in self.local.positions(key):
+                            _ = pipe.getbit(self.key, position)
+                    bits = cast(list[int], await pipe.execute())
+                hash_count = self.local.hash_count
+                return any(
+                    all(bits[i : i + hash_count])
+                    for i in range(0, len(bits), hash_count)
+                )
+            except RedisError as e:
+                main_logger.warning(f"User filter falling back to local state: {e}")
+        if not self._local_ready:
+            return True
+        return any(key in self.local for key in keys)
+
+    async def rebuild(self, batch_size: int = 10_000) -> int | None:
+        """Stream every username and email into the filter (API startup).
+
+        With Redis, only the first process to start builds the shared bitmap;
+        bits set by sign-ups are never cleared, so it survives restarts. A
+        bitmap left behind by earlier `user_filter` settings is no longer
+        read and can be deleted once no process uses those settings.
+
+        Returns the number of users streamed, or None when the shared bitmap
+        is already built: the table is then not read at all, and while Redis
+        is unreachable the filter answers "maybe" (falling back to the
+        indexed lookup) instead of using a local copy.
+        """
+        from src.core.db import AsyncSessionLocal
+
+        redis = get_redis()
+        build_shared = False
+        if redis is not None:
+            try:
+                if await redis.exists(self.ready_key):
+                    self._redis_ready = True
+                    return None
+                build_shared = bool(
+                    await redis.set(f"{self.key}:lock", "1", nx=True, ex=600)
+                )
+            except RedisError as e:
+                main_logger.warning(f"User filter falling back to local state: {e}")
+                redis = None
+
+        count = 0
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(
+                select(col(UserModel.username), col(UserModel.email)).execution_options(
+                    yield_per=batch_size
+                )
+            )
+            async for batch in result.partitions(batch_size):
+                keys: list[str] = []
+                for username, email in batch:
+                    keys.extend(self._keys(cast(str, username), cast(str, email)))
+                for key in keys:
+                    self.local.add(key)
+                if build_shared:
+                    _ = await self._redis_add(keys)
+                count += len(batch)
+        self._local_ready = True
+
+        if build_shared and redis is not None:
+            try:
+                _ = await redis.set(self.ready_key, "1")
+                self._redis_ready = True
+            except RedisError as e:
+                main_logger.warning(f"Could not mark user filter ready: {e}")
+        return count
+
+
+user_existence_filter: UserExistenceFilter = UserExistenceFilter(
+    capacity=config.env.user_filter.capacity,
+    error_rate=config.env.user_filter.error_rate,
+)
@@ -0,0 +1,223 @@
+import asyncio
+import math
+import time
+from collections.abc import Coroutine
+from dataclasses import dataclass
+from typing import Any, ClassVar, cast
+
+from redis.exceptions import RedisError
+
+from src.config import config
+from src.core.metrics import LOCKOUT_FAILURES, LOCKOUT_REJECTED
+from src.core.redis import get_redis
+from src.utils.ttl_cache import TTLCache
+from src.utils.logging import main_logger
+
+# Counts one failure and, past the threshold, locks for base * 2^(extra failures).
+#   KEYS[1] = failure counter, KEYS[2] = lock marker
+#   ARGV    = threshold, base_ms, max_ms, window_ms
+#   returns {failures, lock_ms}
+RECORD_FAILURE_LUA = """
+local threshold = tonumber(ARGV[1])
+local base = tonumber(ARGV[2])
+local max = tonumber(ARGV[3])
+local window = tonumber(ARGV[4])
+local failures = redis.call('INCR', KEYS[1])
+local lock = 0
+if failures >= threshold then
+    lock = math.floor(math.min(max, base * 2 ^ (failures - threshold)))
+    redis.call('SET', KEYS[2], '1', 'PX', lock)
+end
+redis.call('PEXPIRE', KEYS[1], math.max(window, lock + window))
+return {failures, lock}
+"""
+
+
+@dataclass
+class _Entry:
+    failures: int = 0
+    locked_until: float = 0.0
+    checked_at: float = 0.0
+    expires_at: float = 0.0
+
+
+class LoginLockout:
+    """Per-account and per-IP failed-login counters with exponential lockout.
+
+    Counters and locks live in Redis and are updated by one atomic script,
+    so every API process sees the same lock. Each process mirrors them
+    locally: a known lock is rejected without any I/O, and a key checked
+    within `local_ttl` seconds is trusted without a Redis round-trip.
+    Failures are applied locally at once and written to Redis in the
+    background (write-behind), so a failed login never waits on Redis.
+    Without Redis the local counters are authoritative. The mirror only
+    holds keys that failed or are locked, at most `max_local_keys` of them,
+    evicting the least recently used.
+    """
+
+    max_local_keys: ClassVar[int] = 100_000
+
+    def __init__(
+        self,
+        threshold: int,
+        ip_threshold: int,
+        base_seconds: int,
+        max_seconds: int,
+        window: int,
+        local_ttl: float = 1.0,
+        prefix: str = "auth_api:lockout",
+    ) -> None:
+        self.thresholds: dict[str, int] = {"user": threshold, "ip": ip_threshold}
+        self.base_ms: int = base_seconds * 1000
+        self.max_ms: int = max_seconds * 1000
+        self.window_ms: int = window * 1000
+        self.local_ttl: float = local_ttl
+        self.prefix: str = prefix
+        # Only keys with failures or a known lock; bounded, LRU-evicted.
+        self._local: TTLCache[str, _Entry] = TTLCache(self.max_local_keys)
+        self._pending: set[asyncio.Task[None]] = set()
+
+    def _keys(self, username: str, ip: str | None) -> list[tuple[str, str]]:
+        keys = [("user", f"{self.prefix}:user:{username.strip().lower()}")]
+        if ip:
+            keys.append(("ip", f"{self.prefix}:ip:{ip}"))
+        return keys
+
+    def _store(self, key: str, entry: _Entry) -> None:
+        self._local.set(key, entry, max(entry.expires_at, entry.locked_until))
+
+    def _lock_ms(self, kind: str, failures: int) -> int:
+        threshold = self.thresholds[kind]
+        if failures < threshold:
+            return 0
+        return int(min(self.max_ms, self.base_ms * 2 ** min(failures - threshold, 32)))
+
+    async def check(self, username: str, ip: str | None = None) -> int:
+        """Seconds until the account/IP may try again, 0 if not locked."""
+        now = time.monotonic()
+        # Read-only: a key never seen failing gets no local entry.
+        keys = [key for _, key in self._keys(username, ip)]
+        entries = [self._local.get(key, now) for key in keys]
+        retry_after = max(
+            (entry.locked_until - now for entry in entries if entry is not None),
+            default=0.0,
+        )
+        if retry_after <= 0:
+            redis = get_redis()
+            stale = [
+                (key, entry)
+                for key, entry in zip(keys, entries)
+                if entry is None or now - entry.checked_at >= self.local_ttl
+            ]
+            if redis is not None and stale:
+                try:
+                    async with redis.pipeline(transaction=False) as pipe:
+                        for key, _ in stale:
+                            _ = pipe.pttl(f"{key}:lock")
+                        ttls = cast(list[int], await pipe.execute())
+                    for (key, entry), ttl in zip(stale, ttls):
+                        if ttl > 0:
+                            entry = entry or _Entry()
+                            entry.locked_until = now + ttl / 1000
+                            retry_after = max(retry_after, ttl / 1000)
+                        elif entry is None:
+                            continue
+                        else:
+                            entry.locked_until = 0.0
+                        entry.checked_at = now
+                        self._store(key, entry)
+                except RedisError as e:
+                    main_logger.warning(f"Login lockout falling back to local state: {e}")
+        if retry_after > 0:
+            LOCKOUT_REJECTED.inc()
+            return math.ceil(retry_after)
+        return 0
+
+    async def _record_remote(self, kind: str, key: str) -> None:
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            failures, lock_ms = cast(
+                list[int],
+                await redis.eval(  # pyright: ignore[reportUnknownMemberType, reportGeneralTypeIssues]
+                    RECORD_FAILURE_LUA,
+                    2,
+                    key,
+                    f"{key}:lock",
+                    self.thresholds[kind],
+                    self.base_ms,
+                    self.max_ms,
+                    self.window_ms,
+                ),
+            )
+        except RedisError as e:
+            main_logger.warning(f"Login lockout falling back to local state: {e}")
+            return
+        now = time.monotonic()
+        entry = self._local.get(key, now) or _Entry()
+        entry.failures = int(failures)
+        entry.checked_at = now
+        if int(lock_ms) > 0:
+            entry.locked_until = max(entry.locked_until, now + int(lock_ms) / 1000)
+        entry.expires_at = max(
+            entry.expires_at, now + (int(lock_ms) + self.window_ms) / 1000
+        )
+        self._store(key, entry)
+
+    async def _reset_remote(self, key: str) -> None:
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            _ = await redis.delete(key, f"{key}:lock")
+        except RedisError as e:
+            main_logger.warning(f"Login lockout could not reset {key}: {e}")
+
+    def _schedule(self, coro: Coroutine[Any, Any, None]) -> None:  # pyright: ignore[reportExplicitAny]
+        task = asyncio.create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def record_failure(self, username: str, ip: str | None = None) -> None:
+        now = time.monotonic()
+        for kind, key in self._keys(username, ip):
+            LOCKOUT_FAILURES.labels(kind).inc()
+            entry = self._local.get(key, now) or _Entry()
+            entry.failures += 1
+            lock_ms = self._lock_ms(kind, entry.failures)
+            entry.expires_at = now + (lock_ms + self.window_ms) / 1000
+            if lock_ms:
+                entry.locked_until = max(entry.locked_until, now + lock_ms / 1000)
+                main_logger.bind(lockout_key=key, failures=entry.failures).warning(
+                    "Login locked after repeated failures"
+                )
+            self._store(key, entry)
+            self._schedule(self._record_remote(kind, key))
+
+    async def reset(self, username: str) -> None:
+        """Clear the account's counter after a successful login (not the IP's)."""
+        key = self._keys(username, None)[0][1]
+        _ = self._local.pop(key)
+        if get_redis() is not None:
+            self._schedule(self._reset_remote(key))
+
+
+login_lockout: LoginLockout = LoginLockout(
+    threshold=config.env.lockout.threshold,
+    ip_threshold=config.env.lockout.ip_threshold,
+    base_seconds=config.env.lockout.base_seconds,
+    max_seconds=config.env.lockout.max_seconds,
+    window=config.env.lockout.window,
+)
+
+# Second factor (TOTP / recovery code) failures, keyed by user id: a 2FA
+# token must not allow unlimited guesses at a 6-digit code.
+mfa_lockout: LoginLockout = LoginLockout(
+    threshold=config.env.lockout.threshold,
+    ip_threshold=config.env.lockout.ip_threshold,
+    base_seconds=config.env.lockout.base_seconds,
+    max_seconds=config.env.lockout.max_seconds,
+    window=config.env.lockout.window,
+    prefix="auth_api:lockout:mfa",
+)
@@ -1,6 +1,16 @@
+import base64
+import functools
+import hashlib
+import hmac
+import time
+
 import pyotp
+from redis.exceptions import RedisError
 
 from src.config import config
+from src.core.redis import get_redis
+from src.utils.logging import main_logger
+from src.utils.ttl_cache import TTLCache
 
 
 def generate_totp_secret() -> str:
@@ -15,6 +25,82 @@ def get_totp_uri(
     )
 
 
-def verify_totp(token: str, totp_secret: str) -> bool:
-    totp = pyotp.TOTP(totp_secret)
-    return totp.verify(token, valid_window=1)  # 30s tolerance
+@functools.lru_cache(maxsize=10_000)
+def _decode_secret(totp_secret: str) -> bytes:
+    """Base32-decode a TOTP secret once; repeat sign-ins reuse the key bytes."""
+    padding = "=" * (-len(totp_secret) % 8)
+    return base64.b32decode(totp_secret + padding, casefold=True)
+
+
+class TOTPVerifier:
+    """RFC 6238 verifier with replay protection.
+
+    The codes for every counter in the accepted window are derived in one
+    pass from the cached key, and all of them are compared in constant
+    time. An accepted (user, counter) pair is claimed in Redis with SET NX
+    (falling back to process memory) until it has left the window, so the
+    same code cannot be used twice.
+    """
+
+    def __init__(
+        self,
+        interval: int = 30,
+        digits: int = 6,
+        valid_window: int = 1,  # 30s tolerance
+        prefix: str = "auth_api:totp_used",
+        max_local_keys: int = 10_000,
+    ) -> None:
+        self.interval: int = interval
+        self.digits: int = digits
+        self.valid_window: int = valid_window
+        self.prefix: str = prefix
+        self.used_ttl: int = (2 * valid_window + 1) * interval
+        self._used: TTLCache[str, bool] = TTLCache(max_local_keys)
+
+    def _code(self, key: bytes, counter: int) -> str:
+        digest = hmac.new(key, counter.to_bytes(8, "big"), hashlib.sha1).digest()
+        offset = digest[-1] & 0x0F
+        binary = int.from_bytes(digest[offset : offset + 4], "big") & 0x7FFFFFFF
+        return str(binary % 10**self.digits).zfill(self.digits)
+
+    def match_counter(
+        self, token: str, totp_secret: str, now: float | None = None
+    ) -> int | None:
+        """Return the time-step counter `token` is valid for, if any."""
+        token = token.replace(" ", "")
+        if len(token) != self.digits or not token.isdigit():
+            return None
+        key = _decode_secret(totp_secret)
+        current = int((time.time() if now is None else now) // self.interval)
+
+        matched: int | None = None
+        for counter in range(current - self.valid_window, current + self.valid_window + 1):
+            if hmac.compare_digest(self._code(key, counter), token):
+                matched = counter
+        return matched
+
+    async def _claim(self, user_id: int, counter: int) -> bool:
+        key = f"{self.prefix}:{user_id}:{counter}"
+        redis = get_redis()
+        if redis is not None:
+            try:
+                return bool(
+                    await redis.set(key, 1, ex=self.used_ttl, nx=True)  # pyright: ignore[reportUnknownMemberType]
+                )
+            except RedisError as e:
+                main_logger.warning(f"Used TOTP store falling back to local state: {e}")
+
+        now = time.monotonic()
+        if self._used.get(key, now):
+            return False
+        self._used.set(key, True, now + self.used_ttl)
+        return True
+
+    async def verify(self, token: str, totp_secret: str, user_id: int) -> bool:
+        counter = self.match_counter(token=token, totp_secret=totp_secret)
+        if counter is None:
+            return False
+        return await self._claim(user_id=user_id, counter=counter)
+
+
+totp_verifier: TOTPVerifier = TOTPVerifier()
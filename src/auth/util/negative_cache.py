@@ -0,0 +1,97 @@
+import time
+from typing import ClassVar
+
+from redis.exceptions import RedisError
+
+from src.config import config
+from src.core.metrics import NEGATIVE_CACHE_HITS, NEGATIVE_CACHE_RECORDED
+from src.core.redis import get_redis
+from src.utils.logging import main_logger
+
+
+class NegativeLookupCache:
+    """Remembers usernames and emails that recently matched no user.
+
+    Credential stuffing is mostly unknown usernames; a cached miss answers
+    "no such user" without touching PostgreSQL. Misses are shared through
+    Redis for `ttl` seconds and mirrored in process for `local_ttl` seconds,
+    so a hot unknown name costs neither a query nor a Redis round-trip.
+    `create_user` invalidates both; the local mirror is kept short because
+    other processes only clear their own copy when it expires.
+    """
+
+    max_local_keys: ClassVar[int] = 100_000
+
+    def __init__(
+        self, ttl: int, local_ttl: float, prefix: str = "auth_api:missing_user"
+    ) -> None:
+        self.ttl: int = ttl
+        self.local_ttl: float = local_ttl
+        self.prefix: str = prefix
+        self._local: dict[str, float] = {}
+
+    def _key(self, kind: str, value: str) -> str:
+        # The exact value the lookup queried: usernames and emails are matched
+        # case-sensitively, so a miss for "alice" says nothing about "Alice".
+        return f"{self.prefix}:{kind}:{value}"
+
+    def _prune(self, now: float) -> None:
+        if len(self._local) < self.max_local_keys:
+            return
+        self._local = {key: exp for key, exp in self._local.items() if exp > now}
+
+    async def is_missing(self, kind: str, value: str) -> bool:
+        """True if `value` (a username or email) is known not to exist."""
+        if self.ttl <= 0:
+            return False
+        key = self._key(kind, value)
+        now = time.monotonic()
+        if self._local.get(key, 0.0) > now:
+            NEGATIVE_CACHE_HITS.labels(kind).inc()
+            return True
+        redis = get_redis()
+        if redis is not None:
+            try:
+                if await redis.exists(key):
+                    self._prune(now)
+                    self._local[key] = now + self.local_ttl
+                    NEGATIVE_CACHE_HITS.labels(kind).inc()
+                    return True
+            except RedisError as e:
+                main_logger.warning(f"Negative lookup cache unavailable: {e}")
+        return False
+
+    async def record_missing(self, kind: str, value: str) -> None:
+        if self.ttl <= 0:
+            return
+        NEGATIVE_CACHE_RECORDED.labels(kind).inc()
+        key = self._key(kind, value)
+        now = time.monotonic()
+        self._prune(now)
+        redis = get_redis()
+        if redis is None:
+            # Single process: the local copy is the only one, keep it for `ttl`.
+            self._local[key] = now + self.ttl
+            return
+        self._local[key] = now + self.local_ttl
+        try:
+            _ = await redis.set(key, "1", ex=self.ttl)
+        except RedisError as e:
+            main_logger.warning(f"Negative lookup cache unavailable: {e}")
+
+    async def invalidate(self, username: str, email: str) -> None:
+        keys = [self._key("username", username), self._key("email", email)]
+        for key in keys:
+            _ = self._local.pop(key, None)
+        redis = get_redis()
+        if redis is not None:
+            try:
+                _ = await redis.delete(*keys)
+            except RedisError as e:
+                main_logger.warning(f"Negative lookup cache unavailable: {e}")
+
+
+negative_lookup_cache: NegativeLookupCache = NegativeLookupCache(
+    ttl=config.env.negative_cache.ttl,
+    local_ttl=config.env.negative_cache.local_ttl,
+)
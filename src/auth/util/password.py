@@ -2,7 +2,6 @@ import re
 from typing import Any
 
 from pwdlib import PasswordHash
-from zxcvbn import zxcvbn
 
 
 class PasswordValidator:
@@ -70,7 +69,9 @@ class PasswordValidator:
         """Complete Django-like password validation"""
         errors: list[str] = []
 
-        # 1. Strength validation (zxcvbn)
+        # 1. Strength validation (zxcvbn, imported lazily: its dictionaries are large)
+        from zxcvbn import zxcvbn
+
         strength_result = zxcvbn(password)
         if strength_result["score"] < self.min_score:
             score_map: dict[int, str] = {
@@ -109,6 +110,12 @@ class PasswordValidator:
             ),
         }
 
+    def preload(self) -> None:
+        """Load the zxcvbn frequency lists up front, e.g. in a pre-fork parent."""
+        from zxcvbn import zxcvbn
+
+        _ = zxcvbn("preload")
+
     def verify_password(
         self, plain_password: str | bytes, hashed_password: str | bytes
     ) -> bool:
@@ -0,0 +1,54 @@
+import hashlib
+import hmac
+import secrets
+
+from src.auth.util.password import password_validator
+from src.config import config
+
+# Unambiguous lowercase alphabet (no 0/o, 1/l/i)
+RECOVERY_CODE_ALPHABET = "abcdefghjkmnpqrstuvwxyz23456789"
+
+
+class RecoveryCodeManager:
+    """Generates and checks 2FA recovery codes.
+
+    Each code is stored twice: under a keyed HMAC of (user id, code), which
+    is unique and indexed so an attempt is a single lookup, and as an Argon2
+    hash that is verified for the one matching row.
+    """
+
+    def __init__(self, count: int = 10, length: int = 10) -> None:
+        self.count: int = count
+        self.length: int = length
+        self.index_key: bytes = hashlib.sha256(
+            b"recovery-code-index:" + config.env.token.secret_key.encode()
+        ).digest()
+
+    def normalize(self, code: str) -> str:
+        return code.replace("-", "").replace(" ", "").lower()
+
+    def generate(self) -> list[str]:
+        """Return `count` fresh codes formatted as `xxxxx-xxxxx`."""
+        half = self.length // 2
+        codes: list[str] = []
+        for _ in range(self.count):
+            raw = "".join(
+                secrets.choice(RECOVERY_CODE_ALPHABET) for _ in range(self.length)
+            )
+            codes.append(f"{raw[:half]}-{raw[half:]}")
+        return codes
+
+    def index(self, user_id: int, code: str) -> str:
+        message = f"{user_id}:{self.normalize(code)}".encode()
+        return hmac.new(self.index_key, message, hashlib.sha256).hexdigest()
+
+    def hash(self, code: str) -> str:
+        return password_validator.get_password_hash(self.normalize(code))
+
+    def verify(self, code: str, hashed_code: str) -> bool:
+        return password_validator.verify_password(
+            plain_password=self.normalize(code), hashed_password=hashed_code
+        )
+
+
+recovery_code_manager: RecoveryCodeManager = RecoveryCodeManager()
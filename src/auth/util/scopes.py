@@ -0,0 +1,86 @@
+from fastapi import Request
+
+from src.core.exception import ForbiddenException, UnauthorizedException
+
+# Bit i of a scope mask grants SCOPES[i]. Tokens already issued carry these
+# positions, so only ever append; never reorder or remove an entry.
+SCOPES: tuple[str, ...] = (
+    "profile:read",
+    "profile:write",
+    "mfa:manage",
+    "login_events:read",
+    "users:read",
+    "users:write",
+    "users:admin",
+)
+
+SCOPE_BITS: dict[str, int] = {scope: 1 << index for index, scope in enumerate(SCOPES)}
+
+# Access token claim holding the caller's scope mask.
+SCOPE_CLAIM = "scp"
+
+
+def scope_mask(*scopes: str) -> int:
+    """Compile scope names into a bitmask; unknown names fail at import time."""
+    mask = 0
+    for scope in scopes:
+        if scope not in SCOPE_BITS:
+            raise ValueError(f"Unknown scope: {scope!r}")
+        mask |= SCOPE_BITS[scope]
+    return mask
+
+
+def scope_names(mask: int) -> list[str]:
+    return [scope for scope, bit in SCOPE_BITS.items() if mask & bit]
+
+
+ROLES: dict[str, int] = {
+    "user": scope_mask(
+        "profile:read", "profile:write", "mfa:manage", "login_events:read"
+    ),
+    "staff": scope_mask(
+        "profile:read", "profile:write", "mfa:manage", "login_events:read", "users:read"
+    ),
+    "admin": scope_mask(*SCOPES),
+}
+
+DEFAULT_ROLE = "user"
+
+
+def effective_scopes(role: str, scopes: int = 0) -> int:
+    """The user's role grants plus any per-user extra grants."""
+    return ROLES.get(role, 0) | scopes
+
+
+class RequireScopes:
+    """Route dependency granting access only if the access token carries
+    every required scope.
+
+    The required scopes are compiled to one bitmask when the route is
+    declared, and the caller's mask is the `scp` claim the access token was
+    issued with, so the check is a single AND: no database or Redis lookup.
+    Only access tokens (`typ == "access"`) are accepted.
+    Grants changed since the token was issued apply from the next refresh.
+    """
+
+    def __init__(self, *scopes: str) -> None:
+        self.scopes: tuple[str, ...] = scopes
+        self.mask: int = scope_mask(*scopes)
+
+    async def __call__(self, request: Request) -> int:
+        payload = getattr(request.state, "user", None)
+        if payload is None:
+            raise UnauthorizedException(message="Unauthorized")
+        # Refresh, 2FA and activation tokens never grant scopes.
+        if payload.get("typ") != "access":  # pyright: ignore[reportAny]
+            raise UnauthorizedException(message="An access token is required")
+        granted = payload.get(SCOPE_CLAIM, 0)  # pyright: ignore[reportAny]
+        if not isinstance(granted, int) or granted & self.mask != self.mask:
+            raise ForbiddenException(
+                message=f"Missing required scope: {', '.join(self.scopes)}"
+            )
+        return granted
+
+
+def require_scopes(*scopes: str) -> RequireScopes:
+    return RequireScopes(*scopes)
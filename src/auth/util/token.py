@@ -3,7 +3,7 @@ from typing import Any, cast
 
 from jose import jwt
 
-from src.auth.schemas.token import JWTPayload, JWTPayloadWithExp
+from src.auth.schemas.token import TOKEN_TYPE, JWTPayload, JWTPayloadWithExp
 from src.config import config
 
 SECRET_KEY: str = config.env.token.secret_key
@@ -17,18 +17,25 @@ class JWTAuthToken:
     """Creates refresh and access tokens"""
 
     def __create_token(
-        self, data: JWTPayload, expires_delta: timedelta | None = None
+        self,
+        data: JWTPayload,
+        token_type: TOKEN_TYPE,
+        expires_delta: timedelta | None = None,
     ) -> tuple[str, datetime]:
         """Create JWT token string
 
         Args:
             data (JWTPayload): payload
+            token_type (TOKEN_TYPE): value of the `typ` claim
             expires_delta (timedelta | None, optional): Token duration of existing. Defaults to None.
 
         Returns:
            tuple[str, datetime]: token string and expiration datetime
         """
         to_encode: JWTPayload = data.copy()
+        if token_type != "access":
+            # Scopes are only ever honoured from access tokens.
+            _ = to_encode.pop("scp", None)
         if expires_delta:
             expire: datetime = (  # pyright: ignore[reportRedeclaration]
                 datetime.now(timezone.utc) + expires_delta
@@ -36,7 +43,7 @@ class JWTAuthToken:
         else:
             expire: datetime = datetime.now(timezone.utc) + timedelta(minutes=15)
         claims: JWTPayloadWithExp = cast(JWTPayloadWithExp, to_encode)
-        claims.update({"exp": expire})
+        claims.update({"exp": expire, "typ": token_type})
         encoded_jwt = jwt.encode(
             claims=dict(claims),
             key=SECRET_KEY,
@@ -54,7 +61,7 @@ class JWTAuthToken:
         Returns:
             tuple[str, datetime]: token string and expiration datetime
         """
-        return self.__create_token(data)
+        return self.__create_token(data, token_type="activate")
 
     def access_token(self, data: JWTPayload) -> tuple[str, datetime]:
         """Create access JWT access token that should last for about a 30 minutes
@@ -68,6 +75,7 @@ class JWTAuthToken:
         """
         return self.__create_token(
             data,
+            token_type="access",
             expires_delta=timedelta(minutes=float(ACCESS_TOKEN_EXPIRE_MINUTES)),
         )
 
@@ -83,6 +91,7 @@ class JWTAuthToken:
         """
         return self.__create_token(
             data,
+            token_type="refresh",
             expires_delta=timedelta(weeks=float(REFRESH_TOKEN_EXPIRE_WEEKS)),
         )
 
@@ -116,6 +125,7 @@ class JWTAuthToken:
         """
         return self.__create_token(
             data,
+            token_type="2fa",
             expires_delta=timedelta(
                 minutes=float(config.env.token.temp_2fa_token_expire_minutes)
             ),
@@ -24,16 +24,16 @@ class Config(BaseModel):
     env: EnvConfig
 
 
-# Environment-specific configurations
-env_configs: dict[str, CONFIG_TYPE] = {
-    "development": DevConfig(),
-    "production": ProdConfig(),
-    "test": TestConfig(),
+# Environment-specific configurations (only the active one is instantiated)
+env_configs: dict[str, type[CONFIG_TYPE]] = {
+    "development": DevConfig,
+    "production": ProdConfig,
+    "test": TestConfig,
 }
 
 # Merge base config with environment-specific config
 base_config: BaseConfig = BaseConfig()
-env_config: CONFIG_TYPE = env_configs[env.env_mode]
+env_config: CONFIG_TYPE = env_configs[env.env_mode]()
 
 config: Config = Config(
     app_name=base_config.app_name,
@@ -7,7 +7,7 @@ from sqlalchemy.orm import DeclarativeBase
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config import config
-from src.utils.alembic_utils import upgrade_database
+from src.utils.alembic_utils import upgrade_database_if_needed
 
 # Create async engine
 engine: AsyncEngine = create_async_engine(url=config.database.session_url(), echo=False)
@@ -41,5 +41,11 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
 
 # Optional: Create tables (run once during app startup)
 async def init_db() -> None:
+    """
+    Bring the schema to head unless startup migrations are disabled, in which
+    case `make migrate` is expected to run before the workers start.
+    """
+    if not config.env.startup_migrations:
+        return
     loop = asyncio.get_running_loop()
-    await loop.run_in_executor(None, upgrade_database)
+    _ = await loop.run_in_executor(None, upgrade_database_if_needed)
@@ -31,6 +31,10 @@ class RedisConfig(BaseModel):
 
 
 class SmtpServerConfig(BaseModel):
+    # "memory" and "file" deliver nowhere: for load tests and offline runs
+    transport: Literal["smtp", "memory", "file"] = "smtp"
+    file_path: str = "var/emails.ndjson"
+    file_format: Literal["ndjson", "mbox"] = "ndjson"
     username: str = ""
     password: str = ""
     from_email: EmailStr = Field(default="no-reply@example.com", min_length=5)
@@ -41,6 +45,67 @@ class SmtpServerConfig(BaseModel):
     credentials: bool = Field(default=False)
     validate_certs: bool = Field(default=True)
     server: str = Field(default="127.0.0.1", min_length=1)
+    timeout: int = Field(default=30, gt=0)
+    pool_size: int = Field(default=4, gt=0)
+    idle_timeout: int = Field(default=60, gt=0)
+    health_check_interval: int = Field(default=15, gt=0)
+    batch_size: int = Field(default=50, gt=0)
+    # Only applies while all `pool_size` sessions are busy; otherwise
+    # messages (e.g. from a solo worker) are sent without waiting.
+    batch_wait_ms: int = Field(default=20, ge=0)
+    # Seconds during which a newer activation/reset email supersedes a queued one (0 disables)
+    coalesce_window: int = Field(default=300, ge=0)
+    # Messages per second across all workers (0 disables throttling)
+    rate_limit_per_second: float = Field(default=0, ge=0)
+    rate_limit_burst: int = Field(default=10, gt=0)
+
+
+class CeleryWorkerConfig(BaseModel):
+    # "threads" runs `concurrency` tasks at once per process; their coroutines
+    # share the worker event loop, SMTP pool and batch sender.
+    pool: Literal["solo", "threads", "prefork"] = "solo"
+    concurrency: int = Field(default=1, gt=0)
+    prefetch_multiplier: int = Field(default=1, gt=0)
+    # Serve worker metrics (queue latency, throttling, ...) on this port
+    metrics_port: int | None = Field(default=None, gt=0)
+
+
+class OutboxConfig(BaseModel):
+    maxsize: int = Field(default=10_000, gt=0)
+    batch_size: int = Field(default=100, gt=0)
+    # "publish_inline" never loses a task; the drop policies trade
+    # transactional email for latency when the broker falls behind.
+    overflow: Literal["drop_new", "drop_oldest", "publish_inline"] = "publish_inline"
+
+
+class UserFilterConfig(BaseModel):
+    # Expected number of users; past it the false-positive rate climbs
+    capacity: int = Field(default=1_000_000, gt=0)
+    error_rate: float = Field(default=0.01, gt=0, lt=1)
+
+
+class NegativeCacheConfig(BaseModel):
+    # Seconds an unknown username/email is remembered in Redis (0 disables)
+    ttl: int = Field(default=60, ge=0)
+    # Seconds each process trusts its own copy of a miss
+    local_ttl: float = Field(default=2.0, ge=0)
+
+
+class LockoutConfig(BaseModel):
+    # Failures within `window` seconds before an account / IP is locked
+    threshold: int = Field(default=5, gt=0)
+    ip_threshold: int = Field(default=50, gt=0)
+    # First lock lasts base_seconds, doubling per further failure up to max_seconds
+    base_seconds: int = Field(default=30, gt=0)
+    max_seconds: int = Field(default=3600, gt=0)
+    window: int = Field(default=900, gt=0)
+
+
+class LoginEventsConfig(BaseModel):
+    maxsize: int = Field(default=10_000, gt=0)
+    batch_size: int = Field(default=500, gt=0)
+    flush_interval: float = Field(default=1.0, gt=0)
+
 
 class EnvConfig(BaseSettings):
     app: str = "src:app"
@@ -49,12 +114,27 @@ class EnvConfig(BaseSettings):
     log_level: str = "info"
     env_mode: Literal["development", "production", "test"] = "development"
     port: int = Field(default=3000, gt=0)
+    workers: int = Field(default=1, gt=0)
+    graceful_timeout: int = Field(default=30, gt=0)
+    # Peers whose X-Forwarded-For/-Proto headers are trusted (comma-separated
+    # IPs or networks, "*" for any): set it to your load balancer's address,
+    # or per-IP rate limits and lockouts see only the proxy.
+    forwarded_allow_ips: str = "127.0.0.1,::1"
     api_key: str = Field(default="", min_length=1)
     version: str = "1.0.0"
+    startup_migrations: bool = True
     redis: RedisConfig = RedisConfig()
     token: TokenConfig = TokenConfig()
     database: DatabaseConfig = DatabaseConfig()
     smtp_server: SmtpServerConfig = SmtpServerConfig()
+    celery_worker: CeleryWorkerConfig = CeleryWorkerConfig()
+    outbox: OutboxConfig = OutboxConfig()
+    user_filter: UserFilterConfig = UserFilterConfig()
+    negative_cache: NegativeCacheConfig = NegativeCacheConfig()
+    lockout: LockoutConfig = LockoutConfig()
+    login_events: LoginEventsConfig = LoginEventsConfig()
+    # "auto": Celery when celery_broker_url is set, otherwise run tasks in process
+    task_executor: Literal["auto", "celery", "inprocess"] = "auto"
     celery_broker_url: HttpUrl | str | None = None
     frontend_url: HttpUrl | str | None = None
 
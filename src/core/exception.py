@@ -1,7 +1,14 @@
 class AppException(Exception):
-    def __init__(self, message: str, status_code: int = 400, *args: object) -> None:
+    def __init__(
+        self,
+        message: str,
+        status_code: int = 400,
+        *args: object,
+        headers: dict[str, str] | None = None,
+    ) -> None:
         self.message: str = message
         self.status_code: int = status_code
+        self.headers: dict[str, str] | None = headers
         super().__init__(*args)
 
 
@@ -19,8 +26,34 @@ class NotFoundException(AppException):
         super().__init__(message, status_code=404)
 
 
+class InvalidCredentialsException(AppException):
+    """For a wrong username/password pair (counted towards lockout)."""
+
+    def __init__(self, message: str = "Incorrect username or password") -> None:
+        super().__init__(message, status_code=400)
+
+
 class UnauthorizedException(AppException):
     """For authentication errors."""
 
     def __init__(self, message: str = "Unauthorized access") -> None:
         super().__init__(message, status_code=401)
+
+
+class ForbiddenException(AppException):
+    """For authenticated callers lacking a required scope."""
+
+    def __init__(self, message: str = "Forbidden") -> None:
+        super().__init__(message, status_code=403)
+
+
+class TooManyRequestsException(AppException):
+    """For rate-limited requests."""
+
+    def __init__(
+        self, retry_after: int, message: str = "Too many requests. Try again later."
+    ) -> None:
+        self.retry_after: int = retry_after
+        super().__init__(
+            message, status_code=429, headers={"Retry-After": str(retry_after)}
+        )
@@ -0,0 +1,198 @@
+import asyncio
+import functools
+import hashlib
+import json
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, cast
+
+from fastapi import Request, status
+from fastapi.encoders import jsonable_encoder
+from redis.exceptions import RedisError
+
+from src.core.exception import AppException, ConflictException
+from src.core.redis import get_redis
+from src.utils.logging import main_logger
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+type Endpoint = Callable[..., Awaitable[Any]]  # pyright: ignore[reportExplicitAny]
+
+
+class IdempotencyStore:
+    """First-response store for `Idempotency-Key` requests.
+
+    A key moves from `pending` (claimed with SET NX by the request that
+    runs the handler) to `done` (holding the response body). Duplicates
+    arriving meanwhile wait: in the same process on the in-flight future,
+    across processes by polling Redis. If the first request fails the claim
+    is released so a retry executes normally. Without Redis the store is
+    kept in process.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "auth_api:idempotency",
+        ttl: int = 24 * 3600,
+        pending_ttl: int = 30,
+        wait_timeout: float = 10.0,
+        poll_interval: float = 0.05,
+    ) -> None:
+        self.prefix: str = prefix
+        self.ttl: int = ttl
+        self.pending_ttl: int = pending_ttl
+        self.wait_timeout: float = wait_timeout
+        self.poll_interval: float = poll_interval
+        self._inflight: dict[str, asyncio.Future[Any]] = {}  # pyright: ignore[reportExplicitAny]
+        self._local: dict[str, tuple[float, str]] = {}
+
+    async def _get(self, key: str) -> dict[str, Any] | None:  # pyright: ignore[reportExplicitAny]
+        redis = get_redis()
+        raw: str | None = None
+        if redis is not None:
+            try:
+                raw = cast(str | None, await redis.get(key))  # pyright: ignore[reportUnknownMemberType]
+            except RedisError as e:
+                main_logger.warning(f"Idempotency store falling back to local state: {e}")
+                redis = None
+        if redis is None:
+            expires_at, raw = self._local.get(key, (0.0, None))
+            if expires_at <= time.monotonic():
+                _ = self._local.pop(key, None)
+                raw = None
+        return json.loads(raw) if raw else None  # pyright: ignore[reportAny]
+
+    async def _set(
+        self, key: str, record: dict[str, Any], ttl: int, only_new: bool = False  # pyright: ignore[reportExplicitAny]
+    ) -> bool:
+        value = json.dumps(record)
+        redis = get_redis()
+        if redis is not None:
+            try:
+                return bool(
+                    await redis.set(key, value, ex=ttl, nx=only_new)  # pyright: ignore[reportUnknownMemberType]
+                )
+            except RedisError as e:
+                main_logger.warning(f"Idempotency store falling back to local state: {e}")
+        if only_new and await self._get(key) is not None:
+            return False
+        self._local[key] = (time.monotonic() + ttl, value)
+        return True
+
+    async def _delete(self, key: str) -> None:
+        _ = self._local.pop(key, None)
+        redis = get_redis()
+        if redis is not None:
+            try:
+                _ = await redis.delete(key)  # pyright: ignore[reportUnknownMemberType]
+            except RedisError as e:
+                main_logger.warning(f"Failed to release idempotency key {key}: {e}")
+
+    async def _wait_for(self, key: str, fingerprint: str) -> Any:  # pyright: ignore[reportExplicitAny]
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                return await asyncio.shield(inflight)
+            record = await self._get(key)
+            if record is None:
+                return None
+            self._check_fingerprint(record, fingerprint)
+            if record["state"] == "done":
+                return record["body"]
+            await asyncio.sleep(self.poll_interval)
+        raise ConflictException(
+            message="A request with this Idempotency-Key is still being processed"
+        )
+
+    @staticmethod
+    def _check_fingerprint(record: dict[str, Any], fingerprint: str) -> None:  # pyright: ignore[reportExplicitAny]
+        if record["fingerprint"] != fingerprint:
+            raise AppException(
+                message="Idempotency-Key was already used with a different request",
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+
+    async def has_record(self, key: str) -> bool:
+        """True if a request with this key has run or is running."""
+        return await self._get(f"{self.prefix}:{key}") is not None
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        call: Callable[[], Awaitable[Any]],  # pyright: ignore[reportExplicitAny]
+    ) -> Any:  # pyright: ignore[reportExplicitAny]
+        key = f"{self.prefix}:{key}"
+        while True:
+            pending = {"state": "pending", "fingerprint": fingerprint}
+            if await self._set(key, pending, ttl=self.pending_ttl, only_new=True):
+                break
+            result = await self._wait_for(key, fingerprint)
+            if result is not None:
+                return result  # pyright: ignore[reportAny]
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()  # pyright: ignore[reportExplicitAny]
+        self._inflight[key] = future
+        try:
+            body = jsonable_encoder(await call())  # pyright: ignore[reportAny]
+        except BaseException as e:
+            await self._delete(key)
+            future.set_exception(e)
+            _ = future.exception()  # mark retrieved when nobody is waiting
+            raise
+        finally:
+            _ = self._inflight.pop(key, None)
+
+        done = {"state": "done", "fingerprint": fingerprint, "body": body}
+        _ = await self._set(key, done, ttl=self.ttl)
+        future.set_result(body)
+        return body  # pyright: ignore[reportAny]
+
+
+idempotency_store: IdempotencyStore = IdempotencyStore()
+
+
+def caller_identity(request: Request) -> str:
+    """The authenticated user if there is one, else the client address."""
+    payload = cast(dict[str, Any] | None, getattr(request.state, "user", None))  # pyright: ignore[reportExplicitAny]
+    if payload and payload.get("user_id") is not None:
+        return f"user:{payload['user_id']}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def request_key(request: Request) -> str | None:
+    """The store key for this request's `Idempotency-Key`, None without one.
+
+    Keys are scoped to the route and the caller, so a client reusing (or
+    guessing) another caller's key gets its own request run, never a replay
+    of someone else's response.
+    """
+    header = request.headers.get(IDEMPOTENCY_HEADER)
+    if not header:
+        return None
+    return f"{request.url.path}:{caller_identity(request)}:{header}"
+
+
+def idempotent(endpoint: Endpoint) -> Endpoint:
+    """Replay the first response for requests repeating an `Idempotency-Key`.
+
+    The endpoint must take a `request: Request` parameter. Requests without
+    the header run as usual.
+    """
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:  # pyright: ignore[reportExplicitAny, reportAny]
+        request = cast(Request, kwargs["request"])
+        key = request_key(request)
+        if key is None:
+            return await endpoint(*args, **kwargs)  # pyright: ignore[reportAny]
+
+        fingerprint = hashlib.sha256(await request.body()).hexdigest()
+        return await idempotency_store.run(  # pyright: ignore[reportAny]
+            key=key,
+            fingerprint=fingerprint,
+            call=lambda: endpoint(*args, **kwargs),
+        )
+
+    return wrapper
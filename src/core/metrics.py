@@ -0,0 +1,101 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# --- Task outbox (src.tasks.outbox) ---
+OUTBOX_ENQUEUED = Counter(
+    "auth_api_outbox_enqueued_total", "Task workflows accepted by the outbox"
+)
+OUTBOX_PUBLISHED = Counter(
+    "auth_api_outbox_published_total", "Task workflows published to the broker"
+)
+OUTBOX_DROPPED = Counter(
+    "auth_api_outbox_dropped_total",
+    "Task workflows dropped because the outbox was full",
+)
+OUTBOX_FAILED = Counter(
+    "auth_api_outbox_failed_total", "Task workflows that failed to publish"
+)
+OUTBOX_DEPTH = Gauge("auth_api_outbox_depth", "Task workflows waiting in the outbox")
+INPROCESS_TASKS_DROPPED = Counter(
+    "auth_api_inprocess_tasks_dropped_total",
+    "Task chains dropped because the in-process executor was full",
+)
+
+# --- Email coalescing (src.tasks.coalesce) ---
+EMAIL_COALESCE_CLAIMED = Counter(
+    "auth_api_email_coalesce_claimed_total",
+    "Coalesced email requests queued",
+    ["email_type"],
+)
+EMAIL_COALESCE_SUPPRESSED = Counter(
+    "auth_api_email_coalesce_suppressed_total",
+    "Queued emails skipped because a newer request superseded them",
+    ["email_type"],
+)
+
+# --- Email lanes (src.tasks.email_task, src.services.smtp_throttle) ---
+EMAIL_QUEUE_LATENCY = Histogram(
+    "auth_api_email_queue_latency_seconds",
+    "Time from publishing an email task until a worker starts it",
+    ["queue"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+SMTP_THROTTLE_WAIT = Counter(
+    "auth_api_smtp_throttle_wait_seconds_total",
+    "Seconds spent waiting for SMTP rate-limit tokens",
+)
+
+# --- Email task tracing (src.core.tracing) ---
+EMAIL_TASK_STAGE_SECONDS = Histogram(
+    "auth_api_email_task_stage_seconds",
+    "Email task latency by stage: queue_wait, render, smtp_send, run, end_to_end",
+    ["task", "stage"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+EMAIL_TASK_RETRIES = Counter(
+    "auth_api_email_task_retries_total", "Email task runs that ended in a retry", ["task"]
+)
+
+# --- Dead letters (src.tasks.dead_letter) ---
+DEAD_LETTER_RECORDED = Counter(
+    "auth_api_dead_letter_recorded_total",
+    "Email tasks that failed permanently and were dead-lettered",
+    ["task"],
+)
+DEAD_LETTER_REPLAYED = Counter(
+    "auth_api_dead_letter_replayed_total", "Dead-lettered tasks re-published", ["task"]
+)
+
+# --- User lookups (src.auth.util.negative_cache) ---
+NEGATIVE_CACHE_HITS = Counter(
+    "auth_api_negative_cache_hits_total",
+    "Lookups of unknown users answered without the database",
+    ["kind"],
+)
+NEGATIVE_CACHE_RECORDED = Counter(
+    "auth_api_negative_cache_recorded_total",
+    "Unknown users looked up in the database and cached as missing",
+    ["kind"],
+)
+
+# --- Login lockout (src.auth.util.lockout) ---
+LOCKOUT_FAILURES = Counter(
+    "auth_api_login_failures_total", "Failed logins counted towards lockout", ["kind"]
+)
+LOCKOUT_REJECTED = Counter(
+    "auth_api_login_locked_total", "Logins rejected because the account or IP is locked"
+)
+
+# --- Login events (src.services.login_events) ---
+LOGIN_EVENTS_RECORDED = Counter(
+    "auth_api_login_events_recorded_total", "Successful logins buffered for writing"
+)
+LOGIN_EVENTS_FLUSHED = Counter(
+    "auth_api_login_events_flushed_total", "Login events written to the database"
+)
+LOGIN_EVENTS_DROPPED = Counter(
+    "auth_api_login_events_dropped_total",
+    "Login events lost to a full buffer or a failed flush",
+)
+LOGIN_EVENTS_BUFFERED = Gauge(
+    "auth_api_login_events_buffered", "Login events waiting to be written"
+)
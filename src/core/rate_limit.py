@@ -0,0 +1,189 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import ClassVar, cast
+
+from fastapi import Request
+from redis.exceptions import RedisError
+
+from src.core.exception import TooManyRequestsException
+from src.core.redis import get_redis
+from src.utils.ttl_cache import TTLCache
+from src.utils.logging import main_logger
+
+# Sliding-window counter: the previous fixed window is weighted by how much
+# of it still overlaps the sliding window. Grants up to ARGV[4] units at once
+# so the caller can serve several requests from a local lease.
+#   KEYS[1] = current window key, KEYS[2] = previous window key
+#   ARGV    = now_ms, window_ms, limit, wanted
+#   returns {granted, retry_after_ms}
+SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local wanted = tonumber(ARGV[4])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local elapsed = (now % window) / window
+local available = math.floor(limit - (previous * (1 - elapsed) + current))
+if available <= 0 then
+    return {0, window - (now % window)}
+end
+local granted = math.min(wanted, available)
+redis.call('INCRBY', KEYS[1], granted)
+redis.call('PEXPIRE', KEYS[1], window * 2)
+return {granted, 0}
+"""
+
+
+@dataclass
+class _LocalBucket:
+    """Tokens leased from the shared window, or a cached rejection."""
+
+    tokens: int = 0
+    expires_at: float = 0.0
+    blocked_until: float = 0.0
+
+
+class SlidingWindowLimiter:
+    """Sliding-window limiter shared through Redis, fronted by local leases.
+
+    For limits of at least `min_lease_limit`, each process leases a slice
+    of a key's budget (`lease_fraction` of the limit) from Redis and spends
+    it locally, so only one request per lease pays a Redis round-trip.
+    Smaller limits (the per-route auth limits of 5-30) are counted one
+    request at a time: a lease would be a single token anyway, and a larger
+    one parked on one process would reject clients whose next request lands
+    on another. Rejections are cached until the window frees up, so a flood
+    of blocked requests never reaches Redis at all. Without Redis the same
+    window is kept in process.
+    """
+
+    max_local_keys: ClassVar[int] = 10_000
+    min_lease_limit: ClassVar[int] = 100
+
+    def __init__(self, prefix: str = "auth_api:ratelimit", lease_fraction: float = 0.1):
+        self.prefix: str = prefix
+        self.lease_fraction: float = lease_fraction
+        # Leases and cached rejections, and the no-Redis fallback's window
+        # counters; both bounded, least recently used evicted first.
+        self._buckets: TTLCache[str, _LocalBucket] = TTLCache(self.max_local_keys)
+        self._windows: TTLCache[str, int] = TTLCache(self.max_local_keys)
+
+    def _reserve_local(
+        self, keys: tuple[str, str], now_ms: int, window_ms: int, limit: int, wanted: int
+    ) -> tuple[int, int]:
+        now = now_ms / 1000
+        current = self._windows.get(keys[0], now) or 0
+        previous = self._windows.get(keys[1], now) or 0
+        elapsed = (now_ms % window_ms) / window_ms
+        available = math.floor(limit - (previous * (1 - elapsed) + current))
+        if available <= 0:
+            return 0, window_ms - (now_ms % window_ms)
+        granted = min(wanted, available)
+        # Still read as the previous window during the next one.
+        expires_at = (now_ms // window_ms + 2) * window_ms / 1000
+        self._windows.set(keys[0], current + granted, expires_at)
+        return granted, 0
+
+    async def _reserve(
+        self, key: str, now_ms: int, window_ms: int, limit: int, wanted: int
+    ) -> tuple[int, int]:
+        index = now_ms // window_ms
+        keys = (f"{self.prefix}:{key}:{index}", f"{self.prefix}:{key}:{index - 1}")
+        redis = get_redis()
+        if redis is not None:
+            try:
+                granted, retry_after_ms = cast(
+                    list[int],
+                    await redis.eval(  # pyright: ignore[reportUnknownMemberType, reportGeneralTypeIssues]
+                        SLIDING_WINDOW_LUA, 2, *keys, now_ms, window_ms, limit, wanted
+                    ),
+                )
+                return int(granted), int(retry_after_ms)
+            except RedisError as e:
+                main_logger.warning(f"Rate limiter falling back to local state: {e}")
+        return self._reserve_local(keys, now_ms, window_ms, limit, wanted)
+
+    async def hit(self, key: str, limit: int, window: int) -> int:
+        """Consume one unit for `key`.
+
+        Returns:
+            int: 0 if allowed, otherwise seconds until the caller may retry.
+        """
+        now = time.time()
+        bucket = self._buckets.get(key, now)
+        if bucket is not None:
+            if bucket.blocked_until > now:
+                return math.ceil(bucket.blocked_until - now)
+            if bucket.tokens > 0 and bucket.expires_at > now:
+                bucket.tokens -= 1
+                return 0
+
+        now_ms = int(now * 1000)
+        window_ms = window * 1000
+        wanted = (
+            int(limit * self.lease_fraction) if limit >= self.min_lease_limit else 1
+        )
+        granted, retry_after_ms = await self._reserve(
+            key, now_ms, window_ms, limit, wanted
+        )
+        if granted == 0:
+            blocked_until = now + retry_after_ms / 1000
+            self._buckets.set(
+                key, _LocalBucket(blocked_until=blocked_until), blocked_until
+            )
+            return max(1, math.ceil(retry_after_ms / 1000))
+
+        # Unused leased tokens lapse with the window they were counted in.
+        expires_at = now + (window_ms - now_ms % window_ms) / 1000
+        self._buckets.set(
+            key, _LocalBucket(tokens=granted - 1, expires_at=expires_at), expires_at
+        )
+        return 0
+
+
+rate_limiter: SlidingWindowLimiter = SlidingWindowLimiter()
+
+
+class RateLimit:
+    """Route dependency limiting requests per client IP and, optionally, per
+    identity taken from the JSON body (e.g. `username` or `email`).
+
+    Runs before body validation and the endpoint, so rejected requests never
+    reach password strength checks or Argon2. The client IP is the one the
+    server resolved: uvicorn takes it from X-Forwarded-For only when the
+    peer is listed in `forwarded_allow_ips`, so behind a load balancer that
+    setting must name it, and clients cannot spoof the header themselves.
+    """
+
+    def __init__(self, limit: int, window: int, identity_field: str | None = None):
+        self.limit: int = limit
+        self.window: int = window
+        self.identity_field: str | None = identity_field
+
+    async def _identity(self, request: Request) -> str | None:
+        if self.identity_field is None:
+            return None
+        try:
+            body = await request.json()  # pyright: ignore[reportAny]
+        except Exception:
+            return None
+        if not isinstance(body, dict):
+            return None
+        value = cast(dict[str, object], body).get(self.identity_field)
+        return value.strip().lower() if isinstance(value, str) and value else None
+
+    async def __call__(self, request: Request) -> None:
+        route = request.url.path
+        client_host = request.client.host if request.client else "unknown"
+        keys = [f"{route}:ip:{client_host}"]
+        identity = await self._identity(request)
+        if identity is not None:
+            keys.append(f"{route}:{self.identity_field}:{identity}")
+
+        for key in keys:
+            retry_after = await rate_limiter.hit(key, limit=self.limit, window=self.window)
+            if retry_after:
+                main_logger.bind(rate_limit_key=key).warning("Rate limit exceeded")
+                raise TooManyRequestsException(retry_after=retry_after)
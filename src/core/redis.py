@@ -1,4 +1,6 @@
+import asyncio
 import json
+import weakref
 from typing import cast
 
 from fastapi_cache import FastAPICache, JsonCoder
@@ -20,7 +22,56 @@ class SafeJsonCoder(JsonCoder):
         return json.loads(value)  # pyright: ignore[reportAny]
 
 
+# Shared client for features that talk to Redis directly (rate limiting, ...).
+# Stays None until init_redis() succeeds, callers fall back to in-process state.
+redis_client: Redis | None = None
+_redis_client_loop: asyncio.AbstractEventLoop | None = None
+
+# Clients built by get_or_create_redis() for other event loops, e.g. the
+# worker loop that runs email tasks in a thread of the API process.
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Redis]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_redis() -> Redis | None:
+    return redis_client
+
+
+def get_or_create_redis() -> Redis | None:
+    """Like get_redis(), but builds a client on first use.
+
+    For code that may run outside the API loop (Celery workers, the outbox
+    relay, in-process email tasks on the worker loop). A redis.asyncio
+    client is bound to the loop it first connects on, so each event loop
+    gets its own; the API client is only returned on the API loop. Clients
+    connect lazily, on their first command. Must be called from a coroutine.
+    """
+    if not config.redis.url:
+        return None
+    loop = asyncio.get_running_loop()
+    if redis_client is not None and loop is _redis_client_loop:
+        return redis_client
+    client = _loop_clients.get(loop)
+    if client is None:
+        client = _loop_clients[loop] = Redis.from_url(  # pyright: ignore[reportUnknownMemberType]
+            url=str(config.redis.url), encoding="utf8", decode_responses=True
+        )
+    return client
+
+
+async def close_loop_redis() -> None:
+    """Close the client get_or_create_redis() built for the running loop."""
+    client = _loop_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
 async def init_redis() -> None:
+    global redis_client, _redis_client_loop
+    if not config.redis.url:
+        # Test / single-node mode: Redis-backed features keep state in process.
+        return
     try:
         _redis: Redis = Redis.from_url(  # pyright: ignore[reportUnknownMemberType]
             url=cast(str, config.redis.url),
@@ -34,6 +85,8 @@ async def init_redis() -> None:
             prefix=config.cache_name,
             expire=cast(int, config.redis.cache_expire),
         )
+        redis_client = _redis
+        _redis_client_loop = asyncio.get_running_loop()
     except ConnectionError as e:
         print(f"❌ Redis connection failed: {e}")
         raise RuntimeError("Failed to initialize Redis cache") from e
@@ -2,6 +2,8 @@ from typing import Any, override
 
 from fastapi.routing import APIRouter
 
+from src.auth.util.scopes import RequireScopes
+from src.core.rate_limit import RateLimit
 from src.core.router.errors import ErrorResponse, ValidationErrorResponse
 
 ID_LIST = ["{id}", "{slug}", "{uuid}"]
@@ -49,6 +51,34 @@ class CustomRouter(APIRouter):
                 "description": "Unauthorized access",
             }
 
+        # Add 429 automatically if the route declares a rate limit
+        if any(
+            isinstance(dep.dependency, RateLimit)  # pyright: ignore[reportUnknownMemberType]
+            for dep in dependencies  # pyright: ignore[reportUnknownVariableType]
+            if hasattr(dep, "dependency")  # pyright: ignore[reportUnknownArgumentType]
+        ):
+            default_responses[429] = {
+                "model": ErrorResponse,
+                "description": "Too many requests (see the Retry-After header)",
+            }
+
+        # Add 401/403 automatically if the route requires token scopes
+        required_scopes: list[str] = [
+            scope
+            for dep in dependencies  # pyright: ignore[reportUnknownVariableType]
+            if isinstance(getattr(dep, "dependency", None), RequireScopes)  # pyright: ignore[reportUnknownArgumentType]
+            for scope in dep.dependency.scopes  # pyright: ignore[reportUnknownMemberType]
+        ]
+        if required_scopes:
+            default_responses[401] = {
+                "model": ErrorResponse,
+                "description": "Unauthorized access",
+            }
+            default_responses[403] = {
+                "model": ErrorResponse,
+                "description": f"Forbidden: token lacks scope {', '.join(required_scopes)}",
+            }
+
         # Add 404 automatically if path looks like a resource identifier
         if "{" in path and any(x in path for x in ID_LIST):
             default_responses[404] = {
@@ -0,0 +1,104 @@
+import time
+from collections.abc import Coroutine, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.core.metrics import EMAIL_TASK_RETRIES, EMAIL_TASK_STAGE_SECONDS
+from src.utils.logging import main_logger
+
+# Celery message headers carrying the originating request across the broker
+REQUEST_ID_HEADER = "req_id"
+ENQUEUED_AT_HEADER = "enqueued_at"
+
+_request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+_current_trace: ContextVar["TaskTrace | None"] = ContextVar(
+    "current_trace", default=None
+)
+
+
+def set_request_id(req_id: str) -> None:
+    """Called by `logging_middleware` for every request."""
+    _ = _request_id.set(req_id)
+
+
+def current_request_id() -> str | None:
+    return _request_id.get()
+
+
+@dataclass
+class TaskTrace:
+    """Timestamps of one task run, from the API request to SMTP delivery.
+
+    `enqueued_at` comes from the message headers (the time the request
+    handler queued the task), so `queue_wait` covers the outbox, the broker
+    and the worker's prefetch buffer.
+    """
+
+    task_name: str
+    task_id: str
+    req_id: str | None
+    enqueued_at: float | None
+    retries: int = 0
+    started_at: float = field(default_factory=time.time)
+    stages: dict[str, float] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.enqueued_at is not None and not self.retries:
+            self.observe("queue_wait", self.started_at - self.enqueued_at)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        seconds = max(0.0, seconds)
+        self.stages[stage] = round(seconds, 6)
+        EMAIL_TASK_STAGE_SECONDS.labels(self.task_name, stage).observe(seconds)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def finish(self, state: str) -> None:
+        finished_at = time.time()
+        self.observe("run", finished_at - self.started_at)
+        if state == "RETRY":
+            EMAIL_TASK_RETRIES.labels(self.task_name).inc()
+        elif state == "SUCCESS" and self.enqueued_at is not None:
+            self.observe("end_to_end", finished_at - self.enqueued_at)
+        main_logger.bind(
+            req_id=self.req_id,
+            task_id=self.task_id,
+            task=self.task_name,
+            state=state,
+            retries=self.retries,
+            enqueued_at=self.enqueued_at,
+            started_at=self.started_at,
+            finished_at=finished_at,
+            stages=self.stages,
+        ).info(f"Task trace: {self.task_name} {state}")
+
+
+@contextmanager
+def trace_stage(name: str) -> Iterator[None]:
+    """Time a stage of the task trace active in this context, if any."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    with trace.stage(name):
+        yield
+
+
+async def run_traced[T](
+    trace: TaskTrace | None,
+    coro: Coroutine[Any, Any, T],  # pyright: ignore[reportExplicitAny]
+) -> T:
+    """Await `coro` with `trace` active, so `trace_stage` calls record into it."""
+    token = _current_trace.set(trace)
+    try:
+        return await coro
+    finally:
+        _current_trace.reset(token)
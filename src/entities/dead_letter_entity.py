@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, Text
+from sqlmodel import Column, DateTime, Field, SQLModel, func
+
+
+class DeadLetterTaskModel(SQLModel, table=True):
+    """A task that failed for good (retries exhausted or a fatal error),
+    kept with its original arguments so `src.tasks.dead_letter` can replay it."""
+
+    __tablename__ = (  # pyright: ignore[reportUnannotatedClassAttribute, reportAssignmentType]
+        "dead_letter_task"
+    )
+    id: int | None = Field(default=None, primary_key=True)
+    task_name: str = Field(nullable=False, max_length=128, index=True)
+    task_id: str = Field(nullable=False, max_length=64)
+    request_id: str | None = Field(default=None, max_length=36, nullable=True)
+    payload: dict[str, Any] = Field(  # pyright: ignore[reportExplicitAny]
+        default_factory=dict, sa_column=Column(JSON, nullable=False)
+    )
+    error: str = Field(sa_column=Column(Text, nullable=False))
+    retries: int = Field(default=0, nullable=False)
+    failed_at: datetime | None = Field(  # pyright: ignore[reportAny]
+        default=None,
+        sa_column=Column(
+            DateTime(timezone=True), server_default=func.now(), index=True
+        ),
+    )
+    replayed_at: datetime | None = Field(  # pyright: ignore[reportAny]
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True, index=True),
+    )
@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON
+from sqlmodel import Column, DateTime, Field, SQLModel, func
+
+from src.core.tracing import current_request_id
+
+
+class OutboxMessageModel(SQLModel, table=True):
+    """A task to publish, written in the same transaction as the change that
+    triggers it and relayed to Celery by `src.tasks.outbox_relay`."""
+
+    __tablename__ = (  # pyright: ignore[reportUnannotatedClassAttribute, reportAssignmentType]
+        "outbox_message"
+    )
+    id: int | None = Field(default=None, primary_key=True)
+    task_name: str = Field(nullable=False, max_length=128)
+    payload: dict[str, Any] = Field(  # pyright: ignore[reportExplicitAny]
+        default_factory=dict, sa_column=Column(JSON, nullable=False)
+    )
+    # Request that wrote the row, carried into the task headers for tracing
+    request_id: str | None = Field(
+        default_factory=current_request_id, max_length=36, nullable=True
+    )
+    created_at: datetime | None = Field(  # pyright: ignore[reportAny]
+        default=None,
+        sa_column=Column(
+            DateTime(timezone=True), server_default=func.now(), nullable=True
+        ),
+    )
+    published_at: datetime | None = Field(  # pyright: ignore[reportAny]
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True, index=True),
+    )
@@ -1,7 +1,8 @@
+from datetime import datetime
 from typing import cast
 
-from sqlmodel import Boolean  # pyright: ignore[reportUnknownVariableType]
-from sqlmodel import Field, Relationship, SQLModel, String
+from sqlmodel import BigInteger, Boolean  # pyright: ignore[reportUnknownVariableType]
+from sqlmodel import Column, DateTime, Field, Relationship, SQLModel, String
 
 from src.entities.base import TimestampMixin
 from src.schemas.user_schemas import UserBase
@@ -27,6 +28,27 @@ class UserModel(TimestampMixin, UserBase, table=True):
         index=False,
         description="Base32-encoded TOTP secret (16–32 chars)",
     )
+    role: str = Field(
+        default="user",
+        sa_type=String(16),
+        sa_column_kwargs={"server_default": "user"},
+        nullable=False,
+        description="Role whose scopes are granted (see src.auth.util.scopes)",
+    )
+    scopes: int = Field(
+        default=0,
+        sa_type=BigInteger,
+        sa_column_kwargs={"server_default": "0"},
+        nullable=False,
+        description="Bitmask of extra scopes granted on top of the role",
+    )
+    # Maintained in batches by src.services.login_events (write-behind)
+    last_login_at: datetime | None = Field(  # pyright: ignore[reportAny]
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    login_count: int = Field(
+        default=0, sa_column_kwargs={"server_default": "0"}, nullable=False
+    )
     profile: "ProfileModel" = cast(
         "ProfileModel",
         Relationship(back_populates="user", sa_relationship_kwargs={"uselist": False}),
@@ -43,3 +65,39 @@ class ProfileModel(SQLModel, table=True):
     avatar_url: str = Field(default=False, nullable=True)
 
     user: UserModel | None = cast(UserModel, Relationship(back_populates="profile"))
+
+
+class RecoveryCodeModel(SQLModel, table=True):
+    __tablename__ = (  # pyright: ignore[reportUnannotatedClassAttribute, reportAssignmentType]
+        "recovery_code"
+    )
+    id: int | None = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    code_index: str = Field(
+        sa_type=String(64),
+        nullable=False,
+        unique=True,
+        index=True,
+        description="Keyed HMAC of (user id, code), used for lookup",
+    )
+    hashed_code: str = Field(nullable=False, max_length=256)
+    used_at: datetime | None = Field(  # pyright: ignore[reportAny]
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+
+
+class LoginEventModel(SQLModel, table=True):
+    __tablename__ = (  # pyright: ignore[reportUnannotatedClassAttribute, reportAssignmentType]
+        "login_event"
+    )
+    id: int | None = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    method: str = Field(
+        sa_type=String(16),
+        nullable=False,
+        description="password, totp or recovery_code",
+    )
+    ip_address: str | None = Field(default=None, sa_type=String(45), nullable=True)
+    occurred_at: datetime = Field(  # pyright: ignore[reportAny]
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
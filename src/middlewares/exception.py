@@ -37,6 +37,7 @@ async def app_exception_handler(_request: Request, exc: AppException) -> JSONRes
     return JSONResponse(
         status_code=exc.status_code,
         content={"success": False, "error": exc.message},
+        headers=exc.headers,
     )
 
 
@@ -12,6 +12,7 @@ from starlette.concurrency import iterate_in_threadpool
 from src.auth.schemas.token import TokenError
 from src.auth.util.token import JWTPayloadWithExp, jwt_auth_token
 from src.core.exception import UnauthorizedException
+from src.core.tracing import set_request_id
 from src.utils.logging import filter_sensitive, main_logger
 
 
@@ -47,6 +48,7 @@ async def logging_middleware(
     request: Request, call_next: Callable[[Request], Awaitable[Response]]
 ) -> Response:
     request.state.req_id = str(uuid.uuid4())
+    set_request_id(request.state.req_id)
 
     # Check if request.client exists before accessing .host
     client_host = request.client.host if request.client else "unknown"
@@ -71,6 +73,14 @@ async def logging_middleware(
 
         try:
             response: Response = await call_next(request)
+            if "content-length" not in response.headers:
+                # A streamed body (e.g. the NDJSON login export) has no
+                # length up front; buffering it to log it would hold every
+                # chunk until the last one, so it is passed through as is.
+                main_logger.bind(status_code=response.status_code).info(
+                    "Response sent: [Streamed response]"
+                )
+                return response
             response_body: list[bytes] = [
                 chunk
                 async for chunk in response.body_iterator  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType, reportAttributeAccessIssue]
@@ -0,0 +1,68 @@
+import gc
+from typing import Any, override
+
+from fastapi import FastAPI
+from gunicorn.app.base import \
+    BaseApplication  # pyright: ignore[reportMissingTypeStubs]
+
+from src.config import config
+
+
+def preload_app() -> FastAPI:
+    """Import the app and its read-only data once, in the parent process.
+
+    Forked workers then share these pages copy-on-write. `gc.freeze()` moves
+    everything allocated so far out of the collector's reach so that the
+    first collection in a worker doesn't touch (and copy) the shared pages.
+    """
+    from src import app
+    from src.auth.util.password import password_validator
+
+    password_validator.preload()
+
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+class ProductionServer(BaseApplication):  # pyright: ignore[reportUntypedBaseClass]
+    """Gunicorn master pre-forking uvicorn workers (uvloop + httptools).
+
+    Send SIGHUP to replace the workers gracefully (e.g. after a config
+    change) and SIGTERM for a graceful shutdown; workers get
+    `graceful_timeout` seconds to finish in-flight requests. With
+    `preload_app` the app is imported once in the master and SIGHUP forks
+    the new workers from that already-loaded code, so code changes need a
+    full restart of the master.
+    """
+
+    def __init__(self, options: dict[str, Any]) -> None:  # pyright: ignore[reportExplicitAny]
+        self.options: dict[str, Any] = options  # pyright: ignore[reportExplicitAny]
+        super().__init__()
+
+    @override
+    def load_config(self) -> None:
+        for key, value in self.options.items():  # pyright: ignore[reportAny]
+            self.cfg.set(key, value)  # pyright: ignore[reportUnknownMemberType, reportAttributeAccessIssue]
+
+    @override
+    def load(self) -> FastAPI:
+        return preload_app()
+
+
+def run() -> None:
+    ProductionServer(
+        options={
+            "bind": f"{config.env.host}:{config.env.port}",
+            "workers": config.env.workers,
+            "worker_class": "uvicorn_worker.UvicornWorker",
+            "preload_app": True,
+            "graceful_timeout": config.env.graceful_timeout,
+            "forwarded_allow_ips": config.env.forwarded_allow_ips,
+            "loglevel": config.env.log_level,
+        }
+    ).run()  # pyright: ignore[reportUnknownMemberType]
+
+
+if __name__ == "__main__":
+    run()
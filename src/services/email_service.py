@@ -1,43 +1,79 @@
+from email.message import EmailMessage
+from email.utils import formataddr
 from pathlib import Path
 from typing import Any, cast
 
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-from pydantic import DirectoryPath, NameEmail, SecretStr
+from aiosmtplib import SMTPRecipientsRefused, SMTPResponseException
+from jinja2 import (Environment, FileSystemBytecodeCache, FileSystemLoader,
+                    select_autoescape)
+from markupsafe import Markup
+from pydantic import NameEmail
 
 from src.config import config
+from src.core.tracing import trace_stage
+from src.services.email_transport import EmailTransport, build_transport
 from src.utils.logging import main_logger
 
+TEMPLATE_FOLDER = Path(__file__).resolve().parents[1] / "templates"
+
 
 class EmailServiceTransientError(Exception):
     """Exception indicating a temporary, retryable failure in email sending (e.g., network error)."""
     pass
 
 
+def is_transient(error: Exception) -> bool:
+    """Whether retrying the send later may succeed.
+
+    Connection failures, timeouts and 4xx replies are temporary. 5xx
+    replies and refused recipients are permanent: retrying would only
+    repeat them.
+    """
+    if isinstance(error, SMTPRecipientsRefused):
+        return False
+    if isinstance(error, SMTPResponseException):
+        return 400 <= error.code < 500
+    return isinstance(error, OSError)  # connection errors and timeouts
+
+
 class EmailService:
     def __init__(self) -> None:
-        self.conf: ConnectionConfig = ConnectionConfig(
-            MAIL_USERNAME=config.env.smtp_server.username,
-            MAIL_PASSWORD=SecretStr(config.env.smtp_server.password),
-            MAIL_FROM=config.env.smtp_server.from_email,
-            MAIL_PORT=config.env.smtp_server.port,
-            MAIL_SERVER=config.env.smtp_server.server,
-            MAIL_STARTTLS=config.env.smtp_server.use_tls,
-            MAIL_SSL_TLS=config.env.smtp_server.use_ssl,
-            TEMPLATE_FOLDER=Path(__file__).resolve().parents[1] / "templates",
-            LOCAL_HOSTNAME=config.env.smtp_server.hostname,
-            VALIDATE_CERTS=config.env.smtp_server.validate_certs,
-            USE_CREDENTIALS=config.env.smtp_server.credentials,
-        )
-        self.mail: FastMail = FastMail(config=self.conf)
+        self.from_email: str = config.env.smtp_server.from_email
+        self.transport: EmailTransport = build_transport(config.env.smtp_server)
         self.template_env: Environment = Environment(
-            loader=FileSystemLoader(
-                searchpath=cast(DirectoryPath, self.conf.TEMPLATE_FOLDER)
-            ),
+            loader=FileSystemLoader(searchpath=TEMPLATE_FOLDER),
             autoescape=select_autoescape(["html", "xml"]),
             trim_blocks=True,
             lstrip_blocks=True,
+            # Only development edits templates on disk; elsewhere skip the
+            # per-render stat() of every template in the inheritance chain.
+            auto_reload=config.env.env_mode == "development",
+            bytecode_cache=FileSystemBytecodeCache(),
         )
+        self.template_env.globals["static_fragment"] = self.static_fragment
+        self._fragments: dict[str, Markup] = {}
+
+    def static_fragment(self, template_name: str) -> Markup:
+        """Render a context-free template (header, footer) once and reuse it."""
+        fragment = self._fragments.get(template_name)
+        if fragment is None:
+            fragment = Markup(self.template_env.get_template(template_name).render())
+            self._fragments[template_name] = fragment
+        return fragment
+
+    def precompile_templates(self) -> int:
+        """Compile every template up front (worker start).
+
+        Compiled code is loaded from the bytecode cache when available and
+        kept in the environment's template cache afterwards.
+        """
+        names = self.template_env.list_templates(extensions=["html"])
+        for name in names:
+            _ = self.template_env.get_template(name)
+        for name in names:
+            if name.startswith("components/"):
+                _ = self.static_fragment(name)
+        return len(names)
 
     def render_template(
         self,
@@ -55,18 +91,25 @@ class EmailService:
         template_name: str,
         context: dict[str, str | int | float | bool],
     ):
-        body = self.render_template(template_name=template_name, context=context)
-        message: MessageSchema = MessageSchema(
-            subject=subject,
-            recipients=[to_email],
-            body=body,
-            subtype=MessageType.html,
-        )
+        with trace_stage("render"):
+            body = self.render_template(template_name=template_name, context=context)
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = self.from_email
+        message["To"] = formataddr((to_email.name, to_email.email))
+        message.set_content(body, subtype="html")
         try:
-            await self.mail.send_message(message=message)
+            with trace_stage("smtp_send"):
+                await self.transport.send_message(message)
         except Exception as e:
             main_logger.error(f"Error sending email to {to_email.email}: {e}")
-            raise EmailServiceTransientError(f"Failed to send email: {e}")
+            if not is_transient(e):
+                raise
+            raise EmailServiceTransientError(f"Failed to send email: {e}") from e
+
+    async def close(self) -> None:
+        """Close the transport, e.g. pooled SMTP connections (worker shutdown)."""
+        await self.transport.close()
 
     async def send_activate_email(
         self,
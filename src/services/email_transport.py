@@ -0,0 +1,112 @@
+import asyncio
+import json
+import mailbox
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timezone
+from email.message import EmailMessage
+from pathlib import Path
+
+from src.core.env import SmtpServerConfig
+from src.services.smtp_pool import SMTPBatchSender, SMTPConnectionPool
+from src.services.smtp_throttle import SMTPThrottle
+
+
+class EmailTransport(ABC):
+    """Delivers rendered messages; selected by `smtp_server.transport`."""
+
+    @abstractmethod
+    async def send_message(self, message: EmailMessage) -> None:
+        pass
+
+    async def close(self) -> None:
+        """Release connections or files (worker shutdown)."""
+        return None
+
+
+class SMTPTransport(EmailTransport):
+    """Pooled, batched and throttled delivery to the configured SMTP relay."""
+
+    def __init__(self, settings: SmtpServerConfig) -> None:
+        self.pool: SMTPConnectionPool = SMTPConnectionPool(
+            settings=settings,
+            throttle=(
+                SMTPThrottle(
+                    rate=settings.rate_limit_per_second,
+                    burst=settings.rate_limit_burst,
+                )
+                if settings.rate_limit_per_second > 0
+                else None
+            ),
+        )
+        self.sender: SMTPBatchSender = SMTPBatchSender(
+            pool=self.pool,
+            max_batch=settings.batch_size,
+            max_wait_ms=settings.batch_wait_ms,
+            max_sessions=settings.pool_size,
+        )
+
+    async def send_message(self, message: EmailMessage) -> None:
+        await self.sender.send_message(message)
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+
+class InMemoryTransport(EmailTransport):
+    """Keeps the last `maxlen` messages in `outbox`; nothing leaves the process."""
+
+    def __init__(self, maxlen: int = 10_000) -> None:
+        self.outbox: deque[EmailMessage] = deque(maxlen=maxlen)
+        self.sent_count: int = 0
+
+    async def send_message(self, message: EmailMessage) -> None:
+        self.outbox.append(message)
+        self.sent_count += 1
+
+
+class FileTransport(EmailTransport):
+    """Appends messages to a local NDJSON or mbox file.
+
+    Writes happen in a thread, one at a time, so concurrent tasks never
+    interleave records.
+    """
+
+    def __init__(self, path: str, file_format: str = "ndjson") -> None:
+        self.path: Path = Path(path)
+        self.file_format: str = file_format
+        self._lock: asyncio.Lock | None = None
+
+    def _write(self, message: EmailMessage) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.file_format == "mbox":
+            box = mailbox.mbox(self.path)
+            try:
+                _ = box.add(message)
+                box.flush()
+            finally:
+                box.close()
+            return
+        record = {
+            "sent_at": datetime.now(timezone.utc).isoformat(),
+            "from": message["From"],
+            "to": message["To"],
+            "subject": message["Subject"],
+            "body": message.get_content(),
+        }
+        with self.path.open("a", encoding="utf-8") as file:
+            _ = file.write(json.dumps(record) + "\n")
+
+    async def send_message(self, message: EmailMessage) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            await asyncio.to_thread(self._write, message)
+
+
+def build_transport(settings: SmtpServerConfig) -> EmailTransport:
+    if settings.transport == "memory":
+        return InMemoryTransport()
+    if settings.transport == "file":
+        return FileTransport(path=settings.file_path, file_format=settings.file_format)
+    return SMTPTransport(settings)
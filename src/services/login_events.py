@@ -0,0 +1,185 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import bindparam, insert, update
+from sqlmodel import col, select
+
+from src.config import config
+from src.core.metrics import (LOGIN_EVENTS_BUFFERED, LOGIN_EVENTS_DROPPED,
+                              LOGIN_EVENTS_FLUSHED, LOGIN_EVENTS_RECORDED)
+from src.entities.user_entity import LoginEventModel, UserModel
+from src.utils.logging import main_logger
+
+
+@dataclass(frozen=True)
+class LoginEvent:
+    user_id: int
+    method: str
+    ip_address: str | None
+    occurred_at: datetime
+
+
+class LoginEventRecorder:
+    """Write-behind recorder for successful logins.
+
+    Log-in handlers only append to a bounded in-memory buffer. A background
+    task flushes it every `flush_interval` seconds (or as soon as
+    `batch_size` events are waiting) as one multi-row INSERT into
+    `login_event` plus one UPDATE per user, coalesced, for `last_login_at`
+    and `login_count`; so a burst of logins costs a handful of statements
+    instead of a write per login. When the buffer is full new events are
+    dropped and counted. `stop` flushes what is left.
+    """
+
+    def __init__(
+        self, maxsize: int = 10_000, batch_size: int = 500, flush_interval: float = 1.0
+    ) -> None:
+        self.maxsize: int = maxsize
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self._buffer: list[LoginEvent] = []
+        self._full: asyncio.Event | None = None
+        self._flusher: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._flusher is not None and not self._flusher.done():
+            return
+        self._full = asyncio.Event()
+        self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            _ = self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        while self._buffer:
+            await self.flush()
+
+    def record(self, user_id: int, method: str, ip_address: str | None = None) -> bool:
+        """Buffer a successful login; never waits on the database.
+
+        Returns:
+            bool: False if the event was dropped because the buffer is full.
+        """
+        if len(self._buffer) >= self.maxsize:
+            LOGIN_EVENTS_DROPPED.inc()
+            return False
+        self._buffer.append(
+            LoginEvent(
+                user_id=user_id,
+                method=method,
+                ip_address=ip_address,
+                occurred_at=datetime.now(timezone.utc),
+            )
+        )
+        LOGIN_EVENTS_RECORDED.inc()
+        LOGIN_EVENTS_BUFFERED.set(len(self._buffer))
+        if self._full is not None and len(self._buffer) >= self.batch_size:
+            self._full.set()
+        return True
+
+    async def flush(self) -> int:
+        batch = self._buffer[: self.batch_size]
+        del self._buffer[: self.batch_size]
+        LOGIN_EVENTS_BUFFERED.set(len(self._buffer))
+        if not batch:
+            return 0
+
+        last_login: dict[int, tuple[datetime, int]] = {}
+        for event in batch:
+            previous, count = last_login.get(event.user_id, (event.occurred_at, 0))
+            last_login[event.user_id] = (max(previous, event.occurred_at), count + 1)
+
+        from src.core.db import AsyncSessionLocal
+
+        user_table = UserModel.__table__  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType, reportUnknownVariableType]
+        try:
+            async with AsyncSessionLocal() as session:
+                _ = await session.execute(  # pyright: ignore[reportDeprecated]
+                    insert(LoginEventModel).values(
+                        [
+                            {
+                                "user_id": event.user_id,
+                                "method": event.method,
+                                "ip_address": event.ip_address,
+                                "occurred_at": event.occurred_at,
+                            }
+                            for event in batch
+                        ]
+                    )
+                )
+                _ = await session.execute(  # pyright: ignore[reportDeprecated]
+                    update(user_table)  # pyright: ignore[reportUnknownArgumentType]
+                    .where(user_table.c.id == bindparam("uid"))  # pyright: ignore[reportUnknownMemberType]
+                    .values(
+                        last_login_at=bindparam("ts"),
+                        login_count=user_table.c.login_count + bindparam("n"),  # pyright: ignore[reportUnknownMemberType]
+                    ),
+                    [
+                        {"uid": user_id, "ts": ts, "n": count}
+                        for user_id, (ts, count) in last_login.items()
+                    ],
+                )
+                await session.commit()
+        except Exception as e:
+            LOGIN_EVENTS_DROPPED.inc(len(batch))
+            main_logger.error(f"Failed to flush {len(batch)} login events: {e}")
+            return 0
+        LOGIN_EVENTS_FLUSHED.inc(len(batch))
+        return len(batch)
+
+    async def _run(self) -> None:
+        assert self._full is not None
+        while True:
+            try:
+                _ = await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            self._full.clear()
+            while self._buffer:
+                _ = await self.flush()
+                if len(self._buffer) < self.batch_size:
+                    break
+
+    async def export_ndjson(
+        self,
+        user_id: int | None = None,
+        since: datetime | None = None,
+        chunk_size: int = 1_000,
+    ) -> AsyncIterator[str]:
+        """Stream the audit trail, oldest first, one JSON object per line."""
+        from src.core.db import AsyncSessionLocal
+
+        statement = select(LoginEventModel)
+        if user_id is not None:
+            statement = statement.where(LoginEventModel.user_id == user_id)
+        if since is not None:
+            statement = statement.where(col(LoginEventModel.occurred_at) >= since)
+        statement = statement.order_by(col(LoginEventModel.occurred_at)).execution_options(
+            yield_per=chunk_size
+        )
+        async with AsyncSessionLocal() as session:
+            result = await session.stream_scalars(statement)
+            async for event in result:
+                record: dict[str, Any] = {  # pyright: ignore[reportExplicitAny]
+                    "id": event.id,
+                    "user_id": event.user_id,
+                    "method": event.method,
+                    "ip_address": event.ip_address,
+                    "occurred_at": event.occurred_at.isoformat(),
+                }
+                yield json.dumps(record) + "\n"
+
+
+login_events: LoginEventRecorder = LoginEventRecorder(
+    maxsize=config.env.login_events.maxsize,
+    batch_size=config.env.login_events.batch_size,
+    flush_interval=config.env.login_events.flush_interval,
+)
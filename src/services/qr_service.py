@@ -0,0 +1,76 @@
+import asyncio
+import base64
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal
+
+type QR_FORMAT = Literal["png", "svg", "uri"]
+
+
+def _render_png(uri: str) -> str:
+    import qrcode  # imported on first enrollment: pulls in PIL
+
+    buffer = io.BytesIO()
+    qrcode.make(uri).save(buffer, kind="png")
+    return f"data:image/png;base64,{base64.b64encode(buffer.getvalue()).decode('utf-8')}"
+
+
+def _render_svg(uri: str) -> str:
+    import qrcode
+
+    qr = qrcode.QRCode(border=4)
+    qr.add_data(uri)
+    qr.make(fit=True)
+    matrix: list[list[bool]] = qr.get_matrix()
+    # One rectangle per horizontal run of dark modules rather than one
+    # square per module (qrcode's SvgPathImage): half the size and faster.
+    runs: list[str] = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < len(row):
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < len(row) and row[x]:
+                x += 1
+            runs.append(f"M{start} {y}h{x - start}v1h-{x - start}z")
+    size = len(matrix)
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" '
+        f'shape-rendering="crispEdges"><path d="{"".join(runs)}"/></svg>'
+    )
+    return f"data:image/svg+xml;base64,{base64.b64encode(svg.encode()).decode('utf-8')}"
+
+
+class QRCodeService:
+    """Renders 2FA enrollment QR codes off the event loop.
+
+    `svg` is a single path element that scales without blurring and is
+    cheaper to produce than the PNG, though several times larger (see
+    `benchmarks/qr_render.py`). `uri` skips rendering and is by far the
+    smallest, for clients that draw the code from the provisioning URI.
+    """
+
+    def __init__(self, max_workers: int = 2) -> None:
+        self.max_workers: int = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def render(self, uri: str, qr_format: QR_FORMAT = "png") -> str | None:
+        if qr_format == "uri":
+            return None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="qr-render"
+            )
+        renderer = _render_svg if qr_format == "svg" else _render_png
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, renderer, uri)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+qr_code_service: QRCodeService = QRCodeService()
@@ -0,0 +1,214 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from email.message import EmailMessage
+
+from aiosmtplib import (SMTP, SMTPException, SMTPRecipientsRefused,
+                        SMTPResponseException, SMTPServerDisconnected)
+
+from src.core.env import SmtpServerConfig
+from src.services.smtp_throttle import SMTPThrottle
+from src.utils.logging import main_logger
+
+
+@dataclass
+class _PooledConnection:
+    smtp: SMTP
+    last_used: float
+
+
+class SMTPConnectionPool:
+    """Pool of connected, authenticated SMTP sessions.
+
+    Connections are reused across messages so TLS and AUTH happen once per
+    connection rather than once per email. Idle connections past
+    `idle_timeout` are closed on checkout, and ones idle past
+    `health_check_interval` are probed with NOOP first. A send that fails
+    because the server dropped the connection is retried once on a fresh
+    connection. The pool must only be used from one event loop (see
+    `src.tasks.loop.worker_loop`).
+    """
+
+    def __init__(
+        self, settings: SmtpServerConfig, throttle: SMTPThrottle | None = None
+    ) -> None:
+        self.settings: SmtpServerConfig = settings
+        self.throttle: SMTPThrottle | None = throttle
+        self._idle: list[_PooledConnection] = []
+        self._slots: asyncio.Semaphore = asyncio.Semaphore(settings.pool_size)
+
+    async def _connect(self) -> _PooledConnection:
+        smtp = SMTP(
+            hostname=self.settings.server,
+            port=self.settings.port,
+            username=self.settings.username if self.settings.credentials else None,
+            password=self.settings.password if self.settings.credentials else None,
+            local_hostname=self.settings.hostname,
+            use_tls=self.settings.use_ssl,
+            start_tls=self.settings.use_tls,
+            validate_certs=self.settings.validate_certs,
+            timeout=self.settings.timeout,
+        )
+        _ = await smtp.connect()
+        return _PooledConnection(smtp=smtp, last_used=time.monotonic())
+
+    def _discard(self, connection: _PooledConnection) -> None:
+        connection.smtp.close()
+
+    async def _checkout(self) -> _PooledConnection:
+        while self._idle:
+            connection = self._idle.pop()
+            idle_for = time.monotonic() - connection.last_used
+            if (
+                not connection.smtp.is_connected
+                or idle_for > self.settings.idle_timeout
+            ):
+                self._discard(connection)
+                continue
+            if idle_for > self.settings.health_check_interval:
+                try:
+                    _ = await connection.smtp.noop()
+                except (SMTPException, OSError):
+                    self._discard(connection)
+                    continue
+            return connection
+        return await self._connect()
+
+    def _release(self, connection: _PooledConnection) -> None:
+        connection.last_used = time.monotonic()
+        self._idle.append(connection)
+
+    async def send_message(self, message: EmailMessage) -> None:
+        error = (await self.send_batch([message]))[0]
+        if error is not None:
+            raise error
+
+    async def send_batch(
+        self, messages: list[EmailMessage]
+    ) -> list[BaseException | None]:
+        """Send messages back-to-back over one session.
+
+        Returns one entry per message: None if it was accepted, otherwise
+        the error for that message alone. A rejection by the server (bad
+        recipient, ...) leaves the session usable for the rest of the batch.
+        """
+        if self.throttle is not None:
+            await self.throttle.acquire(len(messages))
+        results: list[BaseException | None] = []
+        async with self._slots:
+            connection: _PooledConnection | None = None
+            for message in messages:
+                for attempt in range(2):
+                    try:
+                        if connection is None:
+                            connection = await self._checkout()
+                        _ = await connection.smtp.send_message(message)
+                        results.append(None)
+                    except (SMTPResponseException, SMTPRecipientsRefused) as e:
+                        results.append(e)
+                    except SMTPServerDisconnected as e:
+                        if connection is not None:
+                            self._discard(connection)
+                            connection = None
+                        if attempt == 0:
+                            main_logger.warning("SMTP connection dropped, reconnecting")
+                            continue
+                        results.append(e)
+                    except (SMTPException, OSError) as e:
+                        if connection is not None:
+                            self._discard(connection)
+                            connection = None
+                        results.append(e)
+                    except BaseException:
+                        if connection is not None:
+                            self._discard(connection)
+                        raise
+                    break
+            if connection is not None:
+                self._release(connection)
+        return results
+
+    async def close(self) -> None:
+        while self._idle:
+            connection = self._idle.pop()
+            try:
+                _ = await connection.smtp.quit()
+            except (SMTPException, OSError):
+                self._discard(connection)
+
+
+class SMTPBatchSender:
+    """Coalesces concurrent sends into batches over pooled SMTP sessions.
+
+    Each caller awaits the outcome of its own message, so a task still
+    succeeds or retries on its own. Messages never wait while a session is
+    free: whatever is queued is spread over the free sessions at once, so a
+    lone message (a solo worker, a quiet period) goes straight out. Only
+    while all `max_sessions` are busy do messages accumulate, until a
+    session frees up, `max_batch` are waiting or `max_wait_ms` has passed.
+    """
+
+    def __init__(
+        self,
+        pool: SMTPConnectionPool,
+        max_batch: int = 50,
+        max_wait_ms: int = 20,
+        max_sessions: int = 4,
+    ) -> None:
+        self.pool: SMTPConnectionPool = pool
+        self.max_batch: int = max_batch
+        self.max_wait: float = max_wait_ms / 1000
+        self.max_sessions: int = max_sessions
+        self._pending: list[tuple[EmailMessage, asyncio.Future[None]]] = []
+        # Set when a batch fills up or a session frees up
+        self._wake: asyncio.Event = asyncio.Event()
+        self._flusher: asyncio.Task[None] | None = None
+        self._sends: set[asyncio.Task[None]] = set()
+
+    async def send_message(self, message: EmailMessage) -> None:
+        if self.max_batch <= 1:
+            return await self.pool.send_message(message)
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._pending.append((message, future))
+        if len(self._pending) >= self.max_batch:
+            self._wake.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+        await future
+
+    def _sent(self, send: asyncio.Task[None]) -> None:
+        self._sends.discard(send)
+        self._wake.set()
+
+    async def _flush(self) -> None:
+        while self._pending:
+            free = self.max_sessions - len(self._sends)
+            if free <= 0 and len(self._pending) < self.max_batch:
+                self._wake.clear()
+                try:
+                    _ = await asyncio.wait_for(self._wake.wait(), timeout=self.max_wait)
+                except TimeoutError:
+                    pass
+                free = self.max_sessions - len(self._sends)
+            # Spread the queue over the free sessions rather than lining it
+            # all up behind one of them.
+            size = min(self.max_batch, -(-len(self._pending) // max(1, free)))
+            batch = self._pending[:size]
+            del self._pending[:size]
+            send = asyncio.create_task(self._send(batch))
+            self._sends.add(send)
+            send.add_done_callback(self._sent)
+
+    async def _send(self, batch: list[tuple[EmailMessage, asyncio.Future[None]]]) -> None:
+        try:
+            results = await self.pool.send_batch([message for message, _ in batch])
+        except BaseException as e:
+            results = [e] * len(batch)
+        for (_, future), error in zip(batch, results):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
@@ -0,0 +1,99 @@
+import asyncio
+import math
+import time
+from typing import cast
+
+from redis.exceptions import RedisError
+
+from src.core.metrics import SMTP_THROTTLE_WAIT
+from src.core.redis import get_or_create_redis
+from src.utils.logging import main_logger
+
+# Token bucket refilled continuously at ARGV[1] tokens/s up to ARGV[2].
+# Takes ARGV[4] tokens all at once or none.
+#   KEYS[1] = bucket hash
+#   ARGV    = rate, burst, now_ms, wanted
+#   returns {granted, wait_ms}
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local wanted = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate / 1000)
+local granted = 0
+local wait = 0
+if tokens >= wanted then
+    tokens = tokens - wanted
+    granted = 1
+else
+    wait = math.ceil((wanted - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+return {granted, wait}
+"""
+
+
+class SMTPThrottle:
+    """Token bucket keeping every worker together under the relay's rate cap.
+
+    The bucket lives in Redis, so all email workers draw from the same
+    budget. A worker that finds it empty sleeps for exactly as long as the
+    refill takes instead of sending, being rejected and retrying. Without
+    Redis each process enforces the limit on its own.
+    """
+
+    def __init__(
+        self, rate: float, burst: int, key: str = "auth_api:smtp_throttle"
+    ) -> None:
+        self.rate: float = rate
+        self.burst: int = burst
+        self.key: str = key
+        self._tokens: float = float(burst)
+        self._updated: float = time.monotonic()
+
+    def _take_local(self, wanted: int) -> int:
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        if self._tokens >= wanted:
+            self._tokens -= wanted
+            return 0
+        return math.ceil((wanted - self._tokens) * 1000 / self.rate)
+
+    async def _take(self, wanted: int) -> int:
+        redis = get_or_create_redis()
+        if redis is not None:
+            try:
+                granted, wait_ms = cast(
+                    list[int],
+                    await redis.eval(  # pyright: ignore[reportUnknownMemberType, reportGeneralTypeIssues]
+                        TOKEN_BUCKET_LUA,
+                        1,
+                        self.key,
+                        self.rate,
+                        self.burst,
+                        int(time.time() * 1000),
+                        wanted,
+                    ),
+                )
+                return 0 if int(granted) else max(1, int(wait_ms))
+            except RedisError as e:
+                main_logger.warning(f"SMTP throttle falling back to local state: {e}")
+        return self._take_local(wanted)
+
+    async def acquire(self, count: int = 1) -> None:
+        """Wait until `count` messages may be sent."""
+        while count > 0:
+            wanted = min(count, self.burst)
+            wait_ms = await self._take(wanted)
+            if wait_ms == 0:
+                count -= wanted
+                continue
+            SMTP_THROTTLE_WAIT.inc(wait_ms / 1000)
+            await asyncio.sleep(wait_ms / 1000)
@@ -0,0 +1,83 @@
+import secrets
+import threading
+import time
+from typing import ClassVar
+
+from redis.exceptions import RedisError
+
+from src.config import config
+from src.core.metrics import EMAIL_COALESCE_CLAIMED, EMAIL_COALESCE_SUPPRESSED
+from src.core.redis import get_or_create_redis
+from src.utils.logging import main_logger
+from src.utils.ttl_cache import TTLCache
+
+
+class EmailCoalescer:
+    """Keeps only the latest queued email per (email type, recipient).
+
+    Every request claims a fresh token under its recipient key and passes it
+    to the task. When the task runs it checks the key: if a newer request
+    has replaced the token within `window` seconds, the task is a no-op, so
+    a user hammering "resend" gets one email (with the newest link) instead
+    of one per click. Once the key expires, tasks are always delivered.
+    Without Redis the tokens are kept in process.
+    """
+
+    max_local_keys: ClassVar[int] = 10_000
+
+    def __init__(self, window: int, prefix: str = "auth_api:email_coalesce") -> None:
+        self.window: int = window
+        self.prefix: str = prefix
+        # Without Redis: latest token per key. Claims (API loop) and checks
+        # (task threads) can run concurrently in process, hence the lock.
+        self._local: TTLCache[str, str] = TTLCache(self.max_local_keys)
+        self._local_lock: threading.Lock = threading.Lock()
+
+    def _key(self, email_type: str, recipient: str) -> str:
+        return f"{self.prefix}:{email_type}:{recipient.strip().lower()}"
+
+
+    async def claim(self, email_type: str, recipient: str) -> str | None:
+        """Register a new request and return the token its task must carry."""
+        if self.window <= 0:
+            return None
+        key = self._key(email_type, recipient)
+        token = secrets.token_hex(8)
+        EMAIL_COALESCE_CLAIMED.labels(email_type).inc()
+        redis = get_or_create_redis()
+        if redis is not None:
+            try:
+                _ = await redis.set(key, token, ex=self.window)
+                return token
+            except RedisError as e:
+                main_logger.warning(f"Email coalescer falling back to local state: {e}")
+        with self._local_lock:
+            self._local.set(key, token, time.monotonic() + self.window)
+        return token
+
+    async def is_latest(self, email_type: str, recipient: str, token: str | None) -> bool:
+        """True unless a newer request for the same recipient replaced `token`."""
+        if token is None:
+            return True
+        key = self._key(email_type, recipient)
+        current: str | None = None
+        redis = get_or_create_redis()
+        if redis is not None:
+            try:
+                current = await redis.get(key)
+            except RedisError as e:
+                main_logger.warning(f"Email coalescer falling back to local state: {e}")
+                redis = None
+        if redis is None:
+            with self._local_lock:
+                current = self._local.get(key, time.monotonic())
+        if current is None or current == token:
+            return True
+        EMAIL_COALESCE_SUPPRESSED.labels(email_type).inc()
+        main_logger.info(f"Skipping superseded {email_type} for {recipient}")
+        return False
+
+
+email_coalescer: EmailCoalescer = EmailCoalescer(
+    window=config.env.smtp_server.coalesce_window
+)
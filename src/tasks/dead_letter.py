@@ -0,0 +1,183 @@
+import argparse
+import asyncio
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import ScalarResult
+from sqlmodel import col, select
+
+from src.core.db import AsyncSessionLocal
+from src.core.metrics import DEAD_LETTER_RECORDED, DEAD_LETTER_REPLAYED
+from src.entities.dead_letter_entity import DeadLetterTaskModel
+from src.tasks.utils import email_task, publish_now
+from src.utils.logging import app_logger, main_logger
+
+
+class DeadLetterStore:
+    """Keeps permanently failed email tasks in `dead_letter_task` and replays them.
+
+    Workers record a task with its original keyword arguments once Celery
+    gives up on it. After an outage the rows are replayed in batches, at a
+    bounded rate so the recovered backlog cannot trip the SMTP relay's
+    limits again.
+    """
+
+    async def record(
+        self,
+        task_name: str,
+        task_id: str,
+        payload: dict[str, Any],  # pyright: ignore[reportExplicitAny]
+        error: str,
+        retries: int = 0,
+        request_id: str | None = None,
+    ) -> None:
+        DEAD_LETTER_RECORDED.labels(task_name).inc()
+        try:
+            async with AsyncSessionLocal() as session:
+                session.add(
+                    DeadLetterTaskModel(
+                        task_name=task_name,
+                        task_id=task_id,
+                        request_id=request_id,
+                        payload=payload,
+                        error=error,
+                        retries=retries,
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            # Last resort: the arguments are at least in the log.
+            main_logger.bind(task=task_name, task_id=task_id, payload=payload).error(
+                f"Failed to dead-letter task: {e}"
+            )
+            raise
+
+    async def replay(
+        self,
+        task_name: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        error_contains: str | None = None,
+        rate: float = 50.0,
+        batch_size: int = 100,
+        limit: int | None = None,
+        dry_run: bool = False,
+    ) -> int:
+        """Re-publish matching, not yet replayed tasks; returns how many.
+
+        Batches are claimed with `FOR UPDATE SKIP LOCKED`, so two replays
+        never publish the same row, and paced to `rate` tasks per second.
+        Only rows the broker accepted are marked replayed; the replay stops
+        at the first publish error and the rest stay queued for the next run.
+        """
+        replayed = 0
+        while limit is None or replayed < limit:
+            size = batch_size if limit is None else min(batch_size, limit - replayed)
+            async with AsyncSessionLocal() as session:
+                statement = select(DeadLetterTaskModel).where(
+                    col(DeadLetterTaskModel.replayed_at).is_(None)
+                )
+                if task_name:
+                    statement = statement.where(DeadLetterTaskModel.task_name == task_name)
+                if since:
+                    statement = statement.where(col(DeadLetterTaskModel.failed_at) >= since)
+                if until:
+                    statement = statement.where(col(DeadLetterTaskModel.failed_at) < until)
+                if error_contains:
+                    statement = statement.where(
+                        col(DeadLetterTaskModel.error).contains(error_contains)
+                    )
+                statement = statement.order_by(col(DeadLetterTaskModel.id)).limit(size)
+                if dry_run:
+                    statement = statement.offset(replayed)
+                else:
+                    statement = statement.with_for_update(skip_locked=True)
+                result: ScalarResult[DeadLetterTaskModel] = await session.exec(statement)
+                rows = list(result.all())
+                if not rows:
+                    break
+                if dry_run:
+                    for row in rows:
+                        main_logger.info(
+                            f"[dry run] {row.id} {row.task_name} failed_at={row.failed_at}: {row.error}"
+                        )
+                else:
+                    published = await asyncio.to_thread(self._publish, rows)
+                    now = datetime.now(timezone.utc)
+                    for row in published:
+                        row.replayed_at = now
+                        DEAD_LETTER_REPLAYED.labels(row.task_name).inc()
+                    session.add_all(published)
+                    await session.commit()
+                    if len(published) < len(rows):
+                        replayed += len(published)
+                        main_logger.error(
+                            f"Replay stopped after {replayed} tasks: broker unavailable"
+                        )
+                        break
+            replayed += len(rows)
+            main_logger.info(f"Replayed {replayed} dead-lettered tasks")
+            if len(rows) < size:
+                break
+            if not dry_run and rate > 0:
+                await asyncio.sleep(len(rows) / rate)
+        return replayed
+
+    def _publish(self, rows: list[DeadLetterTaskModel]) -> list[DeadLetterTaskModel]:
+        """Re-publish in order until the first error; returns the rows that made it."""
+        published: list[DeadLetterTaskModel] = []
+        for row in rows:
+            try:
+                publish_now(
+                    email_task(row.task_name, **row.payload),  # pyright: ignore[reportAny]
+                    email_task("log_task_success"),
+                    request_id=row.request_id,
+                )
+            except Exception as e:
+                main_logger.error(f"Could not replay dead letter {row.id}: {e}")
+                break
+            published.append(row)
+        return published
+
+
+dead_letters: DeadLetterStore = DeadLetterStore()
+
+
+def _parse_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tasks.dead_letter",
+        description="Replay dead-lettered email tasks in rate-limited batches.",
+    )
+    _ = parser.add_argument("--task", help="only this task, e.g. send_activate_email")
+    _ = parser.add_argument("--since", type=_parse_time, help="failed at or after (ISO 8601)")
+    _ = parser.add_argument("--until", type=_parse_time, help="failed before (ISO 8601)")
+    _ = parser.add_argument("--error", help="error message contains this text")
+    _ = parser.add_argument("--rate", type=float, default=50.0, help="tasks per second")
+    _ = parser.add_argument("--batch-size", type=int, default=100)
+    _ = parser.add_argument("--limit", type=int, default=None)
+    _ = parser.add_argument("--dry-run", action="store_true", help="list, do not publish")
+    args = parser.parse_args()
+
+    _ = app_logger()
+    count = asyncio.run(
+        dead_letters.replay(
+            task_name=args.task,  # pyright: ignore[reportAny]
+            since=args.since,  # pyright: ignore[reportAny]
+            until=args.until,  # pyright: ignore[reportAny]
+            error_contains=args.error,  # pyright: ignore[reportAny]
+            rate=args.rate,  # pyright: ignore[reportAny]
+            batch_size=args.batch_size,  # pyright: ignore[reportAny]
+            limit=args.limit,  # pyright: ignore[reportAny]
+            dry_run=args.dry_run,  # pyright: ignore[reportAny]
+        )
+    )
+    print(f"{'Matched' if args.dry_run else 'Replayed'} {count} tasks")
+
+
+if __name__ == "__main__":
+    main()
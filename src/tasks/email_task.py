@@ -1,16 +1,119 @@
-from typing import cast
+import time
+from typing import Any, cast
 
-from asgiref.sync import async_to_sync
 from celery import \
     shared_task  # pyright: ignore[reportUnknownVariableType, reportMissingTypeStubs]
+from celery.signals import (  # pyright: ignore[reportMissingTypeStubs]
+    task_failure, task_postrun, task_prerun, worker_init,
+    worker_process_shutdown, worker_shutdown)
 from pydantic import NameEmail
 
-from src.core.celery_app import celery_app
+from src.core.celery_app import EMAIL_LANES, celery_app
+from src.core.metrics import EMAIL_QUEUE_LATENCY
+from src.core.redis import close_loop_redis
+from src.core.tracing import (ENQUEUED_AT_HEADER, REQUEST_ID_HEADER,
+                              TaskTrace, run_traced)
 from src.services.email_service import (EmailServiceTransientError,
                                         email_service)
+from src.tasks.coalesce import email_coalescer
+from src.tasks.dead_letter import dead_letters
+from src.tasks.loop import worker_loop
+from src.tasks.outbox import PUBLISHED_AT_HEADER
 from src.utils.logging import main_logger
 
 
+@worker_init.connect  # pyright: ignore[reportUnknownMemberType]
+def precompile_email_templates(**_kwargs):  # pyright: ignore[reportMissingParameterType, reportUnknownParameterType]
+    """Compile templates in the parent so pool children inherit them."""
+    count = email_service.precompile_templates()
+    main_logger.info(f"Precompiled {count} email templates")
+
+
+@worker_shutdown.connect  # pyright: ignore[reportUnknownMemberType]
+@worker_process_shutdown.connect  # pyright: ignore[reportUnknownMemberType]
+def close_email_connections(**_kwargs):  # pyright: ignore[reportMissingParameterType, reportUnknownParameterType]
+    """Quit pooled SMTP sessions, close the loop's Redis client and stop the
+    worker loop."""
+    if not worker_loop.running:
+        return
+    try:
+        worker_loop.run(email_service.close(), timeout=10)
+        worker_loop.run(close_loop_redis(), timeout=5)
+    finally:
+        worker_loop.stop()
+
+
+def _header(request: Any, name: str) -> Any:  # pyright: ignore[reportExplicitAny, reportAny]
+    # Custom headers show up on the request context or under `headers`,
+    # depending on the Celery message protocol.
+    value = getattr(request, name, None)  # pyright: ignore[reportAny]
+    if value is None:
+        value = (request.headers or {}).get(name)  # pyright: ignore[reportAny]
+    return value  # pyright: ignore[reportAny]
+
+
+# Traces of the email tasks currently running in this process, by task id
+_traces: dict[str, TaskTrace] = {}
+
+
+@task_prerun.connect  # pyright: ignore[reportUnknownMemberType]
+def start_task_trace(task_id: str = "", task: Any = None, **_kwargs):  # pyright: ignore[reportExplicitAny, reportAny, reportMissingParameterType, reportUnknownParameterType]
+    """Record lane latency and open the trace of an email send."""
+    request = task.request  # pyright: ignore[reportAny]
+    published_at = _header(request, PUBLISHED_AT_HEADER)  # pyright: ignore[reportAny]
+    if published_at is not None and not request.retries:  # pyright: ignore[reportAny]
+        queue: str = (request.delivery_info or {}).get("routing_key", "unknown")  # pyright: ignore[reportAny]
+        EMAIL_QUEUE_LATENCY.labels(queue).observe(max(0.0, time.time() - float(published_at)))  # pyright: ignore[reportAny]
+
+    name: str = task.name.rsplit(".", 1)[-1]  # pyright: ignore[reportAny]
+    if name not in EMAIL_LANES:
+        return
+    enqueued_at = _header(request, ENQUEUED_AT_HEADER)  # pyright: ignore[reportAny]
+    _traces[task_id] = TaskTrace(
+        task_name=name,
+        task_id=task_id,
+        req_id=_header(request, REQUEST_ID_HEADER),
+        enqueued_at=float(enqueued_at) if enqueued_at is not None else None,  # pyright: ignore[reportAny]
+        retries=request.retries or 0,  # pyright: ignore[reportAny]
+    )
+
+
+@task_postrun.connect  # pyright: ignore[reportUnknownMemberType]
+def finish_task_trace(task_id: str = "", state: str | None = None, **_kwargs):  # pyright: ignore[reportMissingParameterType, reportUnknownParameterType]
+    trace = _traces.pop(task_id, None)
+    if trace is not None:
+        trace.finish(state or "UNKNOWN")
+
+
+@task_failure.connect  # pyright: ignore[reportUnknownMemberType]
+def dead_letter_email_task(  # pyright: ignore[reportUnknownParameterType]
+    sender: Any = None,  # pyright: ignore[reportExplicitAny, reportAny]
+    task_id: str = "",
+    exception: BaseException | None = None,
+    kwargs: dict[str, Any] | None = None,  # pyright: ignore[reportExplicitAny]
+    **_kwargs,  # pyright: ignore[reportMissingParameterType, reportUnknownParameterType]
+):
+    """Keep an email task that will not be retried again, with its arguments."""
+    name: str = sender.name.rsplit(".", 1)[-1]  # pyright: ignore[reportAny]
+    if name not in EMAIL_LANES:
+        return
+    request = sender.request  # pyright: ignore[reportAny]
+    try:
+        worker_loop.run(
+            dead_letters.record(
+                task_name=name,
+                task_id=task_id,
+                payload=kwargs or {},
+                error=repr(exception),
+                retries=request.retries or 0,  # pyright: ignore[reportAny]
+                request_id=_header(request, REQUEST_ID_HEADER),
+            ),
+            timeout=10,
+        )
+    except Exception as e:
+        main_logger.error(f"Dead-lettering {name} {task_id} failed: {e}")
+
+
 @shared_task
 def log_task_success(result: dict[str, str]):
     """Logs the successful completion of a linked task."""
@@ -47,7 +150,12 @@ def send_welcome_email(
         name=to_email.get("name", ""), email=to_email.get("email", "")
     )
     try:
-        async_to_sync(email_service.send_welcome_email)(to_email=name_email)
+        worker_loop.run(
+            run_traced(
+                _traces.get(self.request.id),  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+                email_service.send_welcome_email(to_email=name_email),
+            )
+        )
         return {"type": "welcome", "email": name_email.email}
     except EmailServiceTransientError:
         main_logger.error(
@@ -75,13 +183,25 @@ def send_password_reset_email(
     self,  # pyright: ignore[reportUnknownParameterType, reportMissingParameterType, reportUnusedParameter]
     to_email: dict[str, str],
     reset_link: str,
+    coalesce_token: str | None = None,
 ):
     name_email = NameEmail(
         name=to_email.get("name", ""), email=to_email.get("email", "")
     )
+    if not worker_loop.run(
+        email_coalescer.is_latest(
+            "send_password_reset_email", name_email.email, coalesce_token
+        )
+    ):
+        return {"type": "password_reset", "email": name_email.email, "suppressed": True}
     try:
-        async_to_sync(email_service.send_password_reset_email)(
-            to_email=name_email, reset_link=reset_link
+        worker_loop.run(
+            run_traced(
+                _traces.get(self.request.id),  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+                email_service.send_password_reset_email(
+                    to_email=name_email, reset_link=reset_link
+                ),
+            )
         )
         return {"type": "password_reset", "email": name_email.email}
     except EmailServiceTransientError:
@@ -110,11 +230,22 @@ def send_activate_email(
     self,  # pyright: ignore[reportUnknownParameterType, reportMissingParameterType, reportUnusedParameter]
     activate_user_response: dict[str, str | dict[str, str]],
     activation_link: str,
+    coalesce_token: str | None = None,
 ):
+    recipient = cast(str, activate_user_response.get("email", ""))
+    if not worker_loop.run(
+        email_coalescer.is_latest("send_activate_email", recipient, coalesce_token)
+    ):
+        return {"type": "activation", "email": recipient, "suppressed": True}
     try:
-        async_to_sync(email_service.send_activate_email)(
-            activate_user_response=activate_user_response,
-            activation_link=activation_link,
+        worker_loop.run(
+            run_traced(
+                _traces.get(self.request.id),  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+                email_service.send_activate_email(
+                    activate_user_response=activate_user_response,
+                    activation_link=activation_link,
+                ),
+            )
         )
         return {"type": "activation", "email": activate_user_response.get("email")}
     except EmailServiceTransientError:
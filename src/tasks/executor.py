@@ -0,0 +1,271 @@
+import asyncio
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.config import config
+from src.core.metrics import INPROCESS_TASKS_DROPPED
+from src.utils.logging import main_logger
+
+EMAIL_TASK_MODULE = "src.tasks.email_task"
+
+
+@dataclass(frozen=True)
+class TaskCall:
+    """A task in `src.tasks.email_task`, referenced by name, with its kwargs."""
+
+    name: str
+    kwargs: dict[str, Any] = field(default_factory=dict)  # pyright: ignore[reportExplicitAny]
+
+
+class TaskExecutor(ABC):
+    """Runs chains of email tasks: each task's result is passed to the next."""
+
+    def start(self) -> None:
+        return None
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Finish or hand off queued work, waiting at most `timeout` seconds."""
+        return None
+
+    @abstractmethod
+    def submit(
+        self, calls: list[TaskCall], headers: dict[str, Any]  # pyright: ignore[reportExplicitAny]
+    ) -> bool:
+        """Queue a chain without blocking the caller; False if it was dropped."""
+        pass
+
+    @abstractmethod
+    def publish(
+        self, calls: list[TaskCall], headers: dict[str, Any]  # pyright: ignore[reportExplicitAny]
+    ) -> None:
+        """Hand a chain off right now, blocking; raises if that failed.
+
+        For callers that must know the chain left the process before they
+        mark it done (the outbox relay, dead-letter replay).
+        """
+        pass
+
+
+class CeleryExecutor(TaskExecutor):
+    """Publishes chains to the broker through the task outbox."""
+
+    def start(self) -> None:
+        from src.tasks.outbox import task_outbox
+
+        task_outbox.start()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        from src.tasks.outbox import task_outbox
+
+        await task_outbox.stop(timeout=timeout)
+
+    def _workflow(
+        self, calls: list[TaskCall], headers: dict[str, Any]  # pyright: ignore[reportExplicitAny]
+    ) -> Any:  # pyright: ignore[reportExplicitAny]
+        from celery import chain  # pyright: ignore[reportMissingTypeStubs]
+
+        from src.core.celery_app import EMAIL_LANES, celery_app
+
+        # Callbacks (log_task_success/failure) have no route of their own:
+        # they follow the chain's email task onto its lane, the only queue
+        # the lane workers consume.
+        lane = next(
+            (EMAIL_LANES[call.name] for call in calls if call.name in EMAIL_LANES),
+            None,
+        )
+
+        def signature(call: TaskCall):  # pyright: ignore[reportUnknownParameterType]
+            options = (
+                {"queue": lane} if lane is not None and call.name not in EMAIL_LANES else {}
+            )
+            return celery_app.signature(  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+                f"{EMAIL_TASK_MODULE}.{call.name}", kwargs=call.kwargs, **options
+            )
+
+        workflow = chain(*(signature(call) for call in calls))  # pyright: ignore[reportUnknownArgumentType]
+        workflow.link_error(  # pyright: ignore[reportUnknownMemberType]
+            signature(TaskCall("log_task_failure"))
+        )
+        _ = workflow.set(headers=headers)  # pyright: ignore[reportUnknownMemberType]
+        return workflow
+
+    def submit(
+        self, calls: list[TaskCall], headers: dict[str, Any]  # pyright: ignore[reportExplicitAny]
+    ) -> bool:
+        from src.tasks.outbox import task_outbox
+
+        return task_outbox.enqueue(self._workflow(calls, headers))
+
+    def publish(
+        self, calls: list[TaskCall], headers: dict[str, Any]  # pyright: ignore[reportExplicitAny]
+    ) -> None:
+        from src.tasks.outbox import PUBLISHED_AT_HEADER
+
+        # Straight to the broker, not through the outbox queue, so errors
+        # reach the caller.
+        _ = self._workflow(calls, headers).apply_async(  # pyright: ignore[reportAny]
+            headers={**headers, PUBLISHED_AT_HEADER: time.time()}
+        )
+
+
+class InProcessExecutor(TaskExecutor):
+    """Runs the email task functions inside this process; no broker needed.
+
+    Used for tests, benchmarks and single-node setups. Up to
+    `max_concurrency` chains run at once in worker threads (the task
+    functions are synchronous and drive the shared worker loop); at most
+    `maxsize` chains may be in flight, beyond that new ones are dropped.
+    Nothing is persisted: work still queued when `stop` times out is lost.
+    The outbox relay runs alongside, so emails written to `outbox_message`
+    are sent too.
+
+    Each task runs once: there are no Celery retries. A failing task (an
+    SMTP error, an unknown task name) ends its chain and is stored in
+    `dead_letter_task` for replay, so the outbox relay still marks its row
+    handed off and moves on instead of retrying it forever.
+    """
+
+    def __init__(self, max_concurrency: int = 8, maxsize: int = 1_000) -> None:
+        self.max_concurrency: int = max_concurrency
+        self.maxsize: int = maxsize
+        self._slots: asyncio.Semaphore | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._relay: asyncio.Task[None] | None = None
+        # The API loop, which owns the database engine used for dead letters
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def start(self) -> None:
+        from src.tasks.outbox_relay import OutboxRelay
+
+        self._loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        if self._relay is None or self._relay.done():
+            self._relay = asyncio.create_task(OutboxRelay().run())
+
+    def _run_chain(
+        self, calls: list[TaskCall], headers: dict[str, Any]  # pyright: ignore[reportExplicitAny]
+    ) -> None:
+        """Run a chain in this (non-loop) thread; never raises."""
+        from src.tasks import email_task
+
+        result: Any = None  # pyright: ignore[reportExplicitAny]
+        for index, call in enumerate(calls):
+            args = () if index == 0 else (result,)
+            try:
+                task = getattr(email_task, call.name)  # pyright: ignore[reportAny]
+                result = task(*args, **call.kwargs)  # pyright: ignore[reportAny]
+            except Exception as e:
+                main_logger.error(f"❌ In-process task {call.name} failed: {e}")
+                self._dead_letter(call, e, headers)
+                return
+
+    def _dead_letter(
+        self, call: TaskCall, error: Exception, headers: dict[str, Any]  # pyright: ignore[reportExplicitAny]
+    ) -> None:
+        from src.core.tracing import REQUEST_ID_HEADER
+        from src.tasks.dead_letter import dead_letters
+
+        if self._loop is None or self._loop.is_closed():
+            # Not started (CLI): no loop owns the database engine here.
+            main_logger.bind(task=call.name, payload=call.kwargs).error(
+                "In-process task failed outside the API, not dead-lettered"
+            )
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(
+                dead_letters.record(
+                    task_name=call.name,
+                    task_id=str(uuid.uuid4()),
+                    payload=call.kwargs,
+                    error=repr(error),
+                    request_id=headers.get(REQUEST_ID_HEADER),
+                ),
+                self._loop,
+            ).result(timeout=10)
+        except Exception as e:
+            main_logger.error(f"Dead-lettering {call.name} failed: {e}")
+
+    async def _run(
+        self, calls: list[TaskCall], headers: dict[str, Any]  # pyright: ignore[reportExplicitAny]
+    ) -> None:
+        assert self._slots is not None
+        async with self._slots:
+            await asyncio.to_thread(self._run_chain, calls, headers)
+
+    def submit(
+        self, calls: list[TaskCall], headers: dict[str, Any]  # pyright: ignore[reportExplicitAny]
+    ) -> bool:
+        try:
+            _ = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (CLI, relay thread): run the chain right here.
+            self._run_chain(calls, headers)
+            return True
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        if len(self._tasks) >= self.maxsize:
+            INPROCESS_TASKS_DROPPED.inc()
+            main_logger.warning(
+                "In-process executor full, dropping task "
+                + " -> ".join(call.name for call in calls)
+            )
+            return False
+        task = asyncio.create_task(self._run(calls, headers))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    def publish(
+        self, calls: list[TaskCall], headers: dict[str, Any]  # pyright: ignore[reportExplicitAny]
+    ) -> None:
+        # Nothing to hand off to: running the chain is the publish. A failed
+        # task is dead-lettered rather than raised, so the caller (the outbox
+        # relay) marks it handed off instead of retrying it forever.
+        self._run_chain(calls, headers)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        if self._relay is not None:
+            _ = self._relay.cancel()
+            try:
+                await self._relay
+            except asyncio.CancelledError:
+                pass
+            self._relay = None
+        if self._tasks:
+            _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+            if pending:
+                main_logger.error(
+                    f"In-process executor stopped with {len(pending)} unfinished tasks"
+                )
+                for task in pending:
+                    _ = task.cancel()
+
+        from src.tasks.loop import worker_loop
+
+        if worker_loop.running:
+            from src.core.redis import close_loop_redis
+            from src.services.email_service import email_service
+
+            try:
+                await asyncio.to_thread(worker_loop.run, email_service.close(), 10)
+                await asyncio.to_thread(worker_loop.run, close_loop_redis(), 5)
+            finally:
+                worker_loop.stop()
+
+
+def build_executor() -> TaskExecutor:
+    mode = config.env.task_executor
+    if mode == "auto":
+        mode = "celery" if config.env.celery_broker_url else "inprocess"
+    if mode == "inprocess":
+        return InProcessExecutor(
+            max_concurrency=config.env.celery_worker.concurrency,
+            maxsize=config.env.outbox.maxsize,
+        )
+    return CeleryExecutor()
+
+
+task_executor: TaskExecutor = build_executor()
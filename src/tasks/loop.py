@@ -0,0 +1,65 @@
+import asyncio
+import os
+import threading
+from collections.abc import Coroutine
+from typing import Any
+
+
+class WorkerEventLoop:
+    """A single event loop per worker process, running in a daemon thread.
+
+    `async_to_sync` builds a fresh loop for every call, which makes it
+    impossible to keep connections (e.g. the SMTP pool) open between tasks.
+    Tasks submit their coroutines here instead. The loop is created on first
+    use, so forked pool children each start their own.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=loop.run_forever, name="worker-event-loop", daemon=True
+                )
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def run[T](
+        self,
+        coro: Coroutine[Any, Any, T],  # pyright: ignore[reportExplicitAny]
+        timeout: float | None = None,
+    ) -> T:
+        """Run `coro` on the worker loop and block until it completes."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        return future.result(timeout=timeout)
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._loop is None:
+                return
+            _ = self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._thread is not None:
+                self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+    def _reset_after_fork(self) -> None:
+        # The loop thread does not survive fork(); the child starts afresh.
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+
+worker_loop: WorkerEventLoop = WorkerEventLoop()
+os.register_at_fork(after_in_child=worker_loop._reset_after_fork)  # pyright: ignore[reportPrivateUsage]
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Literal
+
+from src.config import config
+from src.core.metrics import (OUTBOX_DEPTH, OUTBOX_DROPPED, OUTBOX_ENQUEUED,
+                              OUTBOX_FAILED, OUTBOX_PUBLISHED)
+from src.utils.logging import main_logger
+
+# Publish time (epoch seconds) used by workers to measure broker latency
+PUBLISHED_AT_HEADER = "published_at"
+
+type OVERFLOW_POLICY = Literal["drop_new", "drop_oldest", "publish_inline"]
+
+
+def task_names(workflow: Any) -> str:  # pyright: ignore[reportExplicitAny, reportAny]
+    """Task names in a signature or chain, for logs (never the arguments)."""
+    steps = getattr(workflow, "tasks", None) or [workflow]  # pyright: ignore[reportAny]
+    return " -> ".join(str(step.get("task")) for step in steps)  # pyright: ignore[reportAny]
+
+
+class TaskOutbox:
+    """In-process buffer between request handlers and the Celery broker.
+
+    Handlers enqueue task workflows without waiting on the broker. A
+    background publisher drains the queue in batches and publishes each
+    batch from one dedicated thread over a single pooled producer
+    connection, so a slow or reconnecting broker never blocks the event
+    loop. When the queue is full, `overflow` decides whether the new
+    workflow is published inline (the default: it blocks the caller on the
+    broker, but no email is lost), or whether the new or the oldest one is
+    dropped. Every drop is logged as a warning naming the task.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        batch_size: int = 100,
+        overflow: OVERFLOW_POLICY = "publish_inline",
+    ) -> None:
+        self.maxsize: int = maxsize
+        self.batch_size: int = batch_size
+        self.overflow: OVERFLOW_POLICY = overflow
+        self._queue: asyncio.Queue[Any] | None = None  # pyright: ignore[reportExplicitAny]
+        self._publisher: asyncio.Task[None] | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._publisher is not None and not self._publisher.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="outbox-publisher"
+        )
+        self._publisher = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Publish whatever is still queued, then stop the publisher."""
+        if self._publisher is None or self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except TimeoutError:
+            main_logger.error(
+                f"Task outbox stopped with {self._queue.qsize()} unpublished tasks"
+            )
+        _ = self._publisher.cancel()
+        try:
+            await self._publisher
+        except asyncio.CancelledError:
+            pass
+        self._publisher = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def enqueue(self, workflow: Any) -> bool:  # pyright: ignore[reportExplicitAny, reportAny]
+        """Queue a Celery workflow for publishing; never waits on the broker.
+
+        Returns:
+            bool: False if the workflow was dropped.
+        """
+        if self._queue is None or not self.running:
+            self._publish([workflow])
+            return True
+        try:
+            self._queue.put_nowait(workflow)
+        except asyncio.QueueFull:
+            if self.overflow == "drop_new":
+                OUTBOX_DROPPED.inc()
+                main_logger.warning(
+                    f"Task outbox full, dropping new task {task_names(workflow)}"
+                )
+                return False
+            if self.overflow == "publish_inline":
+                self._publish([workflow])
+                return True
+            oldest = self._queue.get_nowait()  # pyright: ignore[reportAny]
+            self._queue.task_done()
+            OUTBOX_DROPPED.inc()
+            main_logger.warning(
+                f"Task outbox full, dropping oldest task {task_names(oldest)}"
+            )
+            self._queue.put_nowait(workflow)
+        OUTBOX_ENQUEUED.inc()
+        OUTBOX_DEPTH.set(self._queue.qsize())
+        return True
+
+    def _publish(self, batch: list[Any]) -> None:  # pyright: ignore[reportExplicitAny]
+        from src.core.celery_app import celery_app
+
+        with celery_app.producer_or_acquire() as producer:  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+            for workflow in batch:  # pyright: ignore[reportAny]
+                try:
+                    workflow.apply_async(  # pyright: ignore[reportAny]
+                        producer=producer,
+                        headers={
+                            **(workflow.options.get("headers") or {}),  # pyright: ignore[reportAny]
+                            PUBLISHED_AT_HEADER: time.time(),
+                        },
+                    )
+                    OUTBOX_PUBLISHED.inc()
+                except Exception as e:
+                    OUTBOX_FAILED.inc()
+                    main_logger.error(f"Failed to publish task: {e}")
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await loop.run_in_executor(self._executor, self._publish, batch)
+            except Exception as e:
+                OUTBOX_FAILED.inc(len(batch))
+                main_logger.error(f"Task outbox publisher failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+                OUTBOX_DEPTH.set(self._queue.qsize())
+
+
+task_outbox: TaskOutbox = TaskOutbox(
+    maxsize=config.env.outbox.maxsize,
+    batch_size=config.env.outbox.batch_size,
+    overflow=config.env.outbox.overflow,
+)
@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy import ScalarResult
+from sqlmodel import col, select
+
+from src.core.db import AsyncSessionLocal
+from src.core.metrics import OUTBOX_FAILED, OUTBOX_PUBLISHED
+from src.entities.outbox_entity import OutboxMessageModel
+from src.tasks.utils import email_task, publish_now
+from src.utils.logging import app_logger, main_logger
+
+
+class OutboxRelay:
+    """Publishes `outbox_message` rows to Celery.
+
+    Each pass claims a batch of unpublished rows with
+    `SELECT ... FOR UPDATE SKIP LOCKED`, so several relays can run side by
+    side without publishing the same row twice, publishes them and marks
+    them published in the same transaction. Publishing stops at the first
+    broker error; only the rows published before it are marked, and the
+    rest are retried on the next pass.
+    """
+
+    def __init__(self, batch_size: int = 100, poll_interval: float = 1.0) -> None:
+        self.batch_size: int = batch_size
+        self.poll_interval: float = poll_interval
+
+    def _publish(self, messages: list[OutboxMessageModel]) -> list[OutboxMessageModel]:
+        """Publish in order; returns the messages that reached the broker."""
+        published: list[OutboxMessageModel] = []
+        for message in messages:
+            try:
+                publish_now(
+                    email_task(message.task_name, **message.payload),  # pyright: ignore[reportAny]
+                    email_task("log_task_success"),
+                    request_id=message.request_id,
+                    enqueued_at=(
+                        message.created_at.timestamp() if message.created_at else None
+                    ),
+                )
+            except Exception as e:
+                OUTBOX_FAILED.inc()
+                main_logger.error(
+                    f"Outbox relay could not publish message {message.id}: {e}"
+                )
+                break
+            OUTBOX_PUBLISHED.inc()
+            published.append(message)
+        return published
+
+    async def relay_once(self) -> int:
+        async with AsyncSessionLocal() as session:
+            result: ScalarResult[OutboxMessageModel] = await session.exec(
+                select(OutboxMessageModel)
+                .where(col(OutboxMessageModel.published_at).is_(None))
+                .order_by(col(OutboxMessageModel.id))
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            messages = list(result.all())
+            if not messages:
+                return 0
+
+            published = await asyncio.to_thread(self._publish, messages)
+            now = datetime.now(timezone.utc)
+            for message in published:
+                message.published_at = now
+            session.add_all(published)
+            # Also releases the row locks on the messages left unpublished.
+            await session.commit()
+            return len(published)
+
+    async def run(self) -> None:
+        main_logger.info("📤 Outbox relay started")
+        while True:
+            try:
+                published = await self.relay_once()
+            except Exception as e:
+                main_logger.error(f"Outbox relay pass failed: {e}")
+                published = 0
+            if published < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+
+if __name__ == "__main__":
+    _ = app_logger()
+    asyncio.run(OutboxRelay().run())
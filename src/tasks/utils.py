@@ -1,14 +1,53 @@
-from celery import chain  # pyright: ignore[reportMissingTypeStubs]
+import time
+from typing import Any
 
-from src.tasks.email_task import log_task_failure
+from src.core.tracing import (ENQUEUED_AT_HEADER, REQUEST_ID_HEADER,
+                              current_request_id)
+from src.tasks.executor import TaskCall
+
+
+def email_task(name: str, **kwargs: Any) -> TaskCall:  # pyright: ignore[reportExplicitAny, reportAny]
+    """Reference a task in `src.tasks.email_task` by name.
+
+    Referencing tasks by name keeps Celery, the email service and its
+    templates out of the API process until the first task runs.
+    """
+    return TaskCall(name=name, kwargs=kwargs)
+
+
+def _headers(request_id: str | None, enqueued_at: float | None) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+    return {
+        REQUEST_ID_HEADER: request_id or current_request_id(),
+        ENQUEUED_AT_HEADER: enqueued_at or time.time(),
+    }
 
 
 def fire_and_forget(
-    *tasks,
-):  # pyright: ignore[reportUnknownParameterType, reportMissingParameterType]
-    """Fire Celery chain with automatic success/error logging"""
-    workflow = chain(*tasks)  # pyright: ignore[reportUnknownArgumentType]
-    workflow.link_error(
-        log_task_failure.s()
-    )  # pyright: ignore[reportCallIssue, reportUnknownMemberType]
-    workflow.apply_async()  # pyright: ignore[reportUnknownMemberType, reportUnusedCallResult]
+    *tasks: TaskCall,
+    request_id: str | None = None,
+    enqueued_at: float | None = None,
+) -> bool:
+    """Run tasks as a chain with automatic success/error logging.
+
+    The chain goes to the configured executor (the Celery outbox, or the
+    in-process executor when no broker is configured), so the caller never
+    waits on it. The current request id and the enqueue time travel in the
+    message headers for tracing; callers that publish on behalf of an
+    earlier request (the outbox relay) pass them.
+    """
+    from src.tasks.executor import task_executor
+
+    return task_executor.submit(list(tasks), headers=_headers(request_id, enqueued_at))
+
+
+def publish_now(
+    *tasks: TaskCall,
+    request_id: str | None = None,
+    enqueued_at: float | None = None,
+) -> None:
+    """Like `fire_and_forget`, but blocks until the chain is handed off and
+    raises if it could not be; for callers that record delivery afterwards.
+    """
+    from src.tasks.executor import task_executor
+
+    task_executor.publish(list(tasks), headers=_headers(request_id, enqueued_at))
@@ -1,7 +1,16 @@
+import fcntl
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
+from sqlalchemy import Connection, create_engine, pool, text
+
 from alembic import command
 from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from src.config import config as app_config
 
 # ----------------------------------------------------------------------
 # 1. Resolve the *absolute* path to alembic.ini (project root)
@@ -9,6 +18,11 @@ from alembic.config import Config
 PROJECT_ROOT = Path(__file__).resolve().parents[2]  # ../../ from utils/
 ALEMBIC_INI = PROJECT_ROOT / "alembic.ini"
 
+# Key shared by every worker for the PostgreSQL advisory lock, and the lock
+# file used instead on backends without advisory locks (SQLite).
+MIGRATION_LOCK_KEY = 72_617_001
+MIGRATION_LOCK_FILE = Path(tempfile.gettempdir()) / "auth_api_migrations.lock"
+
 
 # ----------------------------------------------------------------------
 # 2. Optional: inject the *sync* DB URL at runtime
@@ -29,3 +43,66 @@ def upgrade_database() -> None:
 def downgrade_database(revision: str = "-1") -> None:
     cfg = _make_alembic_config()
     command.downgrade(cfg, revision)
+
+
+# ----------------------------------------------------------------------
+# 3. Startup upgrade: skip when already at head, serialise otherwise
+# ----------------------------------------------------------------------
+def _current_revision(connection: Connection) -> str | None:
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+@contextmanager
+def _migration_lock(connection: Connection) -> Iterator[None]:
+    """Hold a cross-process lock so only one worker migrates at a time."""
+    if connection.dialect.name == "postgresql":
+        _ = connection.execute(
+            text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+        )
+        connection.commit()
+        try:
+            yield
+        finally:
+            _ = connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            )
+            connection.commit()
+    else:
+        with open(MIGRATION_LOCK_FILE, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def upgrade_database_if_needed() -> bool:
+    """
+    Run `alembic upgrade head` only when the database is behind the script head.
+
+    The revision check is a single indexed read, so workers booting against an
+    up-to-date database never take the lock. Workers that find the database
+    behind wait on the lock and re-check, so only the first one migrates.
+
+    Returns:
+        bool: True if this call applied migrations.
+    """
+    cfg = _make_alembic_config()
+    head: str | None = ScriptDirectory.from_config(cfg).get_current_head()
+    engine = create_engine(app_config.database.migrate_url(), poolclass=pool.NullPool)
+    try:
+        with engine.connect() as connection:
+            if _current_revision(connection) == head:
+                return False
+            connection.rollback()
+
+            with _migration_lock(connection):
+                if _current_revision(connection) == head:
+                    connection.rollback()
+                    return False
+                cfg.attributes["connection"] = connection
+                command.upgrade(cfg, "head")
+                connection.commit()
+                return True
+    finally:
+        engine.dispose()
@@ -9,10 +9,21 @@ from loguru._handler import Message
 from src.config import config
 
 
+_sinks_configured: bool = False
+
+
 def app_logger():
     """
     Configure Loguru logger with file sink, rotation, and sensitive data filter.
+
+    Sinks are attached once, on process startup (API lifespan or Celery
+    worker init) rather than at import time.
     """
+    global _sinks_configured
+    if _sinks_configured:
+        return logger
+    _sinks_configured = True
+
     _ = logger.add(
         "logs/app.log",
         rotation="10 MB",
@@ -53,15 +64,21 @@ TOKEN_PATTERN: Pattern[str] = re.compile(
     r"\b(token|api_key|secret|auth)\b", re.IGNORECASE
 )
 
+# Second-factor credentials returned in response bodies; the provisioning
+# URI and its QR code both embed the TOTP secret.
+CREDENTIAL_PATTERN: Pattern[str] = re.compile(
+    r"^(recovery_codes?|provisioning_uri|qr_code)$", re.IGNORECASE
+)
+
 
 def filter_sensitive(data: dict[str, str | int] | str):
     if isinstance(data, dict):
         for key in data:
             if PASSWORD_PATTERN.search(key):
                 data[key] = "***"
-            elif TOKEN_PATTERN.search(key):
+            elif TOKEN_PATTERN.search(key) or CREDENTIAL_PATTERN.search(key):
                 data[key] = "[REDACTED]"
     return data
 
 
-main_logger = app_logger()
+main_logger = logger
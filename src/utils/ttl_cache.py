@@ -0,0 +1,40 @@
+from collections import OrderedDict
+
+
+class TTLCache[K, V]:
+    """Bounded map whose entries expire, evicting the least recently used.
+
+    Every operation is O(1): expired entries are dropped when read, and a
+    full map makes room by evicting its least recently used entry, which
+    under a flood of distinct keys is also the stalest. Nothing ever scans
+    the whole map.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize: int = maxsize
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K, now: float) -> V | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        if item[0] <= now:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return item[1]
+
+    def set(self, key: K, value: V, expires_at: float) -> None:
+        if key in self._data:
+            self._data.move_to_end(key)
+        else:
+            while len(self._data) >= self.maxsize:
+                _ = self._data.popitem(last=False)
+        self._data[key] = (expires_at, value)
+
+    def pop(self, key: K) -> V | None:
+        item = self._data.pop(key, None)
+        return None if item is None else item[1]
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class ASGIResponse:
+    status: int = 0
+    headers: dict[str, str] = field(default_factory=dict)
+    chunks: list[bytes] = field(default_factory=list)
+    # perf_counter() at which each body chunk reached the client
+    chunk_times: list[float] = field(default_factory=list)
+
+    @property
+    def body(self) -> bytes:
+        return b"".join(self.chunks)
+
+    def json(self) -> Any:  # pyright: ignore[reportExplicitAny]
+        return json.loads(self.body)
+
+
+async def call(
+    app: Any,  # pyright: ignore[reportExplicitAny]
+    method: str,
+    path: str,
+    body: Any = None,  # pyright: ignore[reportExplicitAny]
+    headers: dict[str, str] | None = None,
+    query: str = "",
+    client: tuple[str, int] = ("127.0.0.1", 40_000),
+) -> ASGIResponse:
+    """Send one request straight to an ASGI app (httpx is not a dependency)."""
+    payload = b"" if body is None else json.dumps(body).encode()
+    raw_headers = [(b"content-length", str(len(payload)).encode())]
+    if body is not None:
+        raw_headers.append((b"content-type", b"application/json"))
+    raw_headers += [
+        (name.lower().encode(), value.encode()) for name, value in (headers or {}).items()
+    ]
+    scope: dict[str, Any] = {  # pyright: ignore[reportExplicitAny]
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": raw_headers,
+        "client": client,
+        "server": ("testserver", 80),
+    }
+    response = ASGIResponse()
+    body_sent = False
+    finished = asyncio.Event()
+
+    async def receive() -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        _ = await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:  # pyright: ignore[reportExplicitAny]
+        if message["type"] == "http.response.start":
+            response.status = int(message["status"])  # pyright: ignore[reportAny]
+            response.headers = {
+                name.decode(): value.decode()
+                for name, value in message.get("headers", [])  # pyright: ignore[reportAny]
+            }
+        elif message["type"] == "http.response.body":
+            chunk: bytes = message.get("body", b"")  # pyright: ignore[reportAny]
+            if chunk:
+                response.chunks.append(chunk)
+                response.chunk_times.append(time.perf_counter())
+            if not message.get("more_body", False):
+                finished.set()
+
+    await app(scope, receive, send)
+    return response
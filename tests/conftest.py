@@ -0,0 +1,21 @@
+import os
+import tempfile
+
+# Self-contained settings: no config.yaml, no database server, Redis or
+# broker. The "test" environment uses SQLite and every Redis-backed feature
+# falls back to its in-process state. The working directory moves to a
+# scratch directory so a developer's config.yaml (which would take priority
+# over these variables) is not picked up and logs/, test.db land there.
+os.environ.update(
+    {
+        "ENV_MODE": "test",
+        "API_KEY": "test-api-key",
+        "TOKEN": '{"secret_key": "test-secret-key"}',
+        "CELERY_BROKER_URL": "",
+    }
+)
+
+
+def pytest_sessionstart() -> None:
+    # Before test modules (and so `src`) are imported.
+    os.chdir(tempfile.mkdtemp(prefix="auth_api_tests_"))
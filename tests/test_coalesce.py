@@ -0,0 +1,38 @@
+import asyncio
+
+from src.tasks.coalesce import EmailCoalescer
+
+
+def test_only_the_latest_claim_is_delivered() -> None:
+    async def scenario() -> list[bool]:
+        coalescer = EmailCoalescer(window=300)
+        first = await coalescer.claim("send_activate_email", "a@example.com")
+        second = await coalescer.claim("send_activate_email", "A@example.com ")
+        other = await coalescer.claim("send_password_reset_email", "a@example.com")
+        return [
+            await coalescer.is_latest("send_activate_email", "a@example.com", first),
+            await coalescer.is_latest("send_activate_email", "a@example.com", second),
+            await coalescer.is_latest("send_password_reset_email", "a@example.com", other),
+        ]
+
+    assert asyncio.run(scenario()) == [False, True, True]
+
+
+def test_disabled_window_and_untokened_tasks_always_deliver() -> None:
+    async def scenario() -> tuple[str | None, bool]:
+        coalescer = EmailCoalescer(window=0)
+        token = await coalescer.claim("send_activate_email", "a@example.com")
+        return token, await coalescer.is_latest("send_activate_email", "a@example.com", None)
+
+    assert asyncio.run(scenario()) == (None, True)
+
+
+def test_local_tokens_are_bounded() -> None:
+    async def scenario() -> int:
+        coalescer = EmailCoalescer(window=300)
+        coalescer._local.maxsize = 10  # pyright: ignore[reportPrivateUsage]
+        for n in range(100):
+            _ = await coalescer.claim("send_activate_email", f"user{n}@example.com")
+        return len(coalescer._local)  # pyright: ignore[reportPrivateUsage]
+
+    assert asyncio.run(scenario()) == 10
@@ -0,0 +1,58 @@
+import asyncio
+from email.message import EmailMessage
+
+import pytest
+from aiosmtplib import (SMTPDataError, SMTPRecipientRefused,
+                        SMTPRecipientsRefused, SMTPServerDisconnected,
+                        SMTPTimeoutError)
+from pydantic import NameEmail
+
+from src.services.email_service import (EmailService,
+                                        EmailServiceTransientError)
+from src.services.email_transport import EmailTransport
+
+RECIPIENT = NameEmail(name="Alice", email="alice@example.com")
+
+
+class FailingTransport(EmailTransport):
+    def __init__(self, error: Exception) -> None:
+        self.error: Exception = error
+
+    async def send_message(self, message: EmailMessage) -> None:
+        raise self.error
+
+
+def send_with(error: Exception) -> None:
+    service = EmailService()
+    service.transport = FailingTransport(error)
+    asyncio.run(service.send_welcome_email(to_email=RECIPIENT))
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        SMTPServerDisconnected("Connection lost"),
+        SMTPTimeoutError("Timed out"),
+        ConnectionRefusedError("Connection refused"),
+        SMTPDataError(451, "Try again later"),
+    ],
+)
+def test_temporary_failures_are_retried(error: Exception) -> None:
+    with pytest.raises(EmailServiceTransientError):
+        send_with(error)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        SMTPDataError(554, "Message rejected"),
+        SMTPRecipientsRefused(
+            [SMTPRecipientRefused(550, "No such user", RECIPIENT.email)]
+        ),
+        ValueError("Bad header"),
+    ],
+)
+def test_permanent_failures_are_raised_as_is(error: Exception) -> None:
+    with pytest.raises(type(error)):
+        send_with(error)
+
@@ -0,0 +1,60 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from src.core.celery_app import EMAIL_LANES
+from src.core.tracing import REQUEST_ID_HEADER
+from src.tasks.dead_letter import dead_letters
+from src.tasks.executor import CeleryExecutor, InProcessExecutor
+from src.tasks.outbox_relay import OutboxRelay
+from src.tasks.utils import email_task
+
+
+def test_callbacks_run_on_the_email_task_lane() -> None:
+    for name, lane in EMAIL_LANES.items():
+        workflow = CeleryExecutor()._workflow(  # pyright: ignore[reportPrivateUsage, reportAny]
+            [email_task(name), email_task("log_task_success")], headers={}
+        )
+        send, success = workflow.tasks  # pyright: ignore[reportAny]
+        (failure,) = workflow.options["link_error"]  # pyright: ignore[reportAny]
+
+        # The email task itself is routed by `task_routes`.
+        assert "queue" not in send.options  # pyright: ignore[reportAny]
+        assert success.options["queue"] == lane  # pyright: ignore[reportAny]
+        assert failure.options["queue"] == lane  # pyright: ignore[reportAny]
+
+
+def test_in_process_failures_are_dead_lettered_not_raised(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    recorded: list[dict[str, Any]] = []  # pyright: ignore[reportExplicitAny]
+
+    async def record(**kwargs: Any) -> None:  # pyright: ignore[reportExplicitAny, reportAny]
+        recorded.append(kwargs)
+
+    async def idle(_: OutboxRelay) -> None:
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(dead_letters, "record", record)
+    monkeypatch.setattr(OutboxRelay, "run", idle)
+
+    async def scenario() -> None:
+        executor = InProcessExecutor()
+        executor.start()
+        try:
+            # As the outbox relay does: from a thread, expecting no error.
+            await asyncio.to_thread(
+                executor.publish,
+                [email_task("no_such_task", to_email={"email": "a@b.io"})],
+                {REQUEST_ID_HEADER: "req-1"},
+            )
+        finally:
+            await executor.stop()
+
+    asyncio.run(scenario())
+    assert len(recorded) == 1
+    assert recorded[0]["task_name"] == "no_such_task"
+    assert recorded[0]["payload"] == {"to_email": {"email": "a@b.io"}}
+    assert recorded[0]["request_id"] == "req-1"
+    assert "AttributeError" in recorded[0]["error"]
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from src.auth.util import existence
+from src.auth.util.existence import BloomFilter, UserExistenceFilter
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1_000, error_rate=0.01)
+    members = [f"u:user-{n}" for n in range(1_000)]
+    for key in members:
+        bloom.add(key)
+
+    assert all(key in bloom for key in members)
+    false_positives = sum(f"u:other-{n}" in bloom for n in range(10_000))
+    assert false_positives < 300
+
+
+def test_filter_answers_maybe_until_built() -> None:
+    async def scenario() -> tuple[bool, bool, bool, bool]:
+        users = UserExistenceFilter(capacity=1_000, error_rate=0.01)
+        before = await users.might_exist(username="alice")
+        users._local_ready = True  # pyright: ignore[reportPrivateUsage]
+        await users.add(username="Alice", email="alice@example.com")
+        return (
+            before,
+            await users.might_exist(username=" alice "),
+            await users.might_exist(email="ALICE@example.com"),
+            await users.might_exist(username="bob", email="bob@example.com"),
+        )
+
+    assert asyncio.run(scenario()) == (True, True, True, False)
+
+
+class ReadyRedis:
+    async def exists(self, _: str) -> int:
+        return 1
+
+
+def test_rebuild_skips_the_table_when_the_shared_bitmap_is_ready(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(existence, "get_redis", lambda: ReadyRedis())
+    users = UserExistenceFilter(capacity=1_000, error_rate=0.01)
+
+    # No database is set up here: streaming the table would fail.
+    assert asyncio.run(users.rebuild()) is None
+    assert users._redis_ready  # pyright: ignore[reportPrivateUsage]
+    assert not users._local_ready  # pyright: ignore[reportPrivateUsage]
@@ -0,0 +1,171 @@
+import asyncio
+import json
+from typing import Any, cast
+
+import pytest
+from fastapi import FastAPI, Request
+
+from src.auth.controller import AuthController
+from src.auth.router import reject_existing_user
+from src.core.exception import AppException
+from src.core.idempotency import (
+    IdempotencyStore,
+    idempotency_store,
+    idempotent,
+    request_key,
+)
+from tests.asgi import call
+
+
+def make_request(
+    path: str, body: dict[str, str], headers: dict[str, str] | None = None
+) -> Request:
+    payload = json.dumps(body).encode()
+
+    async def receive() -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "query_string": b"",
+        "headers": [
+            (b"content-type", b"application/json"),
+            *((k.lower().encode(), v.encode()) for k, v in (headers or {}).items()),
+        ],
+        "client": ("127.0.0.1", 40_000),
+    }
+    return Request(scope, receive)
+
+
+def test_repeated_key_replays_the_first_response() -> None:
+    async def scenario() -> tuple[list[Any], int]:  # pyright: ignore[reportExplicitAny]
+        store = IdempotencyStore()
+        calls = 0
+
+        async def handler() -> dict[str, int]:
+            nonlocal calls
+            calls += 1
+            return {"n": calls}
+
+        results = [
+            await store.run("sign-up:k1", "fp", handler),
+            await store.run("sign-up:k1", "fp", handler),
+        ]
+        return results, calls
+
+    results, calls = asyncio.run(scenario())
+    assert results == [{"n": 1}, {"n": 1}]
+    assert calls == 1
+
+
+def test_concurrent_duplicates_wait_for_the_first() -> None:
+    async def scenario() -> tuple[list[Any], int]:  # pyright: ignore[reportExplicitAny]
+        store = IdempotencyStore()
+        calls = 0
+
+        async def handler() -> dict[str, int]:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"n": calls}
+
+        results = await asyncio.gather(
+            *(store.run("sign-up:k1", "fp", handler) for _ in range(5))
+        )
+        return list(results), calls
+
+    results, calls = asyncio.run(scenario())
+    assert results == [{"n": 1}] * 5
+    assert calls == 1
+
+
+def test_same_key_with_a_different_body_is_rejected() -> None:
+    async def scenario() -> None:
+        store = IdempotencyStore()
+
+        async def handler() -> dict[str, str]:
+            return {"ok": "yes"}
+
+        _ = await store.run("sign-up:k1", "fp-1", handler)
+        _ = await store.run("sign-up:k1", "fp-2", handler)
+
+    with pytest.raises(AppException) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 422
+
+
+def test_failed_request_releases_the_key() -> None:
+    async def scenario() -> dict[str, str]:
+        store = IdempotencyStore()
+
+        async def failing() -> dict[str, str]:
+            raise RuntimeError("boom")
+
+        async def succeeding() -> dict[str, str]:
+            return {"ok": "yes"}
+
+        with pytest.raises(RuntimeError):
+            _ = await store.run("sign-up:k1", "fp", failing)
+        return await store.run("sign-up:k1", "fp", succeeding)
+
+    assert asyncio.run(scenario()) == {"ok": "yes"}
+
+
+class RecordingController:
+    def __init__(self) -> None:
+        self.checked: int = 0
+
+    async def ensure_new_user(self, username: str | None, email: str | None) -> None:
+        self.checked += 1
+
+
+def test_new_idempotency_keys_do_not_skip_the_duplicate_check() -> None:
+    body = {"username": "alice", "email": "alice@example.com"}
+
+    async def scenario() -> list[int]:
+        controller = RecordingController()
+        checked: list[int] = []
+        fresh = make_request("/api/auth/sign-up", body, {"Idempotency-Key": "fresh"})
+        await reject_existing_user(fresh, cast(AuthController, controller))
+        checked.append(controller.checked)
+
+        async def handler() -> dict[str, str]:
+            return {"ok": "yes"}
+
+        stored = make_request("/api/auth/sign-up", body, {"Idempotency-Key": "stored"})
+        key = request_key(stored)
+        assert key is not None
+        _ = await idempotency_store.run(key, "fp", handler)
+        await reject_existing_user(stored, cast(AuthController, controller))
+        checked.append(controller.checked)
+        return checked
+
+    # Checked for the fresh key, skipped for the replay of the stored one.
+    assert asyncio.run(scenario()) == [1, 1]
+
+
+def test_keys_are_scoped_to_the_caller() -> None:
+    app = FastAPI()
+    calls: list[str] = []
+
+    @app.post("/reset")
+    @idempotent
+    async def reset(request: Request) -> dict[str, int]:  # pyright: ignore[reportUnusedFunction]
+        calls.append(request.client.host if request.client else "")
+        return {"n": len(calls)}
+
+    async def scenario() -> list[Any]:  # pyright: ignore[reportExplicitAny]
+        headers = {"Idempotency-Key": "shared-key"}
+        responses = [
+            await call(app, "POST", "/reset", {}, headers, client=("10.0.0.1", 1)),
+            await call(app, "POST", "/reset", {}, headers, client=("10.0.0.1", 2)),
+            await call(app, "POST", "/reset", {}, headers, client=("10.0.0.2", 1)),
+        ]
+        return [response.json() for response in responses]
+
+    # The retry from the same caller is replayed; another caller's request
+    # with the same key runs on its own.
+    assert asyncio.run(scenario()) == [{"n": 1}, {"n": 1}, {"n": 2}]
+    assert calls == ["10.0.0.1", "10.0.0.2"]
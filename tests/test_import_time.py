@@ -0,0 +1,34 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Loaded on first use (QR codes, password strength, Celery, email); pulling
+# any of them into `import src` slows API and worker startup again.
+DEFERRED_MODULES = ("qrcode", "PIL", "zxcvbn", "celery", "fastapi_mail")
+
+
+def test_import_src_defers_heavy_modules(tmp_path: Path) -> None:
+    # A fresh interpreter, so modules imported by other tests do not count;
+    # settings come from the environment set in conftest.py.
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import json, sys; import src; "
+            "print(json.dumps(sorted({name.split('.')[0] for name in sys.modules})))",
+        ],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = set(json.loads(result.stdout.strip().splitlines()[-1]))
+    assert not loaded.intersection(DEFERRED_MODULES), (
+        f"`import src` loads {sorted(loaded.intersection(DEFERRED_MODULES))}; "
+        "import them where they are first used (see `make import-time`)"
+    )
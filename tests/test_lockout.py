@@ -0,0 +1,69 @@
+import asyncio
+
+from src.auth.util.lockout import LoginLockout
+
+
+def lockout(**overrides: int) -> LoginLockout:
+    options = dict(threshold=3, ip_threshold=10, base_seconds=2, max_seconds=8, window=60)
+    options.update(overrides)
+    return LoginLockout(**options)
+
+
+def test_locks_after_threshold_with_exponential_backoff() -> None:
+    async def scenario() -> list[int]:
+        guard = lockout()
+        retry_afters: list[int] = []
+        for _ in range(6):
+            await guard.record_failure("alice")
+            retry_afters.append(await guard.check("alice"))
+        return retry_afters
+
+    # Locked from the 3rd failure: 2s, then doubling up to max_seconds.
+    assert asyncio.run(scenario()) == [0, 0, 2, 4, 8, 8]
+
+
+def test_ip_lock_applies_to_every_username() -> None:
+    async def scenario() -> tuple[int, int]:
+        guard = lockout(ip_threshold=2)
+        await guard.record_failure("alice", ip="10.0.0.1")
+        await guard.record_failure("bob", ip="10.0.0.1")
+        return await guard.check("carol", ip="10.0.0.1"), await guard.check("carol")
+
+    from_ip, elsewhere = asyncio.run(scenario())
+    assert from_ip > 0
+    assert elsewhere == 0
+
+
+def test_reset_clears_the_account_but_not_the_ip() -> None:
+    async def scenario() -> tuple[int, int]:
+        guard = lockout(threshold=1, ip_threshold=1)
+        await guard.record_failure("alice", ip="10.0.0.1")
+        await guard.reset("alice")
+        return await guard.check("alice"), await guard.check("alice", ip="10.0.0.1")
+
+    account, with_ip = asyncio.run(scenario())
+    assert account == 0
+    assert with_ip > 0
+
+
+def test_checks_do_not_grow_local_state() -> None:
+    async def scenario() -> int:
+        guard = lockout()
+        for n in range(1_000):
+            _ = await guard.check(f"unknown-{n}", ip=f"10.0.{n >> 8}.{n & 255}")
+        return len(guard._local)  # pyright: ignore[reportPrivateUsage]
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_local_state_is_bounded() -> None:
+    async def scenario() -> tuple[int, int]:
+        guard = lockout(threshold=1)
+        guard._local.maxsize = 100  # pyright: ignore[reportPrivateUsage]
+        for n in range(1_000):
+            await guard.record_failure(f"user-{n}")
+        return len(guard._local), await guard.check("user-999")  # pyright: ignore[reportPrivateUsage]
+
+    size, newest = asyncio.run(scenario())
+    assert size == 100
+    assert newest > 0
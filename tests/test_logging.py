@@ -0,0 +1,87 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from src.middlewares.request import logging_middleware
+from src.utils.logging import filter_sensitive, main_logger
+from tests.asgi import call
+
+CODES = ["ABCD-EFGH-1234", "JKLM-NPQR-5678"]
+TOTP_SECRET = "JBSWY3DPEHPK3PXPJBSWY3DPEHPK3PXP"
+TOTP_URI = f"otpauth://totp/Auth%20API:a%40b.io?secret={TOTP_SECRET}&issuer=Auth%20API"
+
+
+def test_filter_sensitive_redacts_recovery_codes() -> None:
+    redacted = filter_sensitive({"recovery_codes": CODES, "message": "ok"})  # pyright: ignore[reportArgumentType]
+    assert redacted == {"recovery_codes": "[REDACTED]", "message": "ok"}
+
+
+def test_filter_sensitive_redacts_totp_provisioning_data() -> None:
+    redacted = filter_sensitive({"provisioning_uri": TOTP_URI, "qr_code": TOTP_URI})
+    assert redacted == {"provisioning_uri": "[REDACTED]", "qr_code": "[REDACTED]"}
+
+
+def test_recovery_codes_and_totp_secret_never_reach_a_log_sink() -> None:
+    app = FastAPI()
+    _ = app.middleware("http")(logging_middleware)
+
+    @app.post("/recovery-codes")
+    async def regenerate() -> dict[str, object]:  # pyright: ignore[reportUnusedFunction]
+        return {"recovery_codes": CODES, "message": "Store these codes safely."}
+
+    @app.post("/sign-in-recovery")
+    async def sign_in(body: dict[str, str]) -> dict[str, str]:  # pyright: ignore[reportUnusedFunction]
+        return {"message": "ok"}
+
+    @app.post("/enable-2fa")
+    async def enable_2fa() -> dict[str, str]:  # pyright: ignore[reportUnusedFunction]
+        # qr_format=uri returns the URI itself as qr_code
+        return {"secret": TOTP_SECRET, "provisioning_uri": TOTP_URI, "qr_code": TOTP_URI}
+
+    records: list[str] = []
+    sink = main_logger.add(
+        lambda message: records.append(str(message)), format="{message} {extra}"
+    )
+    try:
+        response = asyncio.run(call(app, "POST", "/recovery-codes"))
+        _ = asyncio.run(
+            call(app, "POST", "/sign-in-recovery", body={"recovery_code": CODES[0]})
+        )
+        _ = asyncio.run(call(app, "POST", "/enable-2fa"))
+    finally:
+        main_logger.remove(sink)
+
+    assert response.status == 200
+    assert records, "the middleware logged nothing"
+    logged = "\n".join(records)
+    for code in CODES:
+        assert code not in logged
+    assert TOTP_SECRET not in logged
+
+
+def test_streamed_responses_are_not_buffered_for_logging() -> None:
+    app = FastAPI()
+    _ = app.middleware("http")(logging_middleware)
+
+    @app.get("/export")
+    async def export() -> StreamingResponse:  # pyright: ignore[reportUnusedFunction]
+        async def rows() -> AsyncIterator[bytes]:
+            yield b'{"n": 0}\n'
+            for n in range(1, 4):
+                await asyncio.sleep(0.05)
+                yield f'{{"n": {n}}}\n'.encode()
+
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    started = time.perf_counter()
+    response = asyncio.run(call(app, "GET", "/export"))
+    finished = time.perf_counter()
+
+    assert response.status == 200
+    assert len(response.chunks) == 4
+    # The first row reaches the client before the export has finished.
+    assert response.chunk_times[0] - started < 0.1
+    assert finished - response.chunk_times[0] >= 0.1
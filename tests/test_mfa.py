@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+import pyotp
+
+from src.auth.util.mfa import TOTPVerifier
+
+SECRET = "JBSWY3DPEHPK3PXPJBSWY3DPEHPK3PXP"
+
+
+def test_codes_match_pyotp_within_the_window() -> None:
+    verifier = TOTPVerifier()
+    totp = pyotp.TOTP(SECRET)
+    now = time.time()
+    current = int(now // 30)
+
+    assert verifier.match_counter(totp.at(now), SECRET, now=now) == current
+    assert verifier.match_counter(totp.at(now - 30), SECRET, now=now) == current - 1
+    assert verifier.match_counter(totp.at(now + 30), SECRET, now=now) == current + 1
+    assert verifier.match_counter(totp.at(now - 90), SECRET, now=now) is None
+    assert verifier.match_counter("12345", SECRET, now=now) is None
+    assert verifier.match_counter("abcdef", SECRET, now=now) is None
+
+
+def test_a_code_is_accepted_once_per_user() -> None:
+    async def scenario() -> list[bool]:
+        verifier = TOTPVerifier()
+        code = pyotp.TOTP(SECRET).now()
+        return [
+            await verifier.verify(code, SECRET, user_id=1),
+            await verifier.verify(code, SECRET, user_id=1),
+            await verifier.verify(code, SECRET, user_id=2),
+            await verifier.verify(f"{(int(code) + 1) % 10**6:06d}", SECRET, user_id=3),
+        ]
+
+    # The replay is rejected; another user sharing the secret is unaffected.
+    assert asyncio.run(scenario()) == [True, False, True, False]
+
+
+def test_concurrent_replays_accept_only_one() -> None:
+    async def scenario() -> list[bool]:
+        verifier = TOTPVerifier()
+        code = pyotp.TOTP(SECRET).now()
+        return list(
+            await asyncio.gather(
+                *(verifier.verify(code, SECRET, user_id=1) for _ in range(10))
+            )
+        )
+
+    assert sorted(asyncio.run(scenario())) == [False] * 9 + [True]
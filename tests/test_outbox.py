@@ -0,0 +1,67 @@
+import asyncio
+from typing import Any
+
+import pytest
+from celery import chain  # pyright: ignore[reportMissingTypeStubs]
+
+from src.core.celery_app import celery_app
+from src.tasks.outbox import OVERFLOW_POLICY, TaskOutbox, task_names
+from src.utils.logging import main_logger
+
+
+def workflow(name: str) -> Any:  # pyright: ignore[reportExplicitAny]
+    return chain(  # pyright: ignore[reportUnknownVariableType]
+        celery_app.signature(f"src.tasks.email_task.{name}")  # pyright: ignore[reportUnknownMemberType]
+    )
+
+
+def fill_past_capacity(
+    overflow: OVERFLOW_POLICY, monkeypatch: pytest.MonkeyPatch
+) -> tuple[list[bool], list[str], list[str]]:
+    """Enqueue three workflows into a 2-slot outbox before it can drain."""
+    published: list[str] = []
+    warnings: list[str] = []
+
+    def publish(_: TaskOutbox, batch: list[Any]) -> None:  # pyright: ignore[reportExplicitAny]
+        published.extend(task_names(w).rsplit(".", 1)[-1] for w in batch)  # pyright: ignore[reportAny]
+
+    monkeypatch.setattr(TaskOutbox, "_publish", publish)
+
+    async def scenario() -> list[bool]:
+        outbox = TaskOutbox(maxsize=2, overflow=overflow)
+        outbox.start()
+        accepted = [outbox.enqueue(workflow(f"task_{n}")) for n in range(3)]
+        await outbox.stop()
+        return accepted
+
+    sink = main_logger.add(
+        lambda message: warnings.append(str(message)), level="WARNING", format="{message}"
+    )
+    try:
+        accepted = asyncio.run(scenario())
+    finally:
+        main_logger.remove(sink)
+    return accepted, published, warnings
+
+
+def test_default_overflow_publishes_inline(monkeypatch: pytest.MonkeyPatch) -> None:
+    accepted, published, warnings = fill_past_capacity(
+        TaskOutbox().overflow, monkeypatch
+    )
+    assert accepted == [True, True, True]
+    assert sorted(published) == ["task_0", "task_1", "task_2"]
+    assert warnings == []
+
+
+def test_drop_oldest_logs_the_dropped_task(monkeypatch: pytest.MonkeyPatch) -> None:
+    accepted, published, warnings = fill_past_capacity("drop_oldest", monkeypatch)
+    assert accepted == [True, True, True]
+    assert published == ["task_1", "task_2"]
+    assert len(warnings) == 1 and "src.tasks.email_task.task_0" in warnings[0]
+
+
+def test_drop_new_logs_the_dropped_task(monkeypatch: pytest.MonkeyPatch) -> None:
+    accepted, published, warnings = fill_past_capacity("drop_new", monkeypatch)
+    assert accepted == [True, True, False]
+    assert published == ["task_0", "task_1"]
+    assert len(warnings) == 1 and "src.tasks.email_task.task_2" in warnings[0]
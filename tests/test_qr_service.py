@@ -0,0 +1,38 @@
+import asyncio
+import base64
+import re
+from xml.etree import ElementTree
+
+import qrcode
+
+from src.services.qr_service import qr_code_service
+
+URI = "otpauth://totp/Auth%20API:a%40b.io?secret=JBSWY3DPEHPK3PXP&issuer=Auth%20API"
+
+
+def test_svg_path_covers_exactly_the_dark_modules() -> None:
+    data_uri = asyncio.run(qr_code_service.render(uri=URI, qr_format="svg"))
+    assert data_uri is not None and data_uri.startswith("data:image/svg+xml;base64,")
+    svg = ElementTree.fromstring(base64.b64decode(data_uri.split(",", 1)[1]))
+    path = svg.find("{http://www.w3.org/2000/svg}path")
+    assert path is not None
+
+    qr = qrcode.QRCode(border=4)
+    qr.add_data(URI)
+    qr.make(fit=True)
+    expected = {
+        (x, y)
+        for y, row in enumerate(qr.get_matrix())
+        for x, dark in enumerate(row)
+        if dark
+    }
+    drawn = {
+        (int(x) + dx, int(y))
+        for x, y, width in re.findall(r"M(\d+) (\d+)h(\d+)", path.get("d", ""))
+        for dx in range(int(width))
+    }
+    assert drawn == expected
+
+
+def test_uri_format_renders_nothing() -> None:
+    assert asyncio.run(qr_code_service.render(uri=URI, qr_format="uri")) is None
@@ -0,0 +1,98 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Depends, FastAPI
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from src.core import rate_limit
+from src.core.exception import AppException
+from src.core.rate_limit import RateLimit, SlidingWindowLimiter
+from src.middlewares.exception import app_exception_handler
+from tests.asgi import call
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    fake = SimpleNamespace(now=120.0)
+    fake.time = lambda: fake.now
+    monkeypatch.setattr(rate_limit, "time", fake)
+    return fake
+
+
+def hits(limiter: SlidingWindowLimiter, key: str, count: int, limit: int) -> list[int]:
+    async def run() -> list[int]:
+        return [await limiter.hit(key, limit=limit, window=60) for _ in range(count)]
+
+    return asyncio.run(run())
+
+
+def test_rejects_over_the_limit_per_key(clock: SimpleNamespace) -> None:
+    limiter = SlidingWindowLimiter()
+    assert hits(limiter, "ip:1", 4, limit=3) == [0, 0, 0, 60]
+    assert hits(limiter, "ip:2", 1, limit=3) == [0]
+
+
+def test_previous_window_is_weighted_by_its_overlap(clock: SimpleNamespace) -> None:
+    limiter = SlidingWindowLimiter()
+    assert hits(limiter, "ip:1", 4, limit=4) == [0, 0, 0, 0]
+    # Halfway through the next window half of the previous one still counts.
+    clock.now = 210.0
+    results = hits(limiter, "ip:1", 3, limit=4)
+    assert results[:2] == [0, 0]
+    assert results[2] > 0
+
+
+def test_large_limits_are_served_from_leases(clock: SimpleNamespace) -> None:
+    limiter = SlidingWindowLimiter()
+    results = hits(limiter, "ip:1", 101, limit=100)
+    assert results[:100] == [0] * 100
+    assert results[100] > 0
+
+
+def test_fallback_windows_are_bounded(clock: SimpleNamespace) -> None:
+    limiter = SlidingWindowLimiter()
+    limiter._windows.maxsize = 50  # pyright: ignore[reportPrivateUsage]
+    for n in range(500):
+        _ = hits(limiter, f"ip:{n}", 1, limit=5)
+    assert len(limiter._windows) == 50  # pyright: ignore[reportPrivateUsage]
+    # The most recent clients keep their counts.
+    assert hits(limiter, "ip:499", 5, limit=5)[-1] > 0
+
+
+def test_per_ip_limit_uses_forwarded_for_only_from_trusted_proxies() -> None:
+    app = FastAPI()
+    app.add_exception_handler(AppException, app_exception_handler)  # pyright: ignore[reportArgumentType]
+
+    @app.post("/limited", dependencies=[Depends(RateLimit(limit=1, window=60))])
+    async def limited() -> dict[str, str]:  # pyright: ignore[reportUnusedFunction]
+        return {"ok": "yes"}
+
+    # How uvicorn resolves the client with `forwarded_allow_ips` set.
+    server = ProxyHeadersMiddleware(app, trusted_hosts="10.0.0.1")
+
+    def statuses(peer: str, forwarded_for: list[str]) -> list[int]:
+        async def run() -> list[int]:
+            return [
+                (
+                    await call(
+                        server,
+                        "POST",
+                        "/limited",
+                        headers={"X-Forwarded-For": address},
+                        client=(peer, 40_000),
+                    )
+                ).status
+                for address in forwarded_for
+            ]
+
+        return asyncio.run(run())
+
+    # Behind the trusted proxy every client gets its own budget...
+    assert statuses("10.0.0.1", ["203.0.113.1", "203.0.113.2", "203.0.113.1"]) == [
+        200,
+        200,
+        429,
+    ]
+    # ...while an untrusted peer cannot dodge its limit with a forged header.
+    assert statuses("198.51.100.7", ["203.0.113.3", "203.0.113.4"]) == [200, 429]
@@ -0,0 +1,81 @@
+import asyncio
+import time
+from email.message import EmailMessage
+from typing import cast
+
+from src.services.smtp_pool import SMTPBatchSender, SMTPConnectionPool
+
+
+class RecordingPool:
+    """Stands in for the SMTP pool: each session takes `latency` seconds."""
+
+    def __init__(self, latency: float = 0.01) -> None:
+        self.latency: float = latency
+        self.batches: list[int] = []
+
+    async def send_message(self, message: EmailMessage) -> None:
+        _ = await self.send_batch([message])
+
+    async def send_batch(self, messages: list[EmailMessage]) -> list[BaseException | None]:
+        self.batches.append(len(messages))
+        await asyncio.sleep(self.latency)
+        return [None] * len(messages)
+
+
+def message(n: int) -> EmailMessage:
+    email = EmailMessage()
+    email["To"] = f"user{n}@example.com"
+    return email
+
+
+def test_lone_message_is_sent_without_waiting_for_a_batch() -> None:
+    async def scenario() -> list[float]:
+        sender = SMTPBatchSender(
+            pool=cast(SMTPConnectionPool, RecordingPool()), max_wait_ms=500
+        )
+        durations: list[float] = []
+        # Serial sends, as on a solo worker.
+        for n in range(3):
+            started = time.perf_counter()
+            await sender.send_message(message(n))
+            durations.append(time.perf_counter() - started)
+        return durations
+
+    assert max(asyncio.run(scenario())) < 0.25
+
+
+def test_queued_messages_are_spread_over_the_sessions() -> None:
+    pool = RecordingPool()
+
+    async def scenario() -> None:
+        sender = SMTPBatchSender(
+            pool=cast(SMTPConnectionPool, pool), max_batch=50, max_sessions=4
+        )
+        _ = await asyncio.gather(*(sender.send_message(message(n)) for n in range(20)))
+
+    asyncio.run(scenario())
+    assert pool.batches == [5, 5, 5, 5]
+
+
+def test_messages_accumulate_while_every_session_is_busy() -> None:
+    pool = RecordingPool(latency=0.05)
+
+    async def scenario() -> None:
+        sender = SMTPBatchSender(
+            pool=cast(SMTPConnectionPool, pool),
+            max_batch=50,
+            max_wait_ms=1_000,
+            max_sessions=1,
+        )
+        first = asyncio.create_task(sender.send_message(message(0)))
+        await asyncio.sleep(0.01)  # the only session is now busy
+        _ = await asyncio.gather(
+            first, *(sender.send_message(message(n)) for n in range(1, 11))
+        )
+
+    started = time.perf_counter()
+    asyncio.run(scenario())
+    # The ten latecomers share the session as soon as it frees up, well
+    # before max_wait_ms.
+    assert pool.batches == [1, 10]
+    assert time.perf_counter() - started < 0.5
@@ -0,0 +1,21 @@
+from src.utils.ttl_cache import TTLCache
+
+
+def test_expired_entries_are_not_returned() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=10)
+    cache.set("a", 1, expires_at=10.0)
+    assert cache.get("a", now=5.0) == 1
+    assert cache.get("a", now=10.0) is None
+    assert len(cache) == 0
+
+
+def test_full_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2)
+    cache.set("a", 1, expires_at=100.0)
+    cache.set("b", 2, expires_at=100.0)
+    assert cache.get("a", now=0.0) == 1  # "b" is now the least recently used
+    cache.set("c", 3, expires_at=100.0)
+    assert cache.get("b", now=0.0) is None
+    assert cache.get("a", now=0.0) == 1
+    assert cache.get("c", now=0.0) == 3
+    assert len(cache) == 2